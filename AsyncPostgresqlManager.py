@@ -0,0 +1,389 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from itertools import count
+from psycopg import AsyncConnection, sql
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from typing import List, Dict, Union, Optional, Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+class AsyncPostgreSQLManager:
+    """
+    Variante asyncio de PostgreSQLManager (basée sur psycopg 3 et psycopg_pool).
+    
+    Toutes les méthodes sont des coroutines qui empruntent une connexion à un pool
+    asynchrone: des centaines de requêtes peuvent ainsi être en vol depuis un seul
+    processus sans bloquer la boucle d'événements ni créer un thread par requête.
+    Les requêtes utilisent les mêmes marqueurs `%s` que PostgreSQLManager.
+    """
+    
+    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: int = 5432,
+                 min_connections: int = 1, max_connections: int = 10, max_lifetime: float = 3600.0,
+                 pool_timeout: float = 30.0, log_enabled: bool = True):
+        """
+        Initialise le gestionnaire avec les paramètres de connexion.
+        
+        :param dbname: Nom de la base de données
+        :param user: Nom d'utilisateur
+        :param password: Mot de passe
+        :param host: Hôte (par défaut 'localhost')
+        :param port: Port (par défaut 5432)
+        :param min_connections: Connexions ouvertes à la création du pool
+        :param max_connections: Taille maximale du pool
+        :param max_lifetime: Durée de vie maximale d'une connexion en secondes
+        :param pool_timeout: Attente maximale d'une connexion libre en secondes
+        :param log_enabled: Si False, le gestionnaire n'émet aucun message de journalisation
+        """
+        self.dbname = dbname
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.max_lifetime = max_lifetime
+        self.pool_timeout = pool_timeout
+        self.log_enabled = log_enabled
+        self.pool: Optional[AsyncConnectionPool] = None
+        self._cursor_ids = count(1)
+        # Connexion réservée par la tâche courante (transaction en cours)
+        self._connection: ContextVar[Optional[AsyncConnection]] = ContextVar("connection", default=None)
+    
+    async def connect(self) -> None:
+        """Ouvre le pool de connexions asynchrone."""
+        try:
+            self.pool = AsyncConnectionPool(
+                kwargs={
+                    "dbname": self.dbname,
+                    "user": self.user,
+                    "password": self.password,
+                    "host": self.host,
+                    "port": self.port,
+                    "row_factory": dict_row
+                },
+                min_size=self.min_connections,
+                max_size=self.max_connections,
+                max_lifetime=self.max_lifetime,
+                timeout=self.pool_timeout,
+                check=AsyncConnectionPool.check_connection,
+                open=False
+            )
+            await self.pool.open(wait=True)
+            self._log(logging.INFO, f"Pool de connexions PostgreSQL asynchrone établi "
+                      f"({self.min_connections}-{self.max_connections}).", event="connect", pooled=True)
+        except Exception as e:
+            self._log(logging.ERROR, f"Erreur lors de la connexion à PostgreSQL: {e}", event="connect", error=str(e))
+            raise
+    
+    async def disconnect(self) -> None:
+        """Ferme le pool de connexions."""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+            self._log(logging.INFO, "Pool de connexions PostgreSQL asynchrone fermé.", event="disconnect")
+    
+    def _log(self, level: int, message: str, **fields: Any) -> None:
+        """
+        Journalise un message; les champs structurés sont exposés dans l'attribut
+        `pgm` de l'enregistrement de log.
+        """
+        if self.log_enabled:
+            logger.log(level, message, extra={"pgm": fields})
+    
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Emprunte une connexion le temps d'un bloc `async with`.
+        
+        Si la tâche courante a ouvert une transaction, c'est sa connexion qui est retournée.
+        
+        :return: Connexion empruntée
+        """
+        pinned = self._connection.get()
+        if pinned is not None:
+            yield pinned
+            return
+        
+        if self.pool is None:
+            raise RuntimeError("Aucune connexion ouverte: appelez connect() d'abord")
+        
+        conn = await self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            await self.pool.putconn(conn)
+    
+    async def execute_query(self, query: Union[str, sql.Composable], params: Optional[tuple] = None,
+                            fetch: bool = False) -> Optional[List[Dict]]:
+        """
+        Exécute une requête SQL et retourne éventuellement les résultats.
+        
+        :param query: Requête SQL à exécuter
+        :param params: Paramètres pour la requête (optionnel)
+        :param fetch: Si True, retourne les résultats (pour SELECT)
+        :return: Résultats de la requête ou None
+        """
+        async with self.get_connection() as conn:
+            in_transaction = self._connection.get() is conn
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    result = await cursor.fetchall() if fetch else None
+                if not in_transaction:
+                    await conn.commit()
+                return result
+            except Exception as e:
+                if not in_transaction:
+                    await conn.rollback()
+                self._log(logging.ERROR, f"Erreur lors de l'exécution de la requête: {e}", event="query", error=str(e))
+                raise
+    
+    async def iter_query(self, query: Union[str, sql.Composable], params: Optional[tuple] = None,
+                         itersize: int = 2000) -> AsyncIterator[Dict]:
+        """
+        Exécute une requête via un curseur serveur et produit les lignes à la demande.
+        
+        :param query: Requête SQL à exécuter (SELECT)
+        :param params: Paramètres pour la requête (optionnel)
+        :param itersize: Nombre de lignes récupérées par aller-retour
+        :return: Itérateur asynchrone de lignes sous forme de dictionnaires
+        """
+        async with self.get_connection() as conn:
+            in_transaction = self._connection.get() is conn
+            cursor = conn.cursor(name=f"pgm_stream_{next(self._cursor_ids)}")
+            cursor.itersize = itersize
+            try:
+                await cursor.execute(query, params)
+                async for row in cursor:
+                    yield row
+            except Exception as e:
+                if not in_transaction:
+                    await conn.rollback()
+                self._log(logging.ERROR, f"Erreur lors de l'exécution de la requête: {e}", event="query", error=str(e))
+                raise
+            finally:
+                await cursor.close()
+                if not in_transaction and not conn.closed:
+                    await conn.commit()
+    
+    async def create_table(self, table_name: str, columns: Dict[str, str], if_not_exists: bool = True) -> None:
+        """
+        Crée une nouvelle table dans la base de données.
+        
+        :param table_name: Nom de la table
+        :param columns: Dictionnaire des colonnes (nom: type)
+        :param if_not_exists: Si True, ajoute la clause IF NOT EXISTS
+        """
+        if_not_exists_clause = "IF NOT EXISTS" if if_not_exists else ""
+        columns_def = ", ".join([f"{col_name} {col_type}" for col_name, col_type in columns.items()])
+        
+        query = f"CREATE TABLE {if_not_exists_clause} {table_name} ({columns_def});"
+        await self.execute_query(query)
+        self._log(logging.INFO, f"Table '{table_name}' créée avec succès.", event="create_table", table=table_name)
+    
+    async def drop_table(self, table_name: str, if_exists: bool = True) -> None:
+        """
+        Supprime une table de la base de données.
+        
+        :param table_name: Nom de la table
+        :param if_exists: Si True, ajoute la clause IF EXISTS
+        """
+        if_exists_clause = "IF EXISTS" if if_exists else ""
+        query = f"DROP TABLE {if_exists_clause} {table_name};"
+        await self.execute_query(query)
+        self._log(logging.INFO, f"Table '{table_name}' supprimée avec succès.", event="drop_table", table=table_name)
+    
+    async def insert_data(self, table_name: str, data: Dict[str, Any]) -> None:
+        """
+        Insère des données dans une table.
+        
+        :param table_name: Nom de la table
+        :param data: Dictionnaire des données à insérer (colonne: valeur)
+        """
+        columns = data.keys()
+        values = [data[col] for col in columns]
+        
+        query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.SQL(', ').join(sql.Placeholder() * len(values))
+        )
+        
+        await self.execute_query(query, tuple(values))
+        self._log(logging.INFO, f"Données insérées dans '{table_name}' avec succès.", event="insert", table=table_name)
+    
+    async def update_data(self, table_name: str, data: Dict[str, Any], condition: str, condition_params: Optional[tuple] = None) -> None:
+        """
+        Met à jour des données dans une table.
+        
+        :param table_name: Nom de la table
+        :param data: Dictionnaire des données à mettre à jour (colonne: nouvelle valeur)
+        :param condition: Condition WHERE pour la mise à jour
+        :param condition_params: Paramètres pour la condition (optionnel)
+        """
+        set_clause = ", ".join([f"{col} = %s" for col in data.keys()])
+        values = tuple(data.values())
+        
+        if condition_params:
+            values += condition_params
+        
+        query = f"UPDATE {table_name} SET {set_clause} WHERE {condition};"
+        await self.execute_query(query, values)
+        self._log(logging.INFO, f"Données mises à jour dans '{table_name}' avec succès.", event="update", table=table_name)
+    
+    async def delete_data(self, table_name: str, condition: str, condition_params: Optional[tuple] = None) -> None:
+        """
+        Supprime des données d'une table.
+        
+        :param table_name: Nom de la table
+        :param condition: Condition WHERE pour la suppression
+        :param condition_params: Paramètres pour la condition (optionnel)
+        """
+        query = f"DELETE FROM {table_name} WHERE {condition};"
+        await self.execute_query(query, condition_params)
+        self._log(logging.INFO, f"Données supprimées de '{table_name}' avec succès.", event="delete", table=table_name)
+    
+    def select_data(self, table_name: str, columns: List[str] = ["*"], condition: Optional[str] = None, condition_params: Optional[tuple] = None,
+                    stream: bool = False, itersize: int = 2000):
+        """
+        Récupère des données d'une table.
+        
+        Sans `stream`, retourne une coroutine à attendre (`await`); avec `stream=True`,
+        retourne un itérateur asynchrone à parcourir avec `async for`.
+        
+        :param table_name: Nom de la table
+        :param columns: Liste des colonnes à récupérer (par défaut toutes)
+        :param condition: Condition WHERE (optionnelle)
+        :param condition_params: Paramètres pour la condition (optionnel)
+        :param stream: Si True, retourne un itérateur asynchrone alimenté par un curseur serveur
+        :param itersize: Nombre de lignes récupérées par aller-retour en mode stream
+        :return: Coroutine retournant la liste des lignes, ou itérateur asynchrone en mode stream
+        """
+        cols = ", ".join(columns)
+        query = f"SELECT {cols} FROM {table_name}"
+        
+        if condition:
+            query += f" WHERE {condition}"
+        
+        query += ";"
+        
+        if stream:
+            return self.iter_query(query, condition_params, itersize=itersize)
+        return self.execute_query(query, condition_params, fetch=True)
+    
+    async def begin_transaction(self) -> None:
+        """Commence une transaction: la tâche courante garde sa connexion jusqu'à commit/rollback."""
+        if self._connection.get() is not None:
+            raise RuntimeError("Une transaction est déjà en cours dans cette tâche")
+        if self.pool is None:
+            raise RuntimeError("Aucune connexion ouverte: appelez connect() d'abord")
+        self._connection.set(await self.pool.getconn())
+    
+    async def commit_transaction(self) -> None:
+        """Valide la transaction en cours."""
+        conn = self._connection.get()
+        if conn is None:
+            return
+        try:
+            await conn.commit()
+        finally:
+            await self._release_transaction_connection(conn)
+    
+    async def rollback_transaction(self) -> None:
+        """Annule la transaction en cours."""
+        conn = self._connection.get()
+        if conn is None:
+            return
+        try:
+            await conn.rollback()
+        finally:
+            await self._release_transaction_connection(conn)
+    
+    async def _release_transaction_connection(self, conn: AsyncConnection) -> None:
+        """Rend au pool la connexion réservée par `begin_transaction`."""
+        self._connection.set(None)
+        await self.pool.putconn(conn)
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Exécute un bloc `async with` dans une transaction validée à la sortie
+        (ou annulée si une exception est levée).
+        
+        :return: Connexion portant la transaction
+        """
+        await self.begin_transaction()
+        try:
+            yield self._connection.get()
+        except BaseException:
+            await self.rollback_transaction()
+            raise
+        else:
+            await self.commit_transaction()
+    
+    async def table_exists(self, table_name: str) -> bool:
+        """
+        Vérifie si une table existe dans la base de données.
+        
+        :param table_name: Nom de la table à vérifier
+        :return: True si la table existe, False sinon
+        """
+        query = """
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables
+            WHERE table_schema = 'public'
+            AND table_name = %s
+        );
+        """
+        result = await self.execute_query(query, (table_name,), fetch=True)
+        return result[0]['exists'] if result else False
+    
+    async def get_table_columns(self, table_name: str) -> List[str]:
+        """
+        Récupère la liste des colonnes d'une table.
+        
+        :param table_name: Nom de la table
+        :return: Liste des noms de colonnes
+        """
+        query = """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        AND table_name = %s;
+        """
+        result = await self.execute_query(query, (table_name,), fetch=True)
+        return [row['column_name'] for row in result] if result else []
+
+
+# Exemple d'utilisation
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    
+    async def main() -> None:
+        db_manager = AsyncPostgreSQLManager(
+            dbname="ma_base_de_donnees",
+            user="mon_utilisateur",
+            password="mon_mot_de_passe"
+        )
+        try:
+            await db_manager.connect()
+            
+            # Requêtes concurrentes sur le pool
+            counts = await asyncio.gather(*[
+                db_manager.execute_query("SELECT count(*) AS n FROM clients WHERE id > %s", (i,), fetch=True)
+                for i in range(10)
+            ])
+            print("Comptages:", [rows[0]['n'] for rows in counts])
+            
+            # Parcours en flux
+            async for client in db_manager.select_data("clients", stream=True):
+                print(client)
+        except Exception as e:
+            print(f"Une erreur est survenue: {e}")
+        finally:
+            await db_manager.disconnect()
+    
+    asyncio.run(main())
@@ -1,7 +1,371 @@
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from typing import Optional, Dict, List
-from PostgresqlManager import PostgreSQLManager
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from typing import Optional, Dict, List, Callable, Any, Union
+from psycopg2.extensions import QueryCanceledError
+from PostgresqlManager import PostgreSQLManager, QueryCursor, TablePager, PlanAdvisor
+
+
+class VirtualResultsGrid:
+    """
+    Grille de résultats virtualisée: seules les lignes visibles sont matérialisées
+    dans le Treeview. Les pages suivantes sont lues à la demande depuis un curseur
+    serveur au fil du défilement.
+    """
+    
+    PAGE_SIZE = 500
+    PREFETCH_MARGIN = 200
+    
+    def __init__(self, parent: tk.Widget, run_in_background: Callable):
+        """
+        Crée les widgets de la grille (à placer par l'appelant).
+        
+        :param parent: Widget parent
+        :param run_in_background: Fonction d'exécution en arrière-plan de l'interface
+        """
+        self.run_in_background = run_in_background
+        self.tree = ttk.Treeview(parent, show="headings", selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.on_scrollbar)
+        self.counter_label = ttk.Label(parent, text="")
+        
+        self.tree.bind("<Configure>", lambda event: self.render())
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-3 if event.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_rows()))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_rows()))
+        
+        self.source: Optional[Union[QueryCursor, TablePager]] = None
+        self.rows: List[tuple] = []
+        self.total: Optional[int] = None
+        self.offset = 0
+        self.loading = False
+        # Incrémenté à chaque nouveau résultat pour ignorer les pages d'un résultat remplacé
+        self.generation = 0
+    
+    def set_source(self, source: Union[QueryCursor, TablePager], first_rows: List[tuple]) -> None:
+        """
+        Affiche un résultat lu à la demande depuis un curseur serveur ou par clé.
+        
+        :param source: Curseur paginé ouvert (ou lecteur de table par clé)
+        :param first_rows: Première page déjà lue
+        """
+        self.clear()
+        self.source = source
+        self.rows = list(first_rows)
+        if source.exhausted:
+            self.total = len(self.rows)
+        self.set_columns(source.columns)
+        self.render()
+    
+    def set_rows(self, columns: List[str], rows: List[tuple]) -> None:
+        """
+        Affiche un résultat déjà entièrement chargé en mémoire.
+        
+        :param columns: Noms des colonnes
+        :param rows: Lignes à afficher
+        """
+        self.clear()
+        self.rows = rows
+        self.total = len(rows)
+        self.set_columns(columns)
+        self.render()
+    
+    def set_total(self, generation: int, total: int) -> None:
+        """
+        Renseigne le nombre total de lignes lorsqu'il est connu.
+        
+        :param generation: Génération du résultat concerné
+        :param total: Nombre total de lignes
+        """
+        if generation == self.generation and self.total is None:
+            self.total = total
+            self.render()
+    
+    def set_columns(self, columns: List[str]) -> None:
+        """Configure les colonnes du Treeview."""
+        self.tree["columns"] = columns
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100, anchor="w")
+    
+    def clear(self) -> None:
+        """Vide la grille et ferme le curseur éventuel en arrière-plan."""
+        self.generation += 1
+        if self.source is not None:
+            source, self.source = self.source, None
+            self.run_in_background(source.close, lambda _: None)
+        self.rows = []
+        self.total = None
+        self.offset = 0
+        self.loading = False
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.tree["columns"] = []
+        self.counter_label.config(text="")
+    
+    def visible_rows(self) -> int:
+        """Nombre de lignes que la hauteur actuelle du Treeview permet d'afficher."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Une ligne est occupée par les en-têtes
+        return max(1, self.tree.winfo_height() // row_height - 1)
+    
+    def row_count(self) -> int:
+        """Nombre de lignes sur lequel porte la barre de défilement."""
+        return self.total if self.total is not None else len(self.rows)
+    
+    def on_scrollbar(self, action: str, value: str, unit: Optional[str] = None) -> None:
+        """Traduit les commandes de la barre de défilement en déplacement dans le résultat."""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.row_count()))
+        elif action == "scroll":
+            self.scroll_by(int(value) * (self.visible_rows() if unit == "pages" else 1))
+    
+    def scroll_by(self, delta: int) -> None:
+        """Décale la fenêtre visible de `delta` lignes."""
+        self.scroll_to(self.offset + delta)
+    
+    def scroll_to(self, offset: int) -> None:
+        """Positionne la première ligne visible sur `offset`."""
+        self.offset = max(0, min(offset, self.row_count() - self.visible_rows()))
+        self.render()
+    
+    def render(self) -> None:
+        """Met à jour les seules lignes visibles du Treeview et déclenche la lecture de la page suivante si besoin."""
+        visible = self.visible_rows()
+        self.offset = max(0, min(self.offset, len(self.rows) - visible))
+        window = self.rows[self.offset:self.offset + visible]
+        
+        items = self.tree.get_children()
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+            items = items[:len(window)]
+        for item, row in zip(items, window):
+            self.tree.item(item, values=row)
+        for row in window[len(items):]:
+            self.tree.insert("", "end", values=row)
+        
+        count = max(self.row_count(), 1)
+        self.scrollbar.set(self.offset / count, min(1.0, (self.offset + len(window)) / count))
+        total = self.total if self.total is not None else "?"
+        self.counter_label.config(text=f"Lignes chargées: {len(self.rows)} / total: {total}" if self.tree["columns"] else "")
+        
+        self.fetch_more_if_needed()
+    
+    def fetch_more_if_needed(self) -> None:
+        """Lit la page suivante en arrière-plan lorsque la fenêtre visible approche de la fin des lignes chargées."""
+        source = self.source
+        if source is None or source.exhausted or self.loading:
+            return
+        if self.offset + self.visible_rows() + self.PREFETCH_MARGIN < len(self.rows):
+            return
+        
+        generation = self.generation
+        
+        def on_page(rows: List[tuple]) -> None:
+            if generation != self.generation:
+                return
+            self.loading = False
+            self.rows.extend(rows)
+            if source.exhausted:
+                self.total = len(self.rows)
+            self.render()
+        
+        def on_error(e: Exception) -> None:
+            if generation == self.generation:
+                self.loading = False
+                messagebox.showerror("Erreur", f"Impossible de lire la suite des résultats: {str(e)}")
+        
+        self.loading = True
+        self.run_in_background(lambda: source.fetch(self.PAGE_SIZE), on_page, on_error)
+
+
+class MonitorWindow:
+    """
+    Fenêtre de supervision du serveur: sessions actives, attentes de verrous,
+    requêtes les plus coûteuses et statistiques des tables.
+    
+    Les vues sont relevées en arrière-plan toutes les `interval` secondes; un
+    relevé n'est lancé que lorsque le précédent est terminé.
+    """
+    
+    TABS = {
+        "activity": ("Activité", ("pid", "usename", "datname", "state", "wait", "duration", "query")),
+        "locks": ("Verrous", ("chain", "pid", "blocked_by", "mode", "relation", "wait_duration", "query")),
+        "statements": ("Requêtes", ("calls", "total_ms", "mean_ms", "rows", "shared_blks_read", "query")),
+        "tables": ("Tables", ("table_name", "seq_scan", "seq_tup_read", "idx_scan", "n_live_tup", "n_dead_tup",
+                              "dead_ratio", "total_bytes"))
+    }
+    
+    def __init__(self, parent: tk.Tk, db_manager: PostgreSQLManager, run_in_background: Callable,
+                 interval: int = 5):
+        """
+        Crée et affiche la fenêtre.
+        
+        :param parent: Fenêtre principale
+        :param db_manager: Gestionnaire connecté
+        :param run_in_background: Fonction d'exécution en arrière-plan de l'interface
+        :param interval: Intervalle d'actualisation en secondes
+        """
+        self.db_manager = db_manager
+        self.run_in_background = run_in_background
+        self.loading = False
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Moniteur du serveur")
+        self.window.geometry("1000x500")
+        
+        toolbar = ttk.Frame(self.window)
+        toolbar.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        
+        ttk.Button(toolbar, text="Actualiser", command=self.refresh).pack(side="left", padx=2)
+        self.auto_refresh = tk.BooleanVar(value=True)
+        ttk.Checkbutton(toolbar, text="Auto", variable=self.auto_refresh).pack(side="left", padx=2)
+        self.interval = tk.IntVar(value=interval)
+        ttk.Spinbox(toolbar, from_=1, to=60, width=4, textvariable=self.interval).pack(side="left", padx=2)
+        ttk.Label(toolbar, text="s").pack(side="left")
+        self.include_idle = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text="Sessions inactives", variable=self.include_idle).pack(side="left", padx=10)
+        
+        ttk.Button(toolbar, text="Terminer la session", command=lambda: self.signal_backend(terminate=True)).pack(side="right", padx=2)
+        ttk.Button(toolbar, text="Annuler la requête", command=lambda: self.signal_backend(terminate=False)).pack(side="right", padx=2)
+        
+        self.status_label = ttk.Label(self.window, text="")
+        self.status_label.grid(row=2, column=0, sticky="w", padx=5)
+        
+        notebook = ttk.Notebook(self.window)
+        notebook.grid(row=1, column=0, sticky="nsew", padx=5)
+        self.trees: Dict[str, ttk.Treeview] = {}
+        for key, (title, columns) in self.TABS.items():
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            tree = ttk.Treeview(frame, columns=columns, show="headings", selectmode="browse")
+            for column in columns:
+                tree.heading(column, text=column)
+                tree.column(column, width=300 if column == "query" else 90, anchor="w")
+            tree.grid(row=0, column=0, sticky="nsew")
+            scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+            scrollbar.grid(row=0, column=1, sticky="ns")
+            tree.configure(yscrollcommand=scrollbar.set)
+            frame.columnconfigure(0, weight=1)
+            frame.rowconfigure(0, weight=1)
+            self.trees[key] = tree
+        self.notebook = notebook
+        
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(1, weight=1)
+        
+        self.refresh()
+        self.schedule()
+    
+    def schedule(self) -> None:
+        """Programme l'actualisation automatique suivante."""
+        if not self.window.winfo_exists():
+            return
+        if self.auto_refresh.get():
+            self.refresh()
+        try:
+            delay = max(1, int(self.interval.get()))
+        except (tk.TclError, ValueError):
+            delay = 5
+        self.window.after(delay * 1000, self.schedule)
+    
+    def refresh(self) -> None:
+        """Relève toutes les vues en arrière-plan."""
+        if self.loading or not self.window.winfo_exists():
+            return
+        db_manager = self.db_manager
+        include_idle = self.include_idle.get()
+        
+        def collect() -> Dict[str, List[Dict]]:
+            return {
+                "activity": db_manager.get_activity(include_idle),
+                "locks": db_manager.get_lock_waits(),
+                "statements": db_manager.get_top_statements(),
+                "tables": db_manager.get_table_stats()
+            }
+        
+        def on_error(e: Exception) -> None:
+            self.loading = False
+            if self.window.winfo_exists():
+                self.status_label.config(text=f"Erreur lors de l'actualisation: {str(e)}")
+        
+        self.loading = True
+        self.run_in_background(collect, self.display, on_error)
+    
+    @staticmethod
+    def format_value(column: str, row: Dict) -> Any:
+        """Valeur d'une cellule, mise en forme pour l'affichage."""
+        if column == "wait":
+            return f"{row['wait_event_type']}: {row['wait_event']}" if row.get("wait_event") else ""
+        if column == "chain":
+            return " → ".join(str(pid) for pid in row["chain"])
+        value = row.get(column)
+        if value is None:
+            return ""
+        if column in ("duration", "wait_duration"):
+            return f"{value:.1f} s"
+        if column in ("total_ms", "mean_ms"):
+            return f"{value:.1f}"
+        if column == "dead_ratio":
+            return f"{100 * value:.1f} %"
+        if column == "total_bytes":
+            return f"{value / 1048576:.1f} Mo"
+        if column == "query":
+            return " ".join(str(value).split())
+        return value
+    
+    def display(self, views: Dict[str, List[Dict]]) -> None:
+        """Remplace le contenu des vues par un nouveau relevé."""
+        self.loading = False
+        if not self.window.winfo_exists():
+            return
+        for key, rows in views.items():
+            tree = self.trees[key]
+            # La sélection est conservée d'un relevé à l'autre (par pid)
+            selected = tree.set(tree.focus(), "pid") if tree.focus() and "pid" in tree["columns"] else None
+            tree.delete(*tree.get_children())
+            columns = self.TABS[key][1]
+            for row in rows:
+                item = tree.insert("", "end", values=[self.format_value(column, row) for column in columns])
+                if selected is not None and str(row.get("pid")) == selected:
+                    tree.focus(item)
+                    tree.selection_set(item)
+        locks = len(views["locks"])
+        self.status_label.config(
+            text=f"{len(views['activity'])} session(s), {locks} attente(s) de verrou"
+                 + ("" if views["statements"] else " — pg_stat_statements indisponible")
+                 + f" — {time.strftime('%H:%M:%S')}"
+        )
+    
+    def signal_backend(self, terminate: bool) -> None:
+        """
+        Annule la requête ou termine la session sélectionnée (onglets Activité et Verrous).
+        
+        :param terminate: Si True, termine la session; sinon annule seulement sa requête
+        """
+        key = list(self.TABS)[self.notebook.index(self.notebook.select())]
+        tree = self.trees[key if key in ("activity", "locks") else "activity"]
+        item = tree.focus()
+        if not item:
+            messagebox.showwarning("Avertissement", "Veuillez sélectionner une session", parent=self.window)
+            return
+        pid = int(tree.set(item, "pid"))
+        action = "terminer la session" if terminate else "annuler la requête de la session"
+        if not messagebox.askyesno("Confirmation", f"Voulez-vous {action} {pid}?", parent=self.window):
+            return
+        
+        signal = self.db_manager.terminate_backend if terminate else self.db_manager.cancel_backend
+        self.run_in_background(
+            lambda: signal(pid),
+            lambda done: self.refresh(),
+            lambda e: messagebox.showerror("Erreur", f"Action impossible: {str(e)}", parent=self.window)
+        )
+
+
 class PostgreSQLGUI:
     """
     Interface graphique pour le gestionnaire de base de données PostgreSQL.
@@ -24,6 +388,12 @@ class PostgreSQLGUI:
         self.connected = False
         self.current_table = ""
         
+        # Exécution en arrière-plan: les threads de travail déposent leurs
+        # résultats dans la file, relevée périodiquement par le thread Tk
+        self.task_queue: queue.Queue = queue.Queue()
+        self.running_connection = None
+        self.query_started_at: Optional[float] = None
+        
         # Création de l'interface
         self.create_connection_frame()
         self.create_table_frame()
@@ -32,6 +402,8 @@ class PostgreSQLGUI:
         
         # Désactiver les widgets tant qu'on n'est pas connecté
         self.toggle_widgets_state()
+        
+        self.root.after(100, self.process_task_queue)
     
     def create_connection_frame(self) -> None:
         """
@@ -67,6 +439,9 @@ class PostgreSQLGUI:
         self.connect_btn = ttk.Button(frame, text="Connexion", command=self.connect_db)
         self.connect_btn.grid(row=2, column=3, sticky="e", padx=5)
         
+        self.monitor_btn = ttk.Button(frame, text="Moniteur", command=self.show_monitor)
+        self.monitor_btn.grid(row=2, column=2, sticky="e", padx=5)
+        
         # Configurer le redimensionnement
         frame.columnconfigure(1, weight=1)
         frame.columnconfigure(3, weight=1)
@@ -83,6 +458,7 @@ class PostgreSQLGUI:
         self.tables_listbox = tk.Listbox(frame, height=10)
         self.tables_listbox.grid(row=1, column=0, sticky="nsew", pady=5)
         self.tables_listbox.bind("<<ListboxSelect>>", self.on_table_select)
+        self.tables_listbox.bind("<Double-Button-1>", lambda event: self.browse_table())
         
         # Boutons pour les tables
         btn_frame = ttk.Frame(frame)
@@ -91,12 +467,21 @@ class PostgreSQLGUI:
         self.refresh_tables_btn = ttk.Button(btn_frame, text="Actualiser", command=self.refresh_tables_list)
         self.refresh_tables_btn.pack(side="left", padx=2)
         
+        self.browse_table_btn = ttk.Button(btn_frame, text="Parcourir", command=self.browse_table)
+        self.browse_table_btn.pack(side="left", padx=2)
+        
         self.create_table_btn = ttk.Button(btn_frame, text="Créer", command=self.show_create_table_dialog)
         self.create_table_btn.pack(side="left", padx=2)
         
         self.drop_table_btn = ttk.Button(btn_frame, text="Supprimer", command=self.drop_table)
         self.drop_table_btn.pack(side="left", padx=2)
         
+        self.export_table_btn = ttk.Button(btn_frame, text="Exporter", command=self.export_table)
+        self.export_table_btn.pack(side="left", padx=2)
+        
+        self.import_table_btn = ttk.Button(btn_frame, text="Importer", command=self.import_table)
+        self.import_table_btn.pack(side="left", padx=2)
+        
         # Structure de la table sélectionnée
         ttk.Label(frame, text="Structure de la table:").grid(row=3, column=0, sticky="w", pady=(10,0))
         self.table_structure_tree = ttk.Treeview(frame, columns=("type", "nullable"), show="headings", height=5)
@@ -105,10 +490,36 @@ class PostgreSQLGUI:
         self.table_structure_tree.heading("nullable", text="Nullable")
         self.table_structure_tree.grid(row=4, column=0, sticky="nsew", pady=5)
         
+        # Index de la table sélectionnée
+        ttk.Label(frame, text="Index de la table:").grid(row=5, column=0, sticky="w", pady=(10,0))
+        self.indexes_tree = ttk.Treeview(frame, columns=("method", "size", "scans", "definition"), height=4)
+        self.indexes_tree.heading("#0", text="Index")
+        self.indexes_tree.heading("method", text="Méthode")
+        self.indexes_tree.heading("size", text="Taille")
+        self.indexes_tree.heading("scans", text="Parcours")
+        self.indexes_tree.heading("definition", text="Définition")
+        self.indexes_tree.column("#0", width=120)
+        for column in ("method", "size", "scans"):
+            self.indexes_tree.column(column, width=60, anchor="e")
+        self.indexes_tree.grid(row=6, column=0, sticky="nsew", pady=5)
+        
+        index_btn_frame = ttk.Frame(frame)
+        index_btn_frame.grid(row=7, column=0, sticky="ew")
+        
+        self.create_index_btn = ttk.Button(index_btn_frame, text="Créer un index", command=self.show_create_index_dialog)
+        self.create_index_btn.pack(side="left", padx=2)
+        
+        self.drop_index_btn = ttk.Button(index_btn_frame, text="Supprimer l'index", command=self.drop_index)
+        self.drop_index_btn.pack(side="left", padx=2)
+        
+        self.index_advice_btn = ttk.Button(index_btn_frame, text="Conseils", command=self.show_index_advice)
+        self.index_advice_btn.pack(side="left", padx=2)
+        
         # Configurer le redimensionnement
         frame.columnconfigure(0, weight=1)
         frame.rowconfigure(1, weight=1)
         frame.rowconfigure(4, weight=1)
+        frame.rowconfigure(6, weight=1)
     
     def create_query_frame(self) -> None:
         """
@@ -128,9 +539,21 @@ class PostgreSQLGUI:
         self.execute_query_btn = ttk.Button(btn_frame, text="Exécuter", command=self.execute_query)
         self.execute_query_btn.pack(side="left", padx=2)
         
+        self.explain_query_btn = ttk.Button(btn_frame, text="Expliquer", command=self.explain_query)
+        self.explain_query_btn.pack(side="left", padx=2)
+        
         self.clear_query_btn = ttk.Button(btn_frame, text="Effacer", command=self.clear_query)
         self.clear_query_btn.pack(side="left", padx=2)
         
+        self.cancel_query_btn = ttk.Button(btn_frame, text="Annuler", command=self.cancel_query, state="disabled")
+        self.cancel_query_btn.pack(side="left", padx=2)
+        
+        self.export_query_btn = ttk.Button(btn_frame, text="Exporter le résultat", command=self.export_query)
+        self.export_query_btn.pack(side="left", padx=2)
+        
+        self.elapsed_label = ttk.Label(btn_frame, text="")
+        self.elapsed_label.pack(side="right", padx=2)
+        
         # Boutons CRUD rapides
         crud_frame = ttk.Frame(frame)
         crud_frame.grid(row=2, column=0, sticky="ew", pady=(10,0))
@@ -151,14 +574,16 @@ class PostgreSQLGUI:
         frame = ttk.LabelFrame(self.root, text="Résultats", padding=10)
         frame.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=10, pady=5)
         
-        # Treeview pour afficher les résultats sous forme de tableau
-        self.results_tree = ttk.Treeview(frame)
+        # Grille virtualisée pour afficher les résultats sous forme de tableau
+        self.results_grid = VirtualResultsGrid(frame, self.run_in_background)
+        self.results_tree = self.results_grid.tree
         self.results_tree.grid(row=0, column=0, sticky="nsew")
         
-        # Barre de défilement
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.results_tree.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.results_tree.configure(yscrollcommand=scrollbar.set)
+        # Barre de défilement (pilotée par la grille, pas par le Treeview)
+        self.results_grid.scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        # Compteur de lignes chargées / total
+        self.results_grid.counter_label.grid(row=2, column=0, columnspan=2, sticky="w")
         
         # Zone de texte pour les messages (nombre de lignes affectées, etc.)
         self.message_text = tk.Text(frame, height=3, state="disabled")
@@ -180,17 +605,31 @@ class PostgreSQLGUI:
         
         # Widgets à activer/désactiver
         widgets = [
+            self.monitor_btn,
             self.refresh_tables_btn,
+            self.browse_table_btn,
             self.create_table_btn,
             self.drop_table_btn,
+            self.export_table_btn,
+            self.import_table_btn,
+            self.create_index_btn,
+            self.drop_index_btn,
+            self.index_advice_btn,
             self.execute_query_btn,
             self.clear_query_btn,
+            self.export_query_btn,
             self.query_editor
         ]
         
         for widget in widgets:
             widget.config(state=state)
         
+        # Pas de nouvelle requête tant que la précédente est en cours
+        running = self.query_started_at is not None
+        self.execute_query_btn.config(state="disabled" if running or not self.connected else "normal")
+        self.explain_query_btn.config(state="disabled" if running or not self.connected else "normal")
+        self.cancel_query_btn.config(state="normal" if running else "disabled")
+        
         # Bouton de connexion/déconnexion
         self.connect_btn.config(
             text="Déconnexion" if self.connected else "Connexion",
@@ -212,12 +651,15 @@ class PostgreSQLGUI:
                 messagebox.showerror("Erreur", "Veuillez remplir tous les champs obligatoires")
                 return
             
+            # Pool de connexions: la requête en cours ne bloque pas la navigation
             self.db_manager = PostgreSQLManager(
                 dbname=dbname,
                 user=user,
                 password=password,
                 host=host,
-                port=port
+                port=port,
+                min_connections=1,
+                max_connections=4
             )
             self.db_manager.connect()
             self.connected = True
@@ -232,6 +674,7 @@ class PostgreSQLGUI:
         Ferme la connexion à la base de données.
         """
         if self.db_manager:
+            self.cancel_query()
             self.db_manager.disconnect()
             self.connected = False
             self.toggle_widgets_state()
@@ -240,6 +683,14 @@ class PostgreSQLGUI:
             self.show_message("Déconnecté de la base de données.")
         self.db_manager = None
     
+    def show_monitor(self) -> None:
+        """
+        Ouvre la fenêtre de supervision du serveur.
+        """
+        if not self.db_manager or not self.connected:
+            return
+        MonitorWindow(self.root, self.db_manager, self.run_in_background)
+    
     def refresh_tables_list(self) -> None:
         """
         Actualise la liste des tables dans la base de données.
@@ -247,16 +698,23 @@ class PostgreSQLGUI:
         if not self.db_manager or not self.connected:
             return
         
-        try:
+        db_manager = self.db_manager
+        
+        def on_success(tables: List[str]) -> None:
             self.tables_listbox.delete(0, tk.END)
-            tables = self.db_manager.execute_query(
-                "SELECT table_name FROM information_schema.tables WHERE table_schema='public'",
-                fetch=True
-            )
             for table in tables:
-                self.tables_listbox.insert(tk.END, table['table_name'])
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Impossible de récupérer les tables: {str(e)}")
+                self.tables_listbox.insert(tk.END, table)
+        
+        def fetch_tables() -> List[str]:
+            # Un seul chargement du catalogue sert ensuite la structure des tables
+            db_manager.refresh_schema_cache()
+            return db_manager.get_tables()
+        
+        self.run_in_background(
+            fetch_tables,
+            on_success,
+            lambda e: messagebox.showerror("Erreur", f"Impossible de récupérer les tables: {str(e)}")
+        )
     
     def on_table_select(self, event: tk.Event) -> None:
         """
@@ -275,28 +733,164 @@ class PostgreSQLGUI:
         if not self.current_table or not self.db_manager:
             return
         
-        try:
+        db_manager = self.db_manager
+        table_name = self.current_table
+        
+        def fetch_structure() -> Any:
+            # Détails des colonnes, servis par le cache du schéma
+            return db_manager.get_table_structure(table_name), db_manager.list_indexes(table_name)
+        
+        def on_success(result: Any) -> None:
+            # Ignorer une réponse arrivée après la sélection d'une autre table
+            if table_name != self.current_table:
+                return
+            structure, indexes = result
+            
             # Effacer l'arborescence actuelle
             for item in self.table_structure_tree.get_children():
                 self.table_structure_tree.delete(item)
             
-            # Récupérer les colonnes de la table
-            columns = self.db_manager.get_table_columns(self.current_table)
-            
-            # Récupérer les détails des colonnes
-            query = """
-            SELECT column_name, data_type, is_nullable 
-            FROM information_schema.columns 
-            WHERE table_name = %s;
-            """
-            result = self.db_manager.execute_query(query, (self.current_table,), fetch=True)
-            
             # Ajouter les colonnes à l'arborescence
-            for row in result:
+            for row in structure:
                 self.table_structure_tree.insert("", "end", text=row['column_name'], 
                                               values=(row['data_type'], row['is_nullable']))
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Impossible de récupérer la structure de la table: {str(e)}")
+            
+            # Index avec leur taille et leur utilisation
+            self.indexes_tree.delete(*self.indexes_tree.get_children())
+            for index in indexes:
+                self.indexes_tree.insert("", "end", text=index['index_name'], values=(
+                    index['method'], f"{index['size_bytes'] / 1048576:.1f} Mo", index['idx_scan'], index['definition']
+                ))
+        
+        self.run_in_background(
+            fetch_structure,
+            on_success,
+            lambda e: messagebox.showerror("Erreur", f"Impossible de récupérer la structure de la table: {str(e)}")
+        )
+    
+    def show_create_index_dialog(self) -> None:
+        """
+        Affiche une boîte de dialogue pour créer un index sur la table sélectionnée.
+        """
+        if not self.current_table:
+            messagebox.showwarning("Avertissement", "Veuillez sélectionner une table")
+            return
+        
+        table_name = self.current_table
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Créer un index sur '{table_name}'")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        ttk.Label(dialog, text="Nom (optionnel):").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        name_entry = ttk.Entry(dialog)
+        name_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        
+        ttk.Label(dialog, text="Colonnes:").grid(row=1, column=0, padx=5, pady=5, sticky="ne")
+        columns_listbox = tk.Listbox(dialog, selectmode="extended", height=6, exportselection=False)
+        for column in self.db_manager.get_table_columns(table_name):
+            columns_listbox.insert(tk.END, column)
+        columns_listbox.grid(row=1, column=1, padx=5, pady=5, sticky="nsew")
+        
+        ttk.Label(dialog, text="Méthode:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        method_combobox = ttk.Combobox(dialog, values=PostgreSQLManager.INDEX_METHODS, state="readonly")
+        method_combobox.set("btree")
+        method_combobox.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        
+        ttk.Label(dialog, text="Condition (index partiel):").grid(row=3, column=0, padx=5, pady=5, sticky="e")
+        where_entry = ttk.Entry(dialog)
+        where_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        
+        unique_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(dialog, text="Unique", variable=unique_var).grid(row=4, column=1, sticky="w", padx=5)
+        concurrently_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(dialog, text="Sans bloquer les écritures (CONCURRENTLY)",
+                        variable=concurrently_var).grid(row=5, column=1, sticky="w", padx=5)
+        
+        def create_index() -> None:
+            columns = [columns_listbox.get(i) for i in columns_listbox.curselection()]
+            if not columns:
+                messagebox.showerror("Erreur", "Veuillez sélectionner au moins une colonne", parent=dialog)
+                return
+            
+            db_manager = self.db_manager
+            options = {
+                "index_name": name_entry.get().strip() or None,
+                "method": method_combobox.get(),
+                "unique": unique_var.get(),
+                "where": where_entry.get().strip() or None,
+                "concurrently": concurrently_var.get()
+            }
+            dialog.destroy()
+            self.show_message(f"Création de l'index sur '{table_name}'...")
+            
+            def on_success(_: Any) -> None:
+                self.show_message(f"Index créé sur '{table_name}' ({', '.join(columns)}).")
+                self.show_table_structure()
+            
+            # La création d'un index peut être longue: elle s'exécute en arrière-plan
+            self.run_in_background(
+                lambda: db_manager.create_index(table_name, columns, **options),
+                on_success,
+                lambda e: messagebox.showerror("Erreur", f"Impossible de créer l'index: {str(e)}")
+            )
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.grid(row=6, column=0, columnspan=2, pady=5)
+        ttk.Button(btn_frame, text="Créer", command=create_index).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Annuler", command=dialog.destroy).pack(side="left", padx=5)
+        
+        dialog.columnconfigure(1, weight=1)
+        dialog.rowconfigure(1, weight=1)
+    
+    def drop_index(self) -> None:
+        """
+        Supprime l'index sélectionné dans la liste des index.
+        """
+        item = self.indexes_tree.focus()
+        if not item:
+            messagebox.showwarning("Avertissement", "Veuillez sélectionner un index")
+            return
+        
+        index_name = self.indexes_tree.item(item, "text")
+        if not messagebox.askyesno("Confirmation", f"Êtes-vous sûr de vouloir supprimer l'index '{index_name}'?"):
+            return
+        
+        db_manager = self.db_manager
+        
+        def on_success(_: Any) -> None:
+            self.show_message(f"Index '{index_name}' supprimé avec succès!")
+            self.show_table_structure()
+        
+        self.run_in_background(
+            lambda: db_manager.drop_index(index_name, concurrently=True),
+            on_success,
+            lambda e: messagebox.showerror("Erreur", f"Impossible de supprimer l'index: {str(e)}")
+        )
+    
+    def show_index_advice(self) -> None:
+        """
+        Affiche les conseils d'indexation (index inutilisés, tables lues par parcours séquentiels).
+        """
+        if not self.db_manager or not self.connected:
+            return
+        
+        def on_success(advice: List[Dict]) -> None:
+            window = tk.Toplevel(self.root)
+            window.title("Conseils d'indexation")
+            text = scrolledtext.ScrolledText(window, width=100, height=20, wrap=tk.WORD)
+            text.pack(fill="both", expand=True, padx=5, pady=5)
+            if not advice:
+                text.insert(tk.END, "Aucun problème détecté.\n")
+            for entry in advice:
+                text.insert(tk.END, f"• {entry['message']}\n")
+            text.config(state="disabled")
+        
+        self.run_in_background(
+            self.db_manager.index_advice,
+            on_success,
+            lambda e: messagebox.showerror("Erreur", f"Impossible d'analyser les index: {str(e)}")
+        )
     
     def show_create_table_dialog(self) -> None:
         """
@@ -356,9 +950,37 @@ class PostgreSQLGUI:
         # Ajouter une première colonne par défaut
         add_column_row()
         
+        # Partitionnement déclaratif (optionnel)
+        partition_frame = ttk.LabelFrame(dialog, text="Partitionnement", padding=10)
+        partition_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+        
+        ttk.Label(partition_frame, text="Méthode:").grid(row=0, column=0, padx=5, pady=2, sticky="e")
+        partition_method = ttk.Combobox(partition_frame, values=["aucun", "range", "list", "hash"], state="readonly",
+                                        width=8)
+        partition_method.set("aucun")
+        partition_method.grid(row=0, column=1, padx=5, pady=2, sticky="w")
+        
+        ttk.Label(partition_frame, text="Clé:").grid(row=0, column=2, padx=5, pady=2, sticky="e")
+        partition_key_entry = ttk.Entry(partition_frame)
+        partition_key_entry.grid(row=0, column=3, padx=5, pady=2, sticky="ew")
+        
+        # Partitions par fenêtre de temps créées à l'avance (RANGE sur une date)
+        ttk.Label(partition_frame, text="Partitions:").grid(row=1, column=0, padx=5, pady=2, sticky="e")
+        partition_interval = ttk.Combobox(partition_frame, values=["aucune", "day", "week", "month", "year"],
+                                          state="readonly", width=8)
+        partition_interval.set("aucune")
+        partition_interval.grid(row=1, column=1, padx=5, pady=2, sticky="w")
+        
+        ttk.Label(partition_frame, text="Fenêtres d'avance:").grid(row=1, column=2, padx=5, pady=2, sticky="e")
+        partition_ahead = ttk.Spinbox(partition_frame, from_=0, to=60, width=5)
+        partition_ahead.set(3)
+        partition_ahead.grid(row=1, column=3, padx=5, pady=2, sticky="w")
+        
+        partition_frame.columnconfigure(3, weight=1)
+        
         # Boutons de la boîte de dialogue
         btn_frame = ttk.Frame(dialog)
-        btn_frame.grid(row=2, column=0, columnspan=2, pady=5)
+        btn_frame.grid(row=3, column=0, columnspan=2, pady=5)
         
         def create_table() -> None:
             table_name = table_name_entry.get()
@@ -384,11 +1006,27 @@ class PostgreSQLGUI:
                 messagebox.showerror("Erreur", "Veuillez ajouter au moins une colonne valide")
                 return
             
+            method = partition_method.get()
+            partition_by = None if method == "aucun" else method
+            partition_key = partition_key_entry.get().strip()
+            if partition_by and not partition_key:
+                messagebox.showerror("Erreur", "Veuillez spécifier la clé de partitionnement")
+                return
+            interval = partition_interval.get()
+            if interval != "aucune" and partition_by != "range":
+                messagebox.showerror("Erreur", "Les partitions par fenêtre de temps nécessitent la méthode range")
+                return
+            
             try:
-                self.db_manager.create_table(table_name, columns_spec)
+                self.db_manager.create_table(table_name, columns_spec, partition_by=partition_by,
+                                             partition_key=partition_key or None)
+                created = []
+                if interval != "aucune":
+                    created = self.db_manager.create_time_partitions(table_name, interval, int(partition_ahead.get()))
                 self.refresh_tables_list()
                 dialog.destroy()
-                self.show_message(f"Table '{table_name}' créée avec succès!")
+                self.show_message(f"Table '{table_name}' créée avec succès!"
+                                  + (f" {len(created)} partition(s) créée(s)." if created else ""))
             except Exception as e:
                 messagebox.showerror("Erreur", f"Impossible de créer la table: {str(e)}")
         
@@ -419,6 +1057,47 @@ class PostgreSQLGUI:
         except Exception as e:
             messagebox.showerror("Erreur", f"Impossible de supprimer la table: {str(e)}")
     
+    def browse_table(self) -> None:
+        """
+        Affiche le contenu de la table sélectionnée dans la grille.
+        
+        Les pages sont lues par clé primaire (pagination keyset), sans garder de
+        connexion ouverte; une table sans clé primaire est lue via un curseur serveur.
+        """
+        if not self.db_manager or not self.connected:
+            return
+        if not self.current_table:
+            messagebox.showwarning("Avertissement", "Veuillez sélectionner une table")
+            return
+        
+        db_manager = self.db_manager
+        table_name = self.current_table
+        
+        def open_source() -> Any:
+            primary_key = db_manager.get_primary_key(table_name)
+            if primary_key:
+                source = TablePager(db_manager, table_name, primary_key)
+            else:
+                source = db_manager.open_cursor(f'SELECT * FROM "{table_name}"')
+            try:
+                return source, source.fetch(VirtualResultsGrid.PAGE_SIZE)
+            except Exception:
+                source.close()
+                raise
+        
+        def on_success(result: Any) -> None:
+            source, first_rows = result
+            self.results_grid.set_source(source, first_rows)
+            self.show_message(f"Contenu de la table '{table_name}'")
+            if not source.exhausted:
+                self.count_query_rows(f'SELECT * FROM "{table_name}"')
+        
+        self.run_in_background(
+            open_source,
+            on_success,
+            lambda e: messagebox.showerror("Erreur", f"Impossible de parcourir la table: {str(e)}")
+        )
+    
     def execute_query(self) -> None:
         """
         Exécute la requête SQL saisie dans l'éditeur.
@@ -431,22 +1110,381 @@ class PostgreSQLGUI:
             messagebox.showwarning("Avertissement", "Veuillez saisir une requête SQL")
             return
         
-        try:
-            # Détecter le type de requête
-            query_type = query.split()[0].upper()
+        if self.query_started_at is not None:
+            return
+        
+        # Détecter le type de requête
+        query_type = query.split()[0].upper()
+        fetch = query_type in ("SELECT", "SHOW", "DESCRIBE", "EXPLAIN")
+        # Les requêtes acceptées par DECLARE CURSOR sont lues page par page
+        stream = query_type in ("SELECT", "WITH", "VALUES", "TABLE")
+        db_manager = self.db_manager
+        
+        def run_query() -> Any:
+            if stream:
+                cursor = db_manager.open_cursor(query)
+                # La connexion du curseur est exposée pour permettre l'annulation côté serveur
+                self.running_connection = cursor.connection
+                try:
+                    return cursor, cursor.fetch(VirtualResultsGrid.PAGE_SIZE)
+                except Exception:
+                    cursor.close()
+                    raise
+                finally:
+                    self.running_connection = None
             
-            if query_type in ("SELECT", "SHOW", "DESCRIBE", "EXPLAIN"):
+            # La connexion empruntée est exposée pour permettre l'annulation côté serveur
+            with db_manager.get_connection() as conn:
+                self.running_connection = conn
+                try:
+                    return db_manager.execute_query(query, fetch=fetch)
+                finally:
+                    self.running_connection = None
+        
+        def on_success(result: Any) -> None:
+            elapsed = self.finish_query()
+            if stream:
+                cursor, first_rows = result
+                self.results_grid.set_source(cursor, first_rows)
+                self.show_message(f"Premières lignes affichées en {elapsed:.2f} s")
+                if not cursor.exhausted:
+                    self.count_query_rows(query)
+            elif fetch:
                 # Requête qui retourne des résultats
-                result = self.db_manager.execute_query(query, fetch=True)
                 self.display_results(result)
-                self.show_message(f"{len(result)} ligne(s) retournée(s)")
+                self.show_message(f"{len(result)} ligne(s) retournée(s) en {elapsed:.2f} s")
             else:
                 # Requête de modification (INSERT, UPDATE, DELETE, etc.)
-                affected = self.db_manager.execute_query(query)
                 self.clear_results()
-                self.show_message(f"Requête exécutée avec succès. {affected} ligne(s) affectée(s)" if affected else "Requête exécutée avec succès.")
-        except Exception as e:
+                self.show_message(f"Requête exécutée avec succès en {elapsed:.2f} s.")
+        
+        def on_error(e: Exception) -> None:
+            elapsed = self.finish_query()
+            if isinstance(e, QueryCanceledError):
+                self.show_message(f"Requête annulée après {elapsed:.2f} s.")
+                return
             messagebox.showerror("Erreur", f"Erreur lors de l'exécution de la requête: {str(e)}")
+        
+        self.query_started_at = time.monotonic()
+        self.toggle_widgets_state()
+        self.show_message("Exécution en cours...")
+        self.run_in_background(run_query, on_success, on_error)
+    
+    EXPORT_FILETYPES = [
+        ("CSV", "*.csv"),
+        ("CSV gzip", "*.csv.gz"),
+        ("CSV zstd", "*.csv.zst"),
+        ("COPY binaire", "*.bin"),
+        ("COPY binaire gzip", "*.bin.gz"),
+        ("Tous les fichiers", "*.*")
+    ]
+    
+    @staticmethod
+    def copy_format(path: str) -> str:
+        """
+        Format COPY déduit du nom de fichier: binaire pour *.bin[.gz|.zst], CSV sinon.
+        
+        :param path: Chemin du fichier
+        :return: "binary" ou "csv"
+        """
+        name = path.lower()
+        for suffix in (".gz", ".zst"):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        return "binary" if name.endswith(".bin") else "csv"
+    
+    def copy_progress(self, action: str) -> Callable[[int, Optional[int]], None]:
+        """
+        Callback de progression d'un export/import, relayé au thread Tk.
+        
+        :param action: Libellé de l'opération ("Export", "Import")
+        :return: Callback (octets transférés, total)
+        """
+        def progress(done: int, total: Optional[int]) -> None:
+            message = f"{action}: {done / 1048576:.1f} Mo"
+            if total:
+                message += f" / {total / 1048576:.1f} Mo ({100 * done / total:.0f} %)"
+            self.task_queue.put((self.show_message, message))
+        
+        return progress
+    
+    def run_copy(self, action: str, task: Callable[[], int], done_message: str) -> None:
+        """
+        Exécute un export/import en arrière-plan.
+        
+        :param action: Libellé de l'opération ("Export", "Import")
+        :param task: Fonction qui effectue le transfert et retourne le nombre de lignes
+        :param done_message: Message affiché à la fin (formaté avec `rows`)
+        """
+        self.show_message(f"{action} en cours...")
+        self.run_in_background(
+            task,
+            lambda rows: self.show_message(done_message.format(rows=rows)),
+            lambda e: messagebox.showerror("Erreur", f"{action} impossible: {str(e)}")
+        )
+    
+    def export_table(self) -> None:
+        """
+        Exporte la table sélectionnée dans un fichier (CSV ou COPY binaire).
+        """
+        if not self.current_table:
+            messagebox.showwarning("Avertissement", "Veuillez sélectionner une table")
+            return
+        
+        path = filedialog.asksaveasfilename(title="Exporter la table", initialfile=f"{self.current_table}.csv",
+                                            filetypes=self.EXPORT_FILETYPES)
+        if not path:
+            return
+        
+        db_manager = self.db_manager
+        table_name = self.current_table
+        self.run_copy(
+            "Export",
+            lambda: db_manager.export_table(table_name, path, format=self.copy_format(path),
+                                            progress=self.copy_progress("Export")),
+            f"{{rows}} ligne(s) exportée(s) vers '{path}'."
+        )
+    
+    def import_table(self) -> None:
+        """
+        Importe un fichier (CSV ou COPY binaire) dans la table sélectionnée.
+        """
+        if not self.current_table:
+            messagebox.showwarning("Avertissement", "Veuillez sélectionner une table")
+            return
+        
+        path = filedialog.askopenfilename(title=f"Importer dans '{self.current_table}'",
+                                          filetypes=self.EXPORT_FILETYPES)
+        if not path:
+            return
+        
+        db_manager = self.db_manager
+        table_name = self.current_table
+        self.run_copy(
+            "Import",
+            lambda: db_manager.import_table(table_name, path, format=self.copy_format(path),
+                                            progress=self.copy_progress("Import")),
+            f"{{rows}} ligne(s) importée(s) dans '{table_name}'."
+        )
+    
+    def export_query(self) -> None:
+        """
+        Exporte le résultat de la requête de l'éditeur dans un fichier, sans le
+        charger dans la grille.
+        """
+        query = self.query_editor.get("1.0", tk.END).strip()
+        if not query:
+            messagebox.showwarning("Avertissement", "Veuillez saisir une requête SQL")
+            return
+        
+        path = filedialog.asksaveasfilename(title="Exporter le résultat", initialfile="resultat.csv",
+                                            filetypes=self.EXPORT_FILETYPES)
+        if not path:
+            return
+        
+        db_manager = self.db_manager
+        self.run_copy(
+            "Export",
+            lambda: db_manager.export_query(query, path, format=self.copy_format(path),
+                                            progress=self.copy_progress("Export")),
+            f"{{rows}} ligne(s) exportée(s) vers '{path}'."
+        )
+    
+    def explain_query(self) -> None:
+        """
+        Exécute la requête de l'éditeur avec EXPLAIN (ANALYZE, BUFFERS) en arrière-plan
+        et affiche son plan. Les écritures éventuelles de la requête sont annulées.
+        """
+        if not self.db_manager or not self.connected:
+            return
+        
+        query = self.query_editor.get("1.0", tk.END).strip()
+        if not query:
+            messagebox.showwarning("Avertissement", "Veuillez saisir une requête SQL")
+            return
+        
+        if self.query_started_at is not None:
+            return
+        
+        db_manager = self.db_manager
+        
+        def run_explain() -> PlanAdvisor:
+            # La connexion empruntée est exposée pour permettre l'annulation côté serveur
+            with db_manager.get_connection() as conn:
+                self.running_connection = conn
+                try:
+                    return PlanAdvisor(db_manager.explain(query))
+                finally:
+                    self.running_connection = None
+        
+        def on_success(advisor: PlanAdvisor) -> None:
+            elapsed = self.finish_query()
+            self.show_message(f"Plan obtenu en {elapsed:.2f} s")
+            self.show_plan_window(advisor)
+        
+        def on_error(e: Exception) -> None:
+            elapsed = self.finish_query()
+            if isinstance(e, QueryCanceledError):
+                self.show_message(f"Analyse annulée après {elapsed:.2f} s.")
+                return
+            messagebox.showerror("Erreur", f"Impossible d'obtenir le plan: {str(e)}")
+        
+        self.query_started_at = time.monotonic()
+        self.toggle_widgets_state()
+        self.show_message("Analyse du plan en cours...")
+        self.run_in_background(run_explain, on_success, on_error)
+    
+    def show_plan_window(self, advisor: PlanAdvisor) -> None:
+        """
+        Affiche un plan d'exécution sous forme d'arbre, avec les nœuds les plus
+        coûteux mis en évidence et les recommandations de l'analyse.
+        
+        :param advisor: Plan analysé
+        """
+        window = tk.Toplevel(self.root)
+        window.title("Plan d'exécution")
+        window.geometry("1000x600")
+        
+        plan = advisor.plan
+        ttk.Label(
+            window,
+            text=f"Planification: {plan.get('Planning Time', 0):.3f} ms   "
+                 f"Exécution: {plan.get('Execution Time', 0):.3f} ms"
+        ).grid(row=0, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+        
+        columns = ("self", "total", "loops", "estimated", "actual", "error", "hit", "read", "temp")
+        headings = ("Temps propre (ms)", "Temps total (ms)", "Boucles", "Lignes estimées", "Lignes réelles",
+                    "Erreur d'estimation", "Tampons lus (cache)", "Tampons lus (disque)", "Blocs temp. écrits")
+        tree = ttk.Treeview(window, columns=columns)
+        tree.heading("#0", text="Nœud")
+        tree.column("#0", width=280, anchor="w")
+        for column, heading in zip(columns, headings):
+            tree.heading(column, text=heading)
+            tree.column(column, width=85, anchor="e")
+        tree.tag_configure("expensive", background="#f8d0d0")
+        tree.tag_configure("warning", foreground="#a04000")
+        tree.grid(row=1, column=0, sticky="nsew", padx=(5, 0))
+        
+        scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        findings = advisor.advise()
+        flagged = {finding["node"] for finding in findings}
+        expensive = set(advisor.most_expensive())
+        items: Dict[int, str] = {}
+        for node in advisor.nodes:
+            tags = []
+            if node["index"] in expensive:
+                tags.append("expensive")
+            if node["index"] in flagged:
+                tags.append("warning")
+            items[node["index"]] = tree.insert(
+                items.get(node["parent"], ""), "end", text=node["label"], open=True, tags=tags,
+                values=(f"{node['self_ms']:.3f}", f"{node['total_ms']:.3f}", node["loops"], node["plan_rows"],
+                        node["actual_rows"], f"×{node['misestimate']:.1f}", node["shared_hit"],
+                        node["shared_read"], node["temp_written"])
+            )
+        
+        # Recommandations
+        advice = scrolledtext.ScrolledText(window, height=8, wrap=tk.WORD)
+        advice.grid(row=2, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+        if not findings:
+            advice.insert(tk.END, "Aucun problème détecté.\n")
+        for finding in findings:
+            advice.insert(tk.END, f"• {finding['message']}\n")
+            if finding["index"]:
+                advice.insert(tk.END, f"    Index candidat: {finding['index']}\n")
+        advice.config(state="disabled")
+        
+        # Un double-clic sur un nœud affiche ses attributs bruts
+        def show_node_details(event: tk.Event) -> None:
+            selected = tree.focus()
+            for index, item in items.items():
+                if item == selected:
+                    node = advisor.nodes[index]["node"]
+                    details = "\n".join(f"{key}: {value}" for key, value in node.items() if key != "Plans")
+                    messagebox.showinfo(advisor.nodes[index]["label"], details, parent=window)
+                    return
+        
+        tree.bind("<Double-Button-1>", show_node_details)
+        
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(1, weight=1)
+    
+    def count_query_rows(self, query: str) -> None:
+        """
+        Compte en arrière-plan les lignes d'une requête affichée par pages.
+        
+        :param query: Requête dont le résultat est affiché
+        """
+        db_manager = self.db_manager
+        generation = self.results_grid.generation
+        count_query = f"SELECT count(*) AS total FROM ({query.rstrip().rstrip(';')}) AS pgm_count"
+        
+        self.run_in_background(
+            lambda: db_manager.execute_query(count_query, fetch=True)[0]['total'],
+            lambda total: self.results_grid.set_total(generation, total),
+            lambda e: None
+        )
+    
+    def cancel_query(self) -> None:
+        """
+        Demande au serveur d'annuler la requête en cours d'exécution.
+        """
+        conn = self.running_connection
+        if conn is not None:
+            conn.cancel()
+            self.show_message("Annulation demandée...")
+    
+    def finish_query(self) -> float:
+        """
+        Marque la fin de la requête en cours et réactive les boutons.
+        
+        :return: Durée d'exécution en secondes
+        """
+        elapsed = time.monotonic() - self.query_started_at if self.query_started_at is not None else 0.0
+        self.query_started_at = None
+        self.elapsed_label.config(text=f"Durée: {elapsed:.2f} s")
+        self.toggle_widgets_state()
+        return elapsed
+    
+    def run_in_background(self, task: Callable[[], Any], on_success: Callable[[Any], None],
+                          on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """
+        Exécute une tâche dans un thread de travail pour ne pas bloquer l'interface.
+        
+        Les callbacks sont appelés dans le thread Tk via `process_task_queue`.
+        
+        :param task: Fonction à exécuter en arrière-plan
+        :param on_success: Appelé avec le résultat de la tâche
+        :param on_error: Appelé avec l'exception levée par la tâche (optionnel)
+        """
+        def worker() -> None:
+            try:
+                result = task()
+            except Exception as e:
+                if on_error:
+                    self.task_queue.put((on_error, e))
+                return
+            self.task_queue.put((on_success, result))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def process_task_queue(self) -> None:
+        """
+        Relève les résultats des tâches d'arrière-plan et met à jour la durée affichée.
+        """
+        try:
+            while True:
+                callback, value = self.task_queue.get_nowait()
+                callback(value)
+        except queue.Empty:
+            pass
+        finally:
+            if self.query_started_at is not None:
+                self.elapsed_label.config(text=f"Durée: {time.monotonic() - self.query_started_at:.1f} s")
+            self.root.after(100, self.process_task_queue)
     
     def display_results(self, results: List[Dict]) -> None:
         """
@@ -460,24 +1498,15 @@ class PostgreSQLGUI:
             self.show_message("Aucun résultat à afficher")
             return
         
-        # Configurer les colonnes du Treeview
+        # Seules les lignes visibles sont insérées dans le Treeview
         columns = list(results[0].keys())
-        self.results_tree["columns"] = columns
-        for col in columns:
-            self.results_tree.heading(col, text=col)
-            self.results_tree.column(col, width=100, anchor="w")
-        
-        # Ajouter les données
-        for row in results:
-            self.results_tree.insert("", "end", values=[row[col] for col in columns])
+        self.results_grid.set_rows(columns, [tuple(row[col] for col in columns) for row in results])
     
     def clear_results(self) -> None:
         """
         Efface les résultats affichés.
         """
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        self.results_tree["columns"] = []
+        self.results_grid.clear()
     
     def clear_query(self) -> None:
         """
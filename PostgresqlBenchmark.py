@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Any, Callable
+from PostgresqlManager import PostgreSQLManager
+
+class TemporaryCluster:
+    """
+    Cluster PostgreSQL jetable créé avec `initdb` dans un répertoire temporaire
+    et démarré avec `pg_ctl` (connexion par socket Unix, authentification trust).
+    """
+    
+    def __init__(self, bin_dir: Optional[str] = None, port: Optional[int] = None):
+        """
+        :param bin_dir: Répertoire des binaires PostgreSQL (par défaut, recherche dans le PATH)
+        :param port: Port d'écoute (par défaut, un port libre)
+        """
+        self.bin_dir = bin_dir
+        self.port = port or self._free_port()
+        self.directory: Optional[str] = None
+    
+    @staticmethod
+    def _free_port() -> int:
+        """Retourne un port TCP libre."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+    
+    def _binary(self, name: str) -> str:
+        """Chemin d'un binaire PostgreSQL."""
+        path = os.path.join(self.bin_dir, name) if self.bin_dir else shutil.which(name)
+        if not path:
+            raise RuntimeError(f"Binaire PostgreSQL introuvable: {name} (utilisez --pg-bin)")
+        return path
+    
+    def start(self) -> Dict[str, Any]:
+        """
+        Initialise et démarre le cluster.
+        
+        :return: Paramètres de connexion pour PostgreSQLManager
+        """
+        self.directory = tempfile.mkdtemp(prefix="pgm_bench_")
+        data_dir = os.path.join(self.directory, "data")
+        subprocess.run(
+            [self._binary("initdb"), "-D", data_dir, "-U", "postgres", "-A", "trust", "--no-sync"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        subprocess.run(
+            [self._binary("pg_ctl"), "-D", data_dir, "-w", "-l", os.path.join(self.directory, "server.log"),
+             "-o", f"-p {self.port} -k {self.directory} -c listen_addresses=''", "start"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        return {"dbname": "postgres", "user": "postgres", "password": "", "host": self.directory, "port": self.port}
+    
+    def stop(self) -> None:
+        """Arrête le cluster et supprime ses fichiers."""
+        if self.directory is None:
+            return
+        subprocess.run(
+            [self._binary("pg_ctl"), "-D", os.path.join(self.directory, "data"), "-m", "fast", "-w", "stop"],
+            stdout=subprocess.DEVNULL
+        )
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory = None
+    
+    def __enter__(self) -> Dict[str, Any]:
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class CrudBenchmark:
+    """
+    Mesure le débit et la latence (p50/p99) des chemins CRUD de PostgreSQLManager
+    sur des tables étroites (3 colonnes) et larges (`wide_columns` colonnes).
+    """
+    
+    TABLE = "pgm_bench"
+    
+    def __init__(self, manager: PostgreSQLManager, crud_ops: int = 1000, wide_columns: int = 30):
+        """
+        :param manager: Gestionnaire connecté à la base de test
+        :param crud_ops: Nombre d'opérations unitaires mesurées par scénario
+        :param wide_columns: Nombre de colonnes de la table large
+        """
+        self.manager = manager
+        self.crud_ops = crud_ops
+        self.wide_columns = wide_columns
+        self.results: List[Dict[str, Any]] = []
+    
+    @staticmethod
+    def percentile(samples: List[float], fraction: float) -> float:
+        """Percentile (méthode du rang le plus proche) d'une liste de durées."""
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+    
+    def record(self, name: str, rows: int, columns: int, ops: int, elapsed: float,
+               samples: Optional[List[float]] = None, **extra: Any) -> None:
+        """Ajoute un résultat et l'affiche."""
+        result = {
+            "name": name,
+            "rows": rows,
+            "columns": columns,
+            "ops": ops,
+            "seconds": elapsed,
+            "throughput": ops / elapsed if elapsed else None
+        }
+        if samples:
+            result["p50_ms"] = self.percentile(samples, 0.50) * 1000
+            result["p99_ms"] = self.percentile(samples, 0.99) * 1000
+        result.update(extra)
+        self.results.append(result)
+        print(f"{name:<24} rows={rows:<9} cols={columns:<3} {result['throughput'] or 0:>12.1f} ops/s"
+              + (f"  p50={result['p50_ms']:.3f} ms  p99={result['p99_ms']:.3f} ms" if samples else ""),
+              file=sys.stderr)
+    
+    def timed(self, operation: Callable[[int], Any], count: int) -> List[float]:
+        """Exécute `count` fois l'opération et retourne la durée de chaque appel."""
+        samples = []
+        for i in range(count):
+            started = time.perf_counter()
+            operation(i)
+            samples.append(time.perf_counter() - started)
+        return samples
+    
+    def columns_spec(self, columns: int) -> Dict[str, str]:
+        """Définition d'une table de test à `columns` colonnes (id compris)."""
+        spec = {"id": "BIGINT PRIMARY KEY"}
+        for i in range(1, columns):
+            spec[f"c{i}"] = "INTEGER" if i % 2 else "TEXT"
+        return spec
+    
+    def make_row(self, key: int, columns: int) -> Dict[str, Any]:
+        """Ligne de test de clé `key`."""
+        row = {"id": key}
+        for i in range(1, columns):
+            row[f"c{i}"] = key * i if i % 2 else f"valeur-{key}-{i}"
+        return row
+    
+    def reset_table(self, columns: int) -> None:
+        """(Re)crée la table de test vide."""
+        self.manager.drop_table(self.TABLE)
+        self.manager.create_table(self.TABLE, self.columns_spec(columns), if_not_exists=False)
+    
+    def bench_bulk_load(self, rows: int, columns: int) -> None:
+        """Chargement en masse via COPY puis via INSERT multi-lignes."""
+        for mode in ("copy", "values"):
+            self.reset_table(columns)
+            started = time.perf_counter()
+            self.manager.insert_many(self.TABLE, (self.make_row(i, columns) for i in range(rows)),
+                                     mode=mode, page_size=5000)
+            self.record(f"insert_many[{mode}]", rows, columns, rows, time.perf_counter() - started)
+    
+    def bench_single_row_crud(self, rows: int, columns: int) -> None:
+        """Opérations unitaires sur une table déjà remplie de `rows` lignes."""
+        ops = min(self.crud_ops, rows)
+        step = max(1, rows // ops)
+        
+        samples = self.timed(lambda i: self.manager.insert_data(self.TABLE, self.make_row(rows + i, columns)), ops)
+        self.record("insert_data", rows, columns, ops, sum(samples), samples)
+        
+        samples = self.timed(lambda i: self.manager.select_data(self.TABLE, condition="id = %s",
+                                                                condition_params=(i * step,)), ops)
+        self.record("select_data[pk]", rows, columns, ops, sum(samples), samples)
+        
+        samples = self.timed(lambda i: self.manager.update_data(self.TABLE, {"c1": i}, "id = %s", (i * step,)), ops)
+        self.record("update_data[pk]", rows, columns, ops, sum(samples), samples)
+        
+        samples = self.timed(lambda i: self.manager.delete_data(self.TABLE, "id = %s", (rows + i,)), ops)
+        self.record("delete_data[pk]", rows, columns, ops, sum(samples), samples)
+    
+    def bench_full_select(self, rows: int, columns: int) -> None:
+        """Lecture complète de la table: fetch=True (avec conversion en dictionnaires) puis en flux."""
+        self.manager.metrics.reset()
+        started = time.perf_counter()
+        self.manager.select_data(self.TABLE)
+        elapsed = time.perf_counter() - started
+        phases = next(iter(self.manager.metrics_snapshot().values()), {}).get("phases", {})
+        self.record("select_data[all]", rows, columns, rows, elapsed,
+                    fetch_seconds=phases.get("fetch"), convert_seconds=phases.get("convert"))
+        
+        started = time.perf_counter()
+        for _ in self.manager.select_data(self.TABLE, stream=True, itersize=5000):
+            pass
+        self.record("select_data[stream]", rows, columns, rows, time.perf_counter() - started)
+    
+    def run(self, sizes: List[int]) -> List[Dict[str, Any]]:
+        """
+        Exécute tous les scénarios pour chaque taille, sur table étroite et large.
+        
+        :param sizes: Nombres de lignes de la table
+        :return: Résultats
+        """
+        try:
+            for rows in sizes:
+                for columns in (3, self.wide_columns):
+                    self.bench_bulk_load(rows, columns)
+                    self.bench_full_select(rows, columns)
+                    self.bench_single_row_crud(rows, columns)
+        finally:
+            self.manager.drop_table(self.TABLE)
+        return self.results
+
+
+def git_revision() -> Optional[str]:
+    """Révision git du code mesuré (None hors d'un dépôt)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks CRUD de PostgreSQLManager")
+    parser.add_argument("--initdb", action="store_true", help="Crée un cluster PostgreSQL jetable pour la mesure")
+    parser.add_argument("--pg-bin", help="Répertoire des binaires initdb/pg_ctl")
+    parser.add_argument("--dbname", default="postgres")
+    parser.add_argument("--user", default="postgres")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=5432)
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Tailles de table séparées par des virgules (ex. 1000,1000000,10000000)")
+    parser.add_argument("--crud-ops", type=int, default=1000, help="Opérations unitaires mesurées par scénario")
+    parser.add_argument("--wide-columns", type=int, default=30, help="Nombre de colonnes de la table large")
+    parser.add_argument("--output", help="Fichier JSON de résultats (par défaut, sortie standard)")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cluster = TemporaryCluster(args.pg_bin) if args.initdb else None
+    config = cluster.start() if cluster else {
+        "dbname": args.dbname, "user": args.user, "password": args.password, "host": args.host, "port": args.port
+    }
+    
+    manager = PostgreSQLManager(**config, log_enabled=False)
+    try:
+        manager.connect()
+        server_version = manager.execute_query("SHOW server_version", fetch=True)[0]["server_version"]
+        results = CrudBenchmark(manager, args.crud_ops, args.wide_columns).run(sizes)
+    finally:
+        manager.disconnect()
+        if cluster:
+            cluster.stop()
+    
+    report = json.dumps({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "server_version": server_version,
+        "sizes": sizes,
+        "results": results
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
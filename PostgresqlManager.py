@@ -1,7 +1,1420 @@
+import gzip
+import io
+import json
+import logging
+import re
+import os
+import sys
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import chain, count, islice
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import DictCursor
-from typing import List, Dict, Union, Optional, Any
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR
+from psycopg2.extras import DictCursor, Json, execute_values
+from psycopg2.pool import PoolError
+from typing import List, Dict, Union, Optional, Any, Callable, Iterable, Iterator, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ManagedConnection(psycopg2.extensions.connection):
+    """
+    Connexion psycopg2 qui mémorise sa date de création et de dernière utilisation
+    (utilisées par le pool pour le recyclage et les contrôles de santé).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Requêtes préparées de la session (créé à la première utilisation)
+        self.statement_cache: Optional["PreparedStatementCache"] = None
+
+
+class ConnectionPool:
+    """
+    Pool de connexions thread-safe avec:
+    - un nombre minimal et maximal de connexions
+    - un contrôle de santé lors de l'emprunt d'une connexion restée inactive
+    - le recyclage des connexions ayant dépassé leur durée de vie maximale
+    """
+    
+    def __init__(self, connect: Callable[[], ManagedConnection], min_connections: int = 1, max_connections: int = 10,
+                 max_lifetime: Optional[float] = 3600.0, health_check_interval: float = 30.0,
+                 timeout: Optional[float] = 30.0):
+        """
+        Initialise le pool et ouvre les connexions minimales.
+        
+        :param connect: Fonction qui ouvre une nouvelle connexion
+        :param min_connections: Nombre de connexions ouvertes dès la création
+        :param max_connections: Nombre maximal de connexions simultanées
+        :param max_lifetime: Durée de vie maximale d'une connexion en secondes (None = illimitée)
+        :param health_check_interval: Inactivité (secondes) au-delà de laquelle la connexion est testée avant l'emprunt
+        :param timeout: Attente maximale (secondes) d'une connexion libre (None = illimitée)
+        """
+        if max_connections < 1 or min_connections < 0 or min_connections > max_connections:
+            raise ValueError("Bornes du pool invalides")
+        
+        self._connect = connect
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._idle: deque = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        
+        for _ in range(min_connections):
+            self._idle.append(self._connect())
+            self._size += 1
+    
+    def getconn(self) -> ManagedConnection:
+        """
+        Emprunte une connexion saine au pool, en attendant si nécessaire.
+        
+        :return: Connexion empruntée
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolError("Le pool de connexions est fermé")
+                    if self._idle:
+                        # LIFO: les connexions récemment utilisées restent chaudes
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_connections:
+                        self._size += 1
+                        conn = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolError("Aucune connexion disponible dans le pool")
+                    self._condition.wait(remaining)
+            
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+            
+            if self._is_usable(conn):
+                return conn
+            self._close_connection(conn)
+    
+    def putconn(self, conn: ManagedConnection, discard: bool = False) -> None:
+        """
+        Rend une connexion au pool.
+        
+        :param conn: Connexion à rendre
+        :param discard: Si True, la connexion est fermée au lieu d'être réutilisée
+        """
+        if not conn.closed and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        
+        if discard or self._closed or conn.closed or self._is_expired(conn):
+            self._close_connection(conn)
+            return
+        
+        conn.last_used = time.monotonic()
+        with self._condition:
+            self._idle.append(conn)
+            self._condition.notify()
+    
+    @contextmanager
+    def connection(self) -> Iterator[ManagedConnection]:
+        """
+        Emprunte une connexion le temps d'un bloc `with`.
+        
+        :return: Connexion empruntée
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+    
+    def close(self) -> None:
+        """Ferme le pool et toutes les connexions inactives."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._condition.notify_all()
+        for conn in idle:
+            self._close_connection(conn)
+    
+    def _is_expired(self, conn: ManagedConnection) -> bool:
+        """Indique si la connexion a dépassé sa durée de vie maximale."""
+        return self.max_lifetime is not None and time.monotonic() - conn.created_at > self.max_lifetime
+    
+    def _is_usable(self, conn: ManagedConnection) -> bool:
+        """Vérifie qu'une connexion inactive peut encore être utilisée."""
+        if conn.closed or self._is_expired(conn):
+            return False
+        if time.monotonic() - conn.last_used > self.health_check_interval:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        return True
+    
+    def _close_connection(self, conn: ManagedConnection) -> None:
+        """Ferme une connexion et libère sa place dans le pool."""
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        self._release_slot()
+    
+    def _release_slot(self) -> None:
+        """Libère une place dans le pool et réveille un emprunteur en attente."""
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+
+class ReplicaRouter:
+    """
+    Répartition des lectures entre les pools de connexions des réplicas.
+    
+    Un réplica injoignable est écarté pendant `retry_after` secondes; avec
+    `max_lag`, un réplica dont le retard de réplication dépasse la limite est
+    écarté jusqu'à la mesure suivante (au plus toutes les `check_interval` secondes).
+    """
+    
+    LAG_QUERY = """
+    SELECT CASE WHEN pg_is_in_recovery()
+                THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                ELSE 0 END
+    """
+    
+    def __init__(self, pools: List[ConnectionPool], strategy: str = "round_robin", max_lag: Optional[float] = None,
+                 check_interval: float = 5.0, retry_after: float = 5.0):
+        """
+        :param pools: Un pool de connexions par réplica
+        :param strategy: "round_robin" ou "least_loaded" (moins de connexions empruntées)
+        :param max_lag: Retard de réplication maximal accepté en secondes (None = pas de contrôle)
+        :param check_interval: Intervalle minimal entre deux mesures du retard d'un réplica
+        :param retry_after: Durée d'exclusion d'un réplica injoignable en secondes
+        """
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"Stratégie de répartition inconnue: {strategy}")
+        self.pools = pools
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._turn = count()
+        self._in_flight = [0] * len(pools)
+        self._lag = [0.0] * len(pools)
+        self._checked_at: List[Optional[float]] = [None] * len(pools)
+        self._down_until = [0.0] * len(pools)
+        self._lock = threading.Lock()
+    
+    def _candidates(self) -> List[int]:
+        """Réplicas utilisables, dans l'ordre de préférence de la stratégie."""
+        now = time.monotonic()
+        with self._lock:
+            available = [
+                i for i in range(len(self.pools))
+                if self._down_until[i] <= now and not (
+                    self.max_lag is not None and self._lag[i] > self.max_lag
+                    and self._checked_at[i] is not None and now - self._checked_at[i] < self.check_interval
+                )
+            ]
+            if not available:
+                return []
+            if self.strategy == "least_loaded":
+                return sorted(available, key=lambda i: self._in_flight[i])
+            start = next(self._turn) % len(available)
+            return available[start:] + available[:start]
+    
+    def _mark_down(self, index: int) -> None:
+        """Écarte un réplica injoignable pendant `retry_after` secondes."""
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_after
+    
+    def _lag_ok(self, index: int, conn: ManagedConnection) -> bool:
+        """Mesure si nécessaire le retard du réplica et indique s'il est acceptable."""
+        if self.max_lag is None:
+            return True
+        checked_at = self._checked_at[index]
+        if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+            with conn.cursor() as cursor:
+                cursor.execute(self.LAG_QUERY)
+                lag = float(cursor.fetchone()[0])
+            conn.rollback()
+            with self._lock:
+                self._lag[index] = lag
+                self._checked_at[index] = time.monotonic()
+        return self._lag[index] <= self.max_lag
+    
+    def acquire(self) -> Optional[Tuple[int, ManagedConnection]]:
+        """
+        Emprunte une connexion au réplica choisi par la stratégie.
+        
+        :return: (indice du réplica, connexion), ou None si aucun réplica n'est utilisable
+        """
+        for index in self._candidates():
+            pool = self.pools[index]
+            try:
+                conn = pool.getconn()
+            except (psycopg2.OperationalError, PoolError):
+                self._mark_down(index)
+                continue
+            try:
+                if not self._lag_ok(index, conn):
+                    pool.putconn(conn)
+                    continue
+            except psycopg2.Error:
+                pool.putconn(conn, discard=True)
+                self._mark_down(index)
+                continue
+            with self._lock:
+                self._in_flight[index] += 1
+            return index, conn
+        return None
+    
+    def release(self, index: int, conn: ManagedConnection) -> None:
+        """
+        Rend une connexion empruntée par `acquire`.
+        
+        :param index: Indice du réplica
+        :param conn: Connexion empruntée
+        """
+        with self._lock:
+            self._in_flight[index] -= 1
+        if conn.closed:
+            self._mark_down(index)
+        self.pools[index].putconn(conn)
+    
+    def close(self) -> None:
+        """Ferme les pools de tous les réplicas."""
+        for pool in self.pools:
+            pool.close()
+
+
+class PreparedStatementCache:
+    """
+    Cache LRU des requêtes préparées (`PREPARE`) d'une connexion, indexé par le
+    texte normalisé de la requête. Les requêtes qui ne peuvent pas être préparées
+    y sont aussi mémorisées (sans nom) pour ne pas retenter la préparation.
+    """
+    
+    def __init__(self, size: int):
+        """
+        :param size: Nombre maximal d'entrées
+        """
+        self.size = size
+        self._statements: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._ids = count(1)
+        # Version du schéma pour laquelle les requêtes ont été préparées
+        self.schema_version = 0
+        # Types des paramètres déduits par le serveur, par requête préparée
+        self.param_types: Dict[str, Tuple[str, ...]] = {}
+        # Requêtes périmées à désallouer dès que la transaction le permet
+        self.stale: List[str] = []
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._statements
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retourne le nom de la requête préparée et la marque comme récemment utilisée.
+        
+        :param key: Texte normalisé de la requête
+        :return: Nom de la requête préparée (None si inconnue ou non préparable)
+        """
+        name = self._statements.get(key)
+        if key in self._statements:
+            self._statements.move_to_end(key)
+        return name
+    
+    def clear(self) -> None:
+        """Oublie toutes les entrées (après un `DEALLOCATE ALL`)."""
+        self._statements.clear()
+        self.param_types.clear()
+        self.stale.clear()
+    
+    def discard(self, name: str) -> None:
+        """
+        Oublie une requête préparée (plan périmé), qui sera de nouveau préparée au prochain appel.
+        
+        :param name: Nom de la requête préparée
+        """
+        for key, value in list(self._statements.items()):
+            if value == name:
+                del self._statements[key]
+        self.param_types.pop(name, None)
+    
+    def accepts(self, name: str, params: Sequence[Any]) -> bool:
+        """
+        Indique si la requête préparée donne le même résultat que la requête
+        interpolée pour ces paramètres.
+        
+        `PREPARE` fixe le type de chaque paramètre d'après son contexte: 1.5 lié à
+        un paramètre integer serait arrondi, et un paramètre sans contexte
+        (ex. `SELECT %s`) est typé text. Une valeur qui ne correspond pas au type
+        déduit fait donc exécuter la requête sans préparation.
+        
+        :param name: Nom de la requête préparée
+        :param params: Paramètres de l'appel
+        :return: False si une valeur ne correspond pas au type de son paramètre
+        """
+        return all(self._compatible(value, type_name)
+                   for value, type_name in zip(params, self.param_types.get(name, ())))
+    
+    @staticmethod
+    def _compatible(value: Any, type_name: str) -> bool:
+        """Indique si une valeur, liée à un paramètre de ce type, se comporte comme son littéral psycopg2."""
+        if value is None or isinstance(value, str):
+            # Littéral non typé: le serveur le convertit de la même façon
+            return True
+        if isinstance(value, bool):
+            return type_name == "boolean"
+        if isinstance(value, int):
+            if type_name == "integer":
+                return -2 ** 31 <= value < 2 ** 31
+            return type_name in ("bigint", "numeric", "double precision")
+        if isinstance(value, (float, Decimal)):
+            return type_name in ("numeric", "double precision")
+        return type_name not in ("text", "unknown")
+    
+    def new_name(self) -> str:
+        """Génère un nom de requête préparée unique pour la session."""
+        return f"pgm_stmt_{next(self._ids)}"
+    
+    def add(self, key: str, name: Optional[str]) -> Optional[str]:
+        """
+        Ajoute une entrée et évince la moins récemment utilisée si le cache est plein.
+        
+        :param key: Texte normalisé de la requête
+        :param name: Nom de la requête préparée (None si non préparable)
+        :return: Nom de la requête préparée évincée, à désallouer (ou None)
+        """
+        self._statements[key] = name
+        if len(self._statements) > self.size:
+            _, evicted = self._statements.popitem(last=False)
+            if evicted is not None:
+                self.param_types.pop(evicted, None)
+            return evicted
+        return None
+
+
+class QueryCursor:
+    """
+    Curseur serveur paginé: les lignes (tuples) sont lues page par page à la
+    demande, sans jamais matérialiser le résultat complet côté client.
+    
+    Le curseur garde sa connexion jusqu'à `close()` (ou la sortie du bloc `with`).
+    """
+    
+    def __init__(self, manager: "PostgreSQLManager", query: Union[str, sql.Composable], params: Optional[tuple] = None):
+        """
+        Emprunte une connexion et déclare le curseur serveur.
+        
+        :param manager: Gestionnaire qui fournit la connexion
+        :param query: Requête SQL à exécuter (SELECT)
+        :param params: Paramètres pour la requête (optionnel)
+        """
+        self._lock = threading.Lock()
+        self._in_transaction = manager.in_transaction()
+        self._context = manager.get_connection(pin=False)
+        self.connection = self._context.__enter__()
+        self._cursor = self.connection.cursor(name=f"pgm_page_{next(manager._cursor_ids)}")
+        self.exhausted = False
+        self.rows_fetched = 0
+        try:
+            self._cursor.execute(query, params)
+        except Exception:
+            self.close()
+            raise
+    
+    @property
+    def columns(self) -> List[str]:
+        """Noms des colonnes du résultat (connus après la première lecture)."""
+        description = self._cursor.description
+        return [column.name for column in description] if description else []
+    
+    def fetch(self, size: int) -> List[tuple]:
+        """
+        Lit la page suivante.
+        
+        :param size: Nombre maximal de lignes à lire
+        :return: Lignes lues (liste vide une fois le résultat épuisé)
+        """
+        with self._lock:
+            if self.exhausted or self._context is None:
+                return []
+            rows = self._cursor.fetchmany(size)
+            if len(rows) < size:
+                self.exhausted = True
+            self.rows_fetched += len(rows)
+            return rows
+    
+    def close(self) -> None:
+        """Ferme le curseur, termine sa transaction et rend la connexion."""
+        with self._lock:
+            if self._context is None:
+                return
+            context, self._context = self._context, None
+            try:
+                if not self.connection.closed:
+                    if self.connection.get_transaction_status() == TRANSACTION_STATUS_INERROR:
+                        if not self._in_transaction:
+                            self.connection.rollback()
+                    else:
+                        self._cursor.close()
+                        if not self._in_transaction:
+                            self.connection.commit()
+            finally:
+                context.__exit__(None, None, None)
+    
+    def __enter__(self) -> "QueryCursor":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TablePager:
+    """
+    Lecture page par page d'une table par pagination par clé (keyset), avec la
+    même interface que `QueryCursor` (`columns`, `fetch`, `exhausted`, `close`).
+    
+    Contrairement à `QueryCursor`, aucune connexion n'est gardée entre deux pages:
+    chaque page est une requête indépendante qui reprend après la dernière clé lue.
+    """
+    
+    def __init__(self, manager: "PostgreSQLManager", table_name: str, order_by: List[str],
+                 columns: List[str] = ["*"]):
+        """
+        :param manager: Gestionnaire qui exécute les requêtes
+        :param table_name: Nom de la table
+        :param order_by: Colonnes de la clé de pagination (idéalement la clé primaire)
+        :param columns: Colonnes à lire (par défaut toutes)
+        """
+        self.manager = manager
+        self.table_name = table_name
+        self.order_by = order_by
+        self.select = columns
+        self.last_key: Optional[tuple] = None
+        self.exhausted = False
+        self.rows_fetched = 0
+        self._columns: List[str] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def columns(self) -> List[str]:
+        """Noms des colonnes du résultat (connus après la première lecture)."""
+        return self._columns
+    
+    def fetch(self, size: int) -> List[tuple]:
+        """
+        Lit la page suivante.
+        
+        :param size: Nombre maximal de lignes à lire
+        :return: Lignes lues (liste vide une fois la table parcourue)
+        """
+        with self._lock:
+            if self.exhausted:
+                return []
+            rows = self.manager.select_page(self.table_name, self.select, self.order_by,
+                                            after=self.last_key, limit=size)
+            if len(rows) < size:
+                self.exhausted = True
+            if not rows:
+                return []
+            if not self._columns:
+                self._columns = list(rows[0].keys())
+            self.last_key = self.manager.page_key(rows[-1], self.order_by)
+            self.rows_fetched += len(rows)
+            return [tuple(row[col] for col in self._columns) for row in rows]
+    
+    def close(self) -> None:
+        """Termine la lecture (aucune ressource serveur n'est gardée)."""
+        self.exhausted = True
+    
+    def __enter__(self) -> "TablePager":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class QueryMetrics:
+    """
+    Statistiques d'exécution des requêtes, groupées par texte normalisé
+    (littéraux et paramètres remplacés par `?`): nombre d'appels, erreurs,
+    lignes retournées/affectées, temps par phase et histogramme de latence.
+    """
+    
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    PHASES = ("execute", "fetch", "convert", "commit")
+    
+    _LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\$\d+")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries: Dict[str, Dict[str, Any]] = {}
+    
+    @classmethod
+    def normalize(cls, query: str) -> str:
+        """
+        Normalise le texte d'une requête pour regrouper ses exécutions.
+        
+        :param query: Texte de la requête
+        :return: Texte sans littéraux ni espaces superflus
+        """
+        return cls._LITERALS.sub("?", " ".join(query.split())).rstrip(";").rstrip()
+    
+    def record(self, query: str, timings: Dict[str, float], rows: int, error: bool = False) -> None:
+        """
+        Enregistre une exécution.
+        
+        :param query: Texte normalisé de la requête
+        :param timings: Durée de chaque phase en secondes
+        :param rows: Lignes retournées ou affectées
+        :param error: True si l'exécution a échoué
+        """
+        duration = sum(timings.values())
+        with self._lock:
+            stats = self._queries.get(query)
+            if stats is None:
+                stats = self._queries[query] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "total_time": 0.0,
+                    "min_time": None,
+                    "max_time": 0.0,
+                    "phases": dict.fromkeys(self.PHASES, 0.0),
+                    "buckets": [0] * (len(self.BUCKETS) + 1)
+                }
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["rows"] += max(rows, 0)
+            stats["total_time"] += duration
+            stats["min_time"] = duration if stats["min_time"] is None else min(stats["min_time"], duration)
+            stats["max_time"] = max(stats["max_time"], duration)
+            for phase, elapsed in timings.items():
+                stats["phases"][phase] += elapsed
+            stats["buckets"][next((i for i, bound in enumerate(self.BUCKETS) if duration <= bound), len(self.BUCKETS))] += 1
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Copie des statistiques courantes.
+        
+        :return: Dictionnaire requête normalisée: statistiques
+        """
+        with self._lock:
+            return {
+                query: dict(stats, phases=dict(stats["phases"]), buckets=list(stats["buckets"]))
+                for query, stats in self._queries.items()
+            }
+    
+    def reset(self) -> None:
+        """Remet toutes les statistiques à zéro."""
+        with self._lock:
+            self._queries.clear()
+    
+    def to_json(self) -> str:
+        """Exporte les statistiques au format JSON."""
+        return json.dumps({"buckets": list(self.BUCKETS), "queries": self.snapshot()}, indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Exporte les statistiques au format texte de Prometheus."""
+        def label(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+        
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP pgm_query_duration_seconds Durée des requêtes par texte normalisé.",
+            "# TYPE pgm_query_duration_seconds histogram"
+        ]
+        for query, stats in snapshot.items():
+            cumulative = 0
+            for bound, bucket in zip(self.BUCKETS + (float("inf"),), stats["buckets"]):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'pgm_query_duration_seconds_bucket{{query="{label(query)}",le="{le}"}} {cumulative}')
+            lines.append(f'pgm_query_duration_seconds_sum{{query="{label(query)}"}} {stats["total_time"]}')
+            lines.append(f'pgm_query_duration_seconds_count{{query="{label(query)}"}} {stats["calls"]}')
+        
+        lines += [
+            "# HELP pgm_query_phase_seconds_total Temps cumulé par phase (execute, fetch, convert, commit).",
+            "# TYPE pgm_query_phase_seconds_total counter"
+        ]
+        for query, stats in snapshot.items():
+            for phase, elapsed in stats["phases"].items():
+                lines.append(f'pgm_query_phase_seconds_total{{query="{label(query)}",phase="{phase}"}} {elapsed}')
+        
+        for metric, key, description in (("pgm_query_rows_total", "rows", "Lignes retournées ou affectées."),
+                                         ("pgm_query_errors_total", "errors", "Exécutions en erreur.")):
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+            for query, stats in snapshot.items():
+                lines.append(f'{metric}{{query="{label(query)}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
+
+
+class BinaryCopyColumns:
+    """
+    Décodeur d'un flux `COPY ... TO STDOUT (FORMAT binary)` dont toutes les colonnes
+    ont une largeur fixe (booléens, entiers, flottants, dates, horodatages).
+    
+    Les lignes sans NULL sont décodées par blocs entiers avec `numpy.frombuffer`
+    sur un type structuré; seules les lignes contenant des NULL passent par un
+    décodage champ par champ. Aucun objet Python n'est créé par ligne.
+    """
+    
+    SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+    FLUSH_SIZE = 1 << 20
+    # OID du type -> (type binaire big-endian, type natif)
+    TYPES = {
+        16: (">?", "?"),
+        20: (">i8", "i8"),
+        21: (">i2", "i2"),
+        23: (">i4", "i4"),
+        700: (">f4", "f4"),
+        701: (">f8", "f8"),
+        1082: (">i4", "i4"),
+        1114: (">i8", "i8"),
+        1184: (">i8", "i8")
+    }
+    # Les dates et horodatages binaires sont comptés depuis le 2000-01-01
+    EPOCH_DAYS = 10957
+    EPOCH_MICROSECONDS = 946684800000000
+    
+    def __init__(self, np: Any, columns: List[Tuple[str, int]]):
+        """
+        :param np: Module numpy
+        :param columns: Liste (nom, OID du type) des colonnes, toutes présentes dans `TYPES`
+        """
+        self.np = np
+        self.names = [name for name, _ in columns]
+        self.oids = [oid for _, oid in columns]
+        self.wire_types = [np.dtype(self.TYPES[oid][0]) for oid in self.oids]
+        self.native_types = [np.dtype(self.TYPES[oid][1]) for oid in self.oids]
+        fields = [("count", ">i2")]
+        for i, wire_type in enumerate(self.wire_types):
+            fields += [(f"len{i}", ">i4"), (f"val{i}", wire_type)]
+        self.row_type = np.dtype(fields)
+        self.buffer = bytearray()
+        self.header_done = False
+        self.finished = False
+        self.rows = 0
+        self.chunks: List[List[Any]] = [[] for _ in columns]
+        self.nulls: List[List[int]] = [[] for _ in columns]
+    
+    @classmethod
+    def supports(cls, oids: List[int]) -> bool:
+        """Indique si toutes les colonnes peuvent être décodées par cette classe."""
+        return bool(oids) and all(oid in cls.TYPES for oid in oids)
+    
+    def write(self, data: bytes) -> None:
+        """Reçoit un fragment du flux COPY (appelé par `copy_expert`)."""
+        self.buffer += data
+        if len(self.buffer) >= self.FLUSH_SIZE:
+            self._parse()
+    
+    def _parse(self) -> None:
+        """Décode toutes les lignes complètes présentes dans le tampon."""
+        buf = self.buffer
+        pos = 0
+        if not self.header_done:
+            if len(buf) < 19:
+                return
+            if bytes(buf[:11]) != self.SIGNATURE:
+                raise ValueError("Flux COPY binaire invalide")
+            header_size = 19 + int.from_bytes(buf[15:19], "big")
+            if len(buf) < header_size:
+                return
+            pos = header_size
+            self.header_done = True
+        
+        while not self.finished:
+            count = (len(buf) - pos) // self.row_type.itemsize
+            decoded = self._parse_fixed_rows(pos, count) if count else 0
+            if decoded:
+                pos += decoded * self.row_type.itemsize
+                continue
+            consumed = self._parse_single_row(pos)
+            if not consumed:
+                break
+            pos += consumed
+        del buf[:pos]
+    
+    def _parse_fixed_rows(self, pos: int, count: int) -> int:
+        """
+        Décode d'un bloc les lignes sans NULL à partir de `pos`.
+        
+        :return: Nombre de lignes décodées (s'arrête à la première ligne atypique)
+        """
+        np = self.np
+        rows = np.frombuffer(self.buffer, dtype=self.row_type, count=count, offset=pos)
+        valid = rows["count"] == len(self.names)
+        for i, wire_type in enumerate(self.wire_types):
+            valid &= rows[f"len{i}"] == wire_type.itemsize
+        invalid = np.flatnonzero(~valid)
+        decoded = count if invalid.size == 0 else int(invalid[0])
+        for i, native_type in enumerate(self.native_types):
+            if decoded:
+                # astype copie les valeurs: le tampon pourra être réduit ensuite
+                self.chunks[i].append(rows[f"val{i}"][:decoded].astype(native_type))
+        self.rows += decoded
+        return decoded
+    
+    def _parse_single_row(self, pos: int) -> int:
+        """
+        Décode champ par champ la ligne (ou la fin de flux) située à `pos`.
+        
+        :return: Nombre d'octets consommés (0 si la ligne est incomplète)
+        """
+        buf = self.buffer
+        if len(buf) - pos < 2:
+            return 0
+        count = int.from_bytes(buf[pos:pos + 2], "big", signed=True)
+        if count == -1:
+            self.finished = True
+            return 2
+        
+        offset = pos + 2
+        fields = []
+        for _ in range(count):
+            if len(buf) - offset < 4:
+                return 0
+            length = int.from_bytes(buf[offset:offset + 4], "big", signed=True)
+            offset += 4
+            if length == -1:
+                fields.append(None)
+                continue
+            if len(buf) - offset < length:
+                return 0
+            fields.append(bytes(buf[offset:offset + length]))
+            offset += length
+        
+        for i, raw in enumerate(fields):
+            if raw is None:
+                self.chunks[i].append(self.np.zeros(1, self.native_types[i]))
+                self.nulls[i].append(self.rows)
+            else:
+                self.chunks[i].append(self.np.frombuffer(raw, self.wire_types[i]).astype(self.native_types[i]))
+        self.rows += 1
+        return offset - pos
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Termine le décodage et assemble les colonnes.
+        
+        Les NULL deviennent NaN (flottants) ou sont masqués (`numpy.ma`) pour les autres types.
+        
+        :return: Dictionnaire nom de colonne: tableau NumPy
+        """
+        np = self.np
+        self._parse()
+        columns = {}
+        for i, name in enumerate(self.names):
+            values = np.concatenate(self.chunks[i]) if self.chunks[i] else np.zeros(0, self.native_types[i])
+            if self.oids[i] == 1082:
+                values = (values.astype("i8") + self.EPOCH_DAYS).astype("datetime64[D]")
+            elif self.oids[i] in (1114, 1184):
+                values = (values + self.EPOCH_MICROSECONDS).astype("datetime64[us]")
+            if self.nulls[i]:
+                if values.dtype.kind == "f":
+                    values[self.nulls[i]] = np.nan
+                else:
+                    mask = np.zeros(len(values), bool)
+                    mask[self.nulls[i]] = True
+                    values = np.ma.MaskedArray(values, mask=mask)
+            columns[name] = values
+        return columns
+
+
+class CopyProgressFile:
+    """
+    Enveloppe d'un fichier utilisé par `copy_expert` qui compte les octets
+    transférés et notifie périodiquement un callback de progression.
+    """
+    
+    def __init__(self, file: Any, progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                 total: Optional[int] = None, interval: int = 8 << 20):
+        """
+        :param file: Fichier binaire sous-jacent
+        :param progress: Callback appelé avec (octets transférés, total connu ou None)
+        :param total: Taille totale attendue en octets (optionnel)
+        :param interval: Nombre d'octets entre deux notifications
+        """
+        self.file = file
+        self.progress = progress
+        self.total = total
+        self.interval = interval
+        self.transferred = 0
+        self._next_report = interval
+    
+    def _advance(self, size: int) -> None:
+        self.transferred += size
+        if self.progress and self.transferred >= self._next_report:
+            self._next_report = self.transferred + self.interval
+            self.progress(self.transferred, self.total)
+    
+    def write(self, data: bytes) -> int:
+        self._advance(len(data))
+        return self.file.write(data)
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        self._advance(len(data))
+        return data
+    
+    def readline(self, size: int = -1) -> bytes:
+        data = self.file.readline(size)
+        self._advance(len(data))
+        return data
+    
+    def finish(self) -> None:
+        """Envoie la notification finale."""
+        if self.progress:
+            self.progress(self.transferred, self.total)
+
+
+class WriteBatch:
+    """
+    Unité de travail regroupant des insertions, mises à jour et suppressions.
+    
+    Les opérations sont envoyées par pages de plusieurs instructions (un aller-retour
+    par page) dans une seule transaction validée à la fin. Le nombre de lignes
+    affectées par chaque opération est relevé dans une table temporaire et
+    retourné dans l'ordre des opérations.
+    """
+    
+    def __init__(self, manager: "PostgreSQLManager", page_size: int = 100):
+        """
+        :param manager: Gestionnaire qui fournit la connexion
+        :param page_size: Nombre d'opérations envoyées par aller-retour
+        """
+        if page_size < 1:
+            raise ValueError("page_size doit être strictement positif")
+        self.manager = manager
+        self.page_size = page_size
+        self.operations: List[Tuple[Union[str, sql.Composable], Optional[tuple]]] = []
+        # Tables modifiées, dont les résultats en cache sont invalidés après l'envoi
+        self.tables: set = set()
+        # Nombres de lignes du dernier envoi (utile avec le bloc `with`)
+        self.counts: List[int] = []
+    
+    def insert(self, table_name: str, data: Dict[str, Any]) -> None:
+        """
+        Ajoute une insertion au lot.
+        
+        :param table_name: Nom de la table
+        :param data: Dictionnaire des données à insérer (colonne: valeur)
+        """
+        columns = list(data.keys())
+        query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.SQL(', ').join(sql.Placeholder() * len(columns))
+        )
+        self.operations.append((query, tuple(data[col] for col in columns)))
+        self.tables.add(table_name)
+    
+    def update(self, table_name: str, data: Dict[str, Any], condition: str, condition_params: Optional[tuple] = None) -> None:
+        """
+        Ajoute une mise à jour au lot.
+        
+        :param table_name: Nom de la table
+        :param data: Dictionnaire des données à mettre à jour (colonne: nouvelle valeur)
+        :param condition: Condition WHERE pour la mise à jour
+        :param condition_params: Paramètres pour la condition (optionnel)
+        """
+        set_clause = ", ".join([f"{col} = %s" for col in data.keys()])
+        values = tuple(data.values())
+        
+        if condition_params:
+            values += condition_params
+        
+        self.operations.append((f"UPDATE {table_name} SET {set_clause} WHERE {condition}", values))
+        self.tables.add(table_name)
+    
+    def delete(self, table_name: str, condition: str, condition_params: Optional[tuple] = None) -> None:
+        """
+        Ajoute une suppression au lot.
+        
+        :param table_name: Nom de la table
+        :param condition: Condition WHERE pour la suppression
+        :param condition_params: Paramètres pour la condition (optionnel)
+        """
+        self.operations.append((f"DELETE FROM {table_name} WHERE {condition}", condition_params))
+        self.tables.add(table_name)
+    
+    def execute(self) -> List[int]:
+        """
+        Envoie toutes les opérations du lot dans une transaction et vide le lot.
+        
+        :return: Nombre de lignes affectées par chaque opération, dans l'ordre d'ajout
+        """
+        operations, self.operations = self.operations, []
+        tables, self.tables = self.tables, set()
+        if not operations:
+            return []
+        
+        counts: List[int] = []
+        with self.manager.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "CREATE TEMP TABLE IF NOT EXISTS pgm_batch_counts (idx integer, n bigint) ON COMMIT DELETE ROWS"
+                    )
+                    for start in range(0, len(operations), self.page_size):
+                        statements = []
+                        for idx, (query, params) in enumerate(operations[start:start + self.page_size], start):
+                            if isinstance(query, sql.Composable):
+                                query = query.as_string(conn)
+                            # Chaque opération reste une instruction distincte (effets visibles
+                            # par les suivantes) et consigne son nombre de lignes
+                            statements.append(cursor.mogrify(
+                                f"WITH op AS ({query} RETURNING 1) "
+                                f"INSERT INTO pg_temp.pgm_batch_counts SELECT {idx}, count(*) FROM op",
+                                params
+                            ))
+                        statements.append(b"DELETE FROM pg_temp.pgm_batch_counts RETURNING idx, n")
+                        cursor.execute(b";\n".join(statements))
+                        counts.extend(n for _, n in sorted(cursor.fetchall()))
+                self.manager._commit(conn)
+            except Exception as e:
+                self.manager._rollback(conn)
+                self.manager._log(logging.ERROR, f"Erreur lors de l'exécution du lot: {e}", event="batch", error=str(e))
+                raise
+        
+        for table_name in tables:
+            self.manager._invalidate_results(table_name)
+        self.manager._log(logging.INFO, f"Lot de {len(operations)} opération(s) exécuté avec succès.",
+                          event="batch", operations=len(operations))
+        self.counts = counts
+        return counts
+    
+    def __enter__(self) -> "WriteBatch":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Le lot n'est envoyé que si le bloc s'est terminé sans erreur
+        if exc_type is None:
+            self.execute()
+
+
+class SchemaCache:
+    """
+    Cache en mémoire des métadonnées du schéma (tables, colonnes, types et
+    nullabilité), chargées en une seule requête sur `pg_catalog`.
+    
+    Le contenu expire après `ttl` secondes et peut être invalidé manuellement.
+    """
+    
+    QUERY = """
+    SELECT c.relname AS table_name,
+           a.attname AS column_name,
+           format_type(a.atttypid, a.atttypmod) AS data_type,
+           CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_catalog.pg_attribute a
+           ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    WHERE n.nspname = %s
+    AND c.relkind IN ('r', 'p', 'v', 'f')
+    ORDER BY c.relname, a.attnum;
+    """
+    
+    def __init__(self, ttl: Optional[float] = 300.0, schema: str = 'public'):
+        """
+        Initialise un cache vide.
+        
+        :param ttl: Durée de validité en secondes (None = jusqu'à invalidation)
+        :param schema: Schéma décrit
+        """
+        self.ttl = ttl
+        self.schema = schema
+        self._tables: Optional[Dict[str, List[Dict]]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        # Incrémentée à chaque invalidation (DDL, rafraîchissement manuel)
+        self.version = 0
+    
+    def get(self, loader: Callable[[str, tuple], List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        Retourne les tables et leurs colonnes, en rechargeant le cache si nécessaire.
+        
+        :param loader: Fonction exécutant la requête de chargement (requête, paramètres)
+        :return: Dictionnaire table: liste des colonnes (column_name, data_type, is_nullable)
+        """
+        with self._lock:
+            if self._tables is None or (self.ttl is not None and time.monotonic() - self._loaded_at > self.ttl):
+                tables: Dict[str, List[Dict]] = {}
+                for row in loader(self.QUERY, (self.schema,)):
+                    columns = tables.setdefault(row['table_name'], [])
+                    if row['column_name'] is not None:
+                        columns.append({
+                            'column_name': row['column_name'],
+                            'data_type': row['data_type'],
+                            'is_nullable': row['is_nullable']
+                        })
+                self._tables = tables
+                self._loaded_at = time.monotonic()
+            return self._tables
+    
+    def invalidate(self) -> None:
+        """Vide le cache: le prochain accès rechargera les métadonnées."""
+        with self._lock:
+            self._tables = None
+            self.version += 1
+
+
+class RetryPolicy:
+    """
+    Politique de nouvelle tentative avec attente exponentielle et gigue.
+    
+    Sont retentés:
+    - les échecs de sérialisation et les interblocages (l'instruction a été annulée);
+    - les pertes de connexion, uniquement pour les lectures (idempotentes) et
+      l'ouverture des connexions, car une écriture a pu être validée avant la coupure.
+    """
+    
+    # serialization_failure, deadlock_detected
+    TRANSIENT_SQLSTATES = {"40001", "40P01"}
+    # admin_shutdown, crash_shutdown, cannot_connect_now, connection_exception (08xxx)
+    CONNECTION_SQLSTATES = {"57P01", "57P02", "57P03", "08000", "08001", "08003", "08004", "08006"}
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 5.0, jitter: bool = True):
+        """
+        :param max_attempts: Nombre maximal d'essais, premier compris (1 = pas de nouvelle tentative)
+        :param base_delay: Attente avant la première nouvelle tentative en secondes
+        :param max_delay: Attente maximale entre deux essais en secondes
+        :param jitter: Si True, l'attente est tirée au hasard entre 0 et le délai exponentiel
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+    
+    def delay(self, attempt: int) -> float:
+        """
+        Attente avant l'essai suivant.
+        
+        :param attempt: Numéro de l'essai qui vient d'échouer (à partir de 1)
+        :return: Durée en secondes
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+    
+    @classmethod
+    def is_connection_error(cls, error: Exception) -> bool:
+        """Indique si l'erreur traduit une connexion perdue ou impossible à établir."""
+        if not isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+            return False
+        return error.pgcode is None or error.pgcode in cls.CONNECTION_SQLSTATES
+    
+    def is_retryable(self, error: Exception, read_only: bool) -> bool:
+        """
+        Indique si une instruction ayant échoué peut être réexécutée.
+        
+        :param error: Erreur levée
+        :param read_only: Si True, l'instruction est une lecture idempotente
+        :return: True si une nouvelle tentative est sûre
+        """
+        if getattr(error, "pgcode", None) in self.TRANSIENT_SQLSTATES:
+            return True
+        return read_only and self.is_connection_error(error)
+
+
+class ResultCache:
+    """
+    Cache LRU des résultats de lecture, indexé par (texte SQL, paramètres).
+    
+    Chaque entrée expire après sa durée de vie et est rattachée aux tables lues,
+    ce qui permet de l'invalider lors d'une écriture sur l'une d'elles. La taille
+    est bornée en nombre d'entrées et en mémoire (estimation par `sys.getsizeof`).
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = 64 << 20, ttl: Optional[float] = 60.0):
+        """
+        :param max_entries: Nombre maximal d'entrées
+        :param max_bytes: Mémoire maximale estimée en octets (None = illimitée)
+        :param ttl: Durée de vie par défaut d'une entrée en secondes (None = jusqu'à invalidation)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # clé: (lignes, expiration, taille, tables)
+        self._entries: OrderedDict = OrderedDict()
+        self._tables: Dict[str, set] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+    
+    @staticmethod
+    def estimate_size(rows: List[Dict]) -> int:
+        """Estimation de la mémoire occupée par un résultat (les noms de colonnes sont partagés)."""
+        size = sys.getsizeof(rows)
+        for row in rows:
+            size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+        return size
+    
+    def get(self, key: Tuple[str, Any]) -> Optional[List[Dict]]:
+        """
+        Retourne une copie du résultat en cache, ou None s'il est absent ou expiré.
+        
+        :param key: (texte SQL, paramètres)
+        :return: Lignes sous forme de dictionnaires
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            rows = entry[0]
+        return [dict(row) for row in rows]
+    
+    def put(self, key: Tuple[str, Any], rows: List[Dict], tables: Iterable[str], ttl: Optional[float] = None) -> None:
+        """
+        Ajoute un résultat au cache, en évinçant les entrées les moins récemment utilisées.
+        
+        :param key: (texte SQL, paramètres)
+        :param rows: Lignes à conserver (copiées)
+        :param tables: Tables lues par la requête
+        :param ttl: Durée de vie de l'entrée en secondes (par défaut celle du cache)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        rows = [dict(row) for row in rows]
+        size = self.estimate_size(rows)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        tables = frozenset(tables)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (rows, None if ttl is None else time.monotonic() + ttl, size, tables)
+            self._bytes += size
+            for table in tables:
+                self._tables.setdefault(table, set()).add(key)
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+    
+    def invalidate_table(self, table_name: str) -> int:
+        """
+        Supprime les entrées qui lisent une table.
+        
+        :param table_name: Nom de la table modifiée
+        :return: Nombre d'entrées supprimées
+        """
+        with self._lock:
+            keys = list(self._tables.get(table_name, ()))
+            for key in keys:
+                self._remove(key)
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+    
+    def clear(self) -> None:
+        """Vide le cache (les statistiques sont conservées)."""
+        with self._lock:
+            self._entries.clear()
+            self._tables.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache.
+        
+        :return: Dictionnaire (hits, misses, evictions, invalidations, entries, bytes, hit_rate)
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    def _remove(self, key: Tuple[str, Any]) -> None:
+        """Supprime une entrée (le verrou doit être détenu)."""
+        _, _, size, tables = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tables[table]
+
+
+class PlanAdvisor:
+    """
+    Analyse d'un plan `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`: mise à plat des
+    nœuds avec leur temps propre, erreur d'estimation et tampons, et détection
+    des problèmes courants (parcours séquentiels coûteux, estimations erronées,
+    tris et hachages débordant sur disque) avec des index candidats.
+    """
+    
+    # Seuils de détection
+    LARGE_SCAN_ROWS = 10000
+    MISESTIMATE_FACTOR = 10.0
+    MISESTIMATE_MIN_ROWS = 100
+    
+    FILTER_COLUMN = re.compile(r'\(?"?(\w+)"?(?:\)?::\w+)?\s*(?:=|<>|<=|>=|<|>|~~\*?|IS\s+NULL|IS\s+NOT\s+NULL)',
+                               re.IGNORECASE)
+    
+    def __init__(self, plan: Dict[str, Any]):
+        """
+        :param plan: Premier élément du résultat JSON d'EXPLAIN (avec la clé "Plan")
+        """
+        self.plan = plan
+        self.nodes = self._flatten(plan["Plan"])
+    
+    @staticmethod
+    def misestimate(node: Dict[str, Any]) -> float:
+        """
+        Facteur d'erreur d'estimation des lignes d'un nœud (≥ 1, quel que soit le sens).
+        
+        :param node: Nœud du plan
+        :return: max(réel / estimé, estimé / réel)
+        """
+        estimated = max(node.get("Plan Rows", 0), 1)
+        actual = max(node.get("Actual Rows", 0), 1)
+        return max(actual / estimated, estimated / actual)
+    
+    def _flatten(self, root: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Parcourt le plan en profondeur et calcule les mesures de chaque nœud."""
+        nodes: List[Dict[str, Any]] = []
+        
+        def visit(node: Dict[str, Any], depth: int, parent: Optional[int]) -> None:
+            index = len(nodes)
+            loops = node.get("Actual Loops", 1) or 1
+            total = node.get("Actual Total Time", 0.0) * loops
+            children = node.get("Plans", [])
+            # Le temps propre exclut celui des nœuds enfants (hors InitPlan/SubPlan déjà comptés à part)
+            children_time = sum(child.get("Actual Total Time", 0.0) * (child.get("Actual Loops", 1) or 1)
+                                for child in children)
+            nodes.append({
+                "index": index,
+                "parent": parent,
+                "depth": depth,
+                "node": node,
+                "label": self.label(node),
+                "total_ms": total,
+                "self_ms": max(0.0, total - children_time),
+                "plan_rows": node.get("Plan Rows", 0),
+                "actual_rows": node.get("Actual Rows", 0) * loops,
+                "loops": loops,
+                "misestimate": self.misestimate(node),
+                "shared_hit": node.get("Shared Hit Blocks", 0),
+                "shared_read": node.get("Shared Read Blocks", 0),
+                "temp_written": node.get("Temp Written Blocks", 0)
+            })
+            for child in children:
+                visit(child, depth + 1, index)
+        
+        visit(root, 0, None)
+        return nodes
+    
+    @staticmethod
+    def label(node: Dict[str, Any]) -> str:
+        """Libellé lisible d'un nœud (type, relation, index)."""
+        label = node["Node Type"]
+        if node.get("Relation Name"):
+            label += f" on {node['Relation Name']}"
+        if node.get("Index Name"):
+            label += f" using {node['Index Name']}"
+        return label
+    
+    def most_expensive(self, count: int = 3) -> List[int]:
+        """
+        Indices des nœuds au temps propre le plus élevé.
+        
+        :param count: Nombre de nœuds retournés
+        :return: Indices dans `nodes`
+        """
+        return [node["index"] for node in sorted(self.nodes, key=lambda node: node["self_ms"], reverse=True)[:count]]
+    
+    def advise(self) -> List[Dict[str, Any]]:
+        """
+        Détecte les problèmes courants du plan.
+        
+        :return: Liste de constats (index du nœud, message, index candidat éventuel)
+        """
+        findings: List[Dict[str, Any]] = []
+        for entry in self.nodes:
+            node = entry["node"]
+            node_type = node["Node Type"]
+            
+            if node_type == "Seq Scan":
+                removed = node.get("Rows Removed by Filter", 0) * entry["loops"]
+                scanned = entry["actual_rows"] + removed
+                if scanned >= self.LARGE_SCAN_ROWS and node.get("Filter"):
+                    columns = list(OrderedDict.fromkeys(self.FILTER_COLUMN.findall(node["Filter"])))
+                    index = (f"CREATE INDEX ON {node['Relation Name']} ({', '.join(columns)});"
+                             if columns else None)
+                    findings.append({
+                        "node": entry["index"],
+                        "message": f"Parcours séquentiel de {node['Relation Name']}: {scanned} ligne(s) lue(s), "
+                                   f"{removed} écartée(s) par le filtre {node['Filter']}",
+                        "index": index
+                    })
+                elif scanned >= self.LARGE_SCAN_ROWS and entry["loops"] > 1:
+                    findings.append({
+                        "node": entry["index"],
+                        "message": f"Parcours séquentiel de {node['Relation Name']} répété {entry['loops']} fois "
+                                   f"(boucle imbriquée)",
+                        "index": None
+                    })
+            
+            if (entry["misestimate"] >= self.MISESTIMATE_FACTOR
+                    and max(entry["plan_rows"], node.get("Actual Rows", 0)) >= self.MISESTIMATE_MIN_ROWS):
+                findings.append({
+                    "node": entry["index"],
+                    "message": f"{entry['label']}: {node.get('Plan Rows', 0)} ligne(s) estimée(s) pour "
+                               f"{node.get('Actual Rows', 0)} réelle(s) (facteur {entry['misestimate']:.0f}); "
+                               f"statistiques à rafraîchir (ANALYZE) ou à étendre (CREATE STATISTICS)",
+                    "index": None
+                })
+            
+            if node_type in ("Sort", "Incremental Sort") and node.get("Sort Space Type") == "Disk":
+                findings.append({
+                    "node": entry["index"],
+                    "message": f"Tri sur disque ({node.get('Sort Space Used', 0)} ko, {node.get('Sort Method')}): "
+                               f"augmenter work_mem",
+                    "index": None
+                })
+            
+            if node_type == "Hash" and node.get("Hash Batches", 1) > 1:
+                findings.append({
+                    "node": entry["index"],
+                    "message": f"Table de hachage en {node['Hash Batches']} lots (débordement sur disque): "
+                               f"augmenter work_mem",
+                    "index": None
+                })
+        return findings
+
 
 class PostgreSQLManager:
     """
@@ -11,9 +1424,26 @@ class PostgreSQLManager:
     - Gérer les transactions
     - Créer/supprimer des tables
     - Insérer/mettre à jour/supprimer des données
+    
+    Avec `max_connections` > 0, le gestionnaire fonctionne en mode pool: chaque
+    méthode emprunte une connexion le temps de son exécution, ce qui permet de
+    partager une même instance entre plusieurs threads.
+    
+    Avec `replicas`, les lectures hors transaction (`execute_query(fetch=True)`,
+    `select_data`, métadonnées du schéma) sont réparties entre les réplicas;
+    les écritures et les transactions restent sur le serveur principal.
     """
     
-    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: int = 5432):
+    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: int = 5432,
+                 min_connections: int = 1, max_connections: int = 0, max_lifetime: Optional[float] = 3600.0,
+                 health_check_interval: float = 30.0, pool_timeout: Optional[float] = 30.0,
+                 schema_cache_ttl: Optional[float] = 300.0, statement_cache_size: int = 128,
+                 collect_metrics: bool = True, log_enabled: bool = True, retry_policy: Optional[RetryPolicy] = None,
+                 connect_timeout: Optional[int] = 10, statement_timeout: Optional[float] = None,
+                 keepalive_idle: Optional[int] = 30, keepalive_interval: int = 10, keepalive_count: int = 3,
+                 replicas: Optional[List[str]] = None, replica_strategy: str = "round_robin",
+                 max_replica_lag: Optional[float] = None, result_cache_size: int = 0,
+                 result_cache_bytes: Optional[int] = 64 << 20, result_cache_ttl: Optional[float] = 60.0):
         """
         Initialise le gestionnaire avec les paramètres de connexion.
         
@@ -22,74 +1452,1345 @@ class PostgreSQLManager:
         :param password: Mot de passe
         :param host: Hôte (par défaut 'localhost')
         :param port: Port (par défaut 5432)
+        :param min_connections: Connexions ouvertes à la création du pool
+        :param max_connections: Taille maximale du pool (0 = connexion unique, sans pool)
+        :param max_lifetime: Durée de vie maximale d'une connexion du pool en secondes
+        :param health_check_interval: Inactivité (secondes) au-delà de laquelle une connexion est testée avant l'emprunt
+        :param pool_timeout: Attente maximale d'une connexion libre en secondes
+        :param schema_cache_ttl: Durée de validité du cache du schéma en secondes (None = jusqu'à invalidation)
+        :param statement_cache_size: Requêtes préparées conservées par connexion (0 = désactivé)
+        :param collect_metrics: Si True, mesure chaque requête passée par `execute_query`
+        :param log_enabled: Si False, le gestionnaire n'émet aucun message de journalisation
+        :param retry_policy: Politique de nouvelle tentative (par défaut `RetryPolicy()`;
+                             `RetryPolicy(max_attempts=1)` la désactive)
+        :param connect_timeout: Délai maximal d'établissement d'une connexion en secondes (None = illimité)
+        :param statement_timeout: Durée maximale d'une instruction côté serveur en secondes (None = réglage du serveur)
+        :param keepalive_idle: Inactivité TCP (secondes) avant le premier keepalive (None = keepalives désactivés)
+        :param keepalive_interval: Intervalle entre deux keepalives TCP sans réponse en secondes
+        :param keepalive_count: Nombre de keepalives sans réponse avant de considérer la connexion perdue
+        :param replicas: DSN des réplicas en lecture (ex. "host=replica1 dbname=app user=lecteur")
+        :param replica_strategy: Répartition des lectures: "round_robin" ou "least_loaded"
+        :param max_replica_lag: Retard de réplication maximal en secondes au-delà duquel un réplica est écarté
+        :param result_cache_size: Nombre d'entrées du cache de résultats de `select_data` (0 = désactivé)
+        :param result_cache_bytes: Mémoire maximale estimée du cache de résultats en octets
+        :param result_cache_ttl: Durée de vie par défaut d'un résultat en cache en secondes
         """
         self.dbname = dbname
         self.user = user
         self.password = password
         self.host = host
         self.port = port
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.pool_timeout = pool_timeout
+        self.pool: Optional[ConnectionPool] = None
         self.connection = None
         self.cursor = None
+        self._cursor_ids = count(1)
+        self._local = threading.local()
+        self.schema_cache = SchemaCache(schema_cache_ttl)
+        self.statement_cache_size = statement_cache_size
+        self._statement_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._stats_lock = threading.Lock()
+        self._insert_queries: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self.collect_metrics = collect_metrics
+        self.log_enabled = log_enabled
+        self.metrics = QueryMetrics()
+        self._query_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.connect_timeout = connect_timeout
+        self.statement_timeout = statement_timeout
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+        self.replica_dsns = list(replicas or [])
+        self.replica_strategy = replica_strategy
+        self.max_replica_lag = max_replica_lag
+        self.replicas: Optional[ReplicaRouter] = None
+        self.result_cache = (ResultCache(result_cache_size, result_cache_bytes, result_cache_ttl)
+                             if result_cache_size > 0 else None)
     
     def connect(self) -> None:
-        """Établit une connexion à la base de données PostgreSQL."""
+        """Établit une connexion (ou un pool de connexions) à la base de données PostgreSQL."""
         try:
-            self.connection = psycopg2.connect(
-                dbname=self.dbname,
-                user=self.user,
-                password=self.password,
-                host=self.host,
-                port=self.port
-            )
+            if self.replica_dsns:
+                # Les réplicas sont toujours en mode pool; les connexions sont ouvertes à la demande
+                self.replicas = ReplicaRouter(
+                    [
+                        ConnectionPool(
+                            lambda dsn=dsn: self._open_connection(dsn),
+                            min_connections=0,
+                            max_connections=max(self.max_connections, 1),
+                            max_lifetime=self.max_lifetime,
+                            health_check_interval=self.health_check_interval,
+                            timeout=self.pool_timeout
+                        )
+                        for dsn in self.replica_dsns
+                    ],
+                    strategy=self.replica_strategy,
+                    max_lag=self.max_replica_lag,
+                    retry_after=self.health_check_interval
+                )
+            
+            if self.max_connections > 0:
+                self.pool = ConnectionPool(
+                    self._connect_with_retry,
+                    min_connections=self.min_connections,
+                    max_connections=self.max_connections,
+                    max_lifetime=self.max_lifetime,
+                    health_check_interval=self.health_check_interval,
+                    timeout=self.pool_timeout
+                )
+                self._log(logging.INFO, f"Pool de connexions PostgreSQL établi ({self.min_connections}-{self.max_connections}).",
+                          event="connect", pooled=True)
+                return
+            
+            self.connection = self._connect_with_retry()
             # Utilisation d'un curseur qui retourne des dictionnaires
             self.cursor = self.connection.cursor(cursor_factory=DictCursor)
-            print("Connexion à PostgreSQL établie avec succès.")
+            self._log(logging.INFO, "Connexion à PostgreSQL établie avec succès.", event="connect", pooled=False)
         except Exception as e:
-            print(f"Erreur lors de la connexion à PostgreSQL: {e}")
+            self._log(logging.ERROR, f"Erreur lors de la connexion à PostgreSQL: {e}", event="connect", error=str(e))
             raise
     
     def disconnect(self) -> None:
-        """Ferme la connexion à la base de données."""
+        """Ferme la connexion (ou le pool) à la base de données."""
+        if self.replicas:
+            self.replicas.close()
+            self.replicas = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            self._log(logging.INFO, "Pool de connexions PostgreSQL fermé.", event="disconnect")
         if self.cursor:
             self.cursor.close()
         if self.connection:
             self.connection.close()
-            print("Connexion à PostgreSQL fermée.")
+            self._log(logging.INFO, "Connexion à PostgreSQL fermée.", event="disconnect")
+    
+    def _open_connection(self, dsn: Optional[str] = None) -> ManagedConnection:
+        """
+        Ouvre une nouvelle connexion avec les paramètres du gestionnaire.
+        
+        :param dsn: DSN d'un réplica (par défaut, le serveur principal)
+        """
+        options: Dict[str, Any] = {}
+        if self.connect_timeout is not None:
+            options["connect_timeout"] = self.connect_timeout
+        if self.statement_timeout is not None:
+            options["options"] = f"-c statement_timeout={int(self.statement_timeout * 1000)}"
+        if self.keepalive_idle is not None:
+            options.update(keepalives=1, keepalives_idle=self.keepalive_idle,
+                           keepalives_interval=self.keepalive_interval, keepalives_count=self.keepalive_count)
+        if dsn is not None:
+            return psycopg2.connect(dsn, connection_factory=ManagedConnection, **options)
+        return psycopg2.connect(
+            dbname=self.dbname,
+            user=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            connection_factory=ManagedConnection,
+            **options
+        )
+    
+    def _connect_with_retry(self) -> ManagedConnection:
+        """Ouvre une nouvelle connexion en réessayant selon la politique de nouvelle tentative."""
+        attempt = 1
+        while True:
+            try:
+                return self._open_connection()
+            except psycopg2.OperationalError as e:
+                if attempt >= self.retry_policy.max_attempts:
+                    raise
+                self._wait_before_retry(attempt, e, event="connect")
+                attempt += 1
+    
+    def _wait_before_retry(self, attempt: int, error: Exception, **fields: Any) -> None:
+        """Journalise l'échec d'un essai et attend avant le suivant."""
+        delay = self.retry_policy.delay(attempt)
+        self._log(logging.WARNING, f"Essai {attempt}/{self.retry_policy.max_attempts} en échec, "
+                  f"nouvelle tentative dans {delay:.2f} s: {error}", attempt=attempt, error=str(error), **fields)
+        time.sleep(delay)
+    
+    def _ensure_connection(self) -> ManagedConnection:
+        """
+        Vérifie la connexion unique (mode sans pool) et la rouvre si elle est perdue.
+        
+        Une connexion restée inactive plus de `health_check_interval` secondes est
+        testée avant usage. La reconnexion est impossible au milieu d'une transaction.
+        
+        :return: Connexion utilisable
+        """
+        conn = self.connection
+        if (not conn.closed and time.monotonic() - conn.last_used > self.health_check_interval
+                and conn.get_transaction_status() == TRANSACTION_STATUS_IDLE):
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                conn.close()
+        
+        if conn.closed:
+            if self.in_transaction():
+                raise psycopg2.InterfaceError("Connexion perdue pendant la transaction")
+            self._log(logging.WARNING, "Connexion à PostgreSQL perdue, reconnexion...", event="reconnect")
+            self.connection = self._connect_with_retry()
+            self.cursor = self.connection.cursor(cursor_factory=DictCursor)
+        return self.connection
+    
+    @contextmanager
+    def get_connection(self, pin: bool = True, read_only: bool = False) -> Iterator[ManagedConnection]:
+        """
+        Emprunte une connexion le temps d'un bloc `with`.
+        
+        Les appels imbriqués dans le même thread réutilisent la connexion déjà
+        empruntée, si bien que les méthodes du gestionnaire appelées dans le bloc
+        s'exécutent sur cette connexion. Sans pool, la connexion unique est retournée.
+        
+        :param pin: Si False, la connexion n'est pas associée au thread courant
+                    (utile pour les générateurs consommés de façon paresseuse)
+        :param read_only: Si True et hors transaction, la connexion est empruntée à un
+                          réplica (s'il y en a un utilisable); elle n'est jamais épinglée
+        :return: Connexion empruntée
+        """
+        pinned = getattr(self._local, "connection", None)
+        if pinned is not None:
+            yield pinned
+            return
+        
+        if read_only and self.replicas is not None and not self.in_transaction():
+            borrowed = self.replicas.acquire()
+            if borrowed is not None:
+                index, conn = borrowed
+                try:
+                    yield conn
+                finally:
+                    self.replicas.release(index, conn)
+                return
+        
+        if self.pool is None:
+            if self.connection is None:
+                raise psycopg2.InterfaceError("Aucune connexion ouverte: appelez connect() d'abord")
+            conn = self._ensure_connection()
+            try:
+                yield conn
+            finally:
+                conn.last_used = time.monotonic()
+            return
+        
+        conn = self.pool.getconn()
+        if pin:
+            self._local.connection = conn
+        try:
+            yield conn
+        finally:
+            if pin:
+                self._local.connection = None
+            self.pool.putconn(conn)
+    
+    def execute_query(self, query: str, params: Optional[tuple] = None, fetch: bool = False,
+                      primary: bool = False) -> Optional[List[Dict]]:
+        """
+        Exécute une requête SQL et retourne éventuellement les résultats.
+        
+        Hors transaction, les échecs transitoires sont retentés selon `retry_policy`:
+        échecs de sérialisation et interblocages pour toute requête, pertes de
+        connexion pour les lectures seulement. Avec des réplicas, les lectures
+        (`fetch=True`) hors transaction leur sont envoyées.
+        
+        :param query: Requête SQL à exécuter
+        :param params: Paramètres pour la requête (optionnel)
+        :param fetch: Si True, retourne les résultats (pour SELECT)
+        :param primary: Si True, la requête est toujours exécutée sur le serveur principal,
+                        jamais sur un réplica (vues de supervision, signaux aux sessions)
+        :return: Résultats de la requête ou None
+        """
+        read_only = fetch and self._is_read_query(self._statement_text(query))
+        attempt = 1
+        while True:
+            try:
+                return self._execute_query_once(query, params, fetch, read_only, primary)
+            except psycopg2.Error as e:
+                # Dans une transaction (ou sur une connexion épinglée), c'est à l'appelant de tout rejouer
+                if (attempt >= self.retry_policy.max_attempts or self.in_transaction()
+                        or getattr(self._local, "connection", None) is not None
+                        or not self.retry_policy.is_retryable(e, read_only)):
+                    raise
+                self._wait_before_retry(attempt, e, event="retry")
+                attempt += 1
+    
+    # Instructions qui ne modifient aucune donnée lue par le cache de résultats
+    NON_WRITING_COMMANDS = frozenset((
+        "SET", "RESET", "SHOW", "VACUUM", "ANALYZE", "CHECKPOINT", "LISTEN", "UNLISTEN", "NOTIFY",
+        "PREPARE", "DEALLOCATE", "DISCARD", "BEGIN", "START", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "LOCK"
+    ))
+    
+    @classmethod
+    def _statement_text(cls, query: Union[str, sql.Composable]) -> str:
+        """
+        Texte d'une requête pour la classer sans connexion: les `sql.Composable`
+        sont rendus à partir de leurs fragments SQL et identifiants, les littéraux
+        étant remplacés par NULL (leur contenu ne doit pas compter comme un mot-clé).
+        
+        :param query: Requête texte ou composée
+        :return: Texte approché de la requête
+        """
+        if isinstance(query, str):
+            return query
+        if isinstance(query, sql.Composed):
+            return "".join(cls._statement_text(part) for part in query.seq)
+        if isinstance(query, sql.SQL):
+            return query.string
+        if isinstance(query, sql.Identifier):
+            return ".".join('"' + name.replace('"', '""') + '"' for name in query.strings)
+        if isinstance(query, sql.Placeholder):
+            return "%s"
+        return "NULL"
+    
+    @staticmethod
+    def _is_read_query(query: str) -> bool:
+        """Indique si une requête texte est une lecture sans effet de bord."""
+        return (re.match(r"\s*(SELECT|WITH|VALUES|TABLE|SHOW|EXPLAIN)\b", query, re.IGNORECASE) is not None
+                and re.search(r"\b(INSERT|UPDATE|DELETE|MERGE|FOR\s+UPDATE|FOR\s+SHARE|NEXTVAL)\b", query,
+                              re.IGNORECASE) is None)
+    
+    @classmethod
+    def _written_tables(cls, query: str) -> Optional[List[str]]:
+        """
+        Tables modifiées par une instruction d'écriture ou de DDL, y compris dans
+        les CTE modifiantes (`WITH x AS (UPDATE t ...) SELECT ...`).
+        
+        :param query: Texte de l'instruction
+        :return: Noms des tables, sans schéma ni guillemets (liste vide pour une
+                 instruction sans écriture, None si la cible n'est pas reconnue)
+        """
+        words = query.split(None, 1)
+        # Verrous de lignes et séquences n'invalident pas les lectures en cache
+        unlocked = re.sub(r"\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(?:KEY\s+)?SHARE\b|\bNEXTVAL\b", "",
+                          query, flags=re.IGNORECASE)
+        if not words or cls._is_read_query(unlocked) or words[0].upper() in cls.NON_WRITING_COMMANDS:
+            return []
+        tables = []
+        for match in re.finditer(
+            r'\b(?:INSERT\s+INTO|(?<!DO\s)UPDATE(?!\s+(?:SET|OF|NOWAIT|SKIP)\b)|DELETE\s+FROM|MERGE\s+INTO|'
+            r'TRUNCATE(?:\s+TABLE)?|COPY|(?:DROP|ALTER)\s+TABLE(?:\s+IF\s+EXISTS)?)\s+'
+            r'((?:ONLY\s+)?[\w."$]+(?:\s*,\s*(?:ONLY\s+)?[\w."$]+)*)',
+            query, re.IGNORECASE
+        ):
+            names = match.group(1) if match.group(0).upper().startswith(("TRUNCATE", "DROP")) \
+                else match.group(1).split(",")[0]
+            for name in names.split(","):
+                name = re.sub(r"^ONLY\s+", "", name.strip(), flags=re.IGNORECASE)
+                tables.append(name.rsplit(".", 1)[-1].strip('"'))
+        return tables or None
+    
+    def _invalidate_results(self, table_name: Optional[str]) -> None:
+        """
+        Invalide les résultats en cache qui lisent une table modifiée.
+        
+        Dans une transaction, la table est aussi notée pour être invalidée de
+        nouveau à la validation (des lectures concurrentes ont pu remettre en cache
+        l'état antérieur entre-temps).
+        
+        :param table_name: Nom de la table modifiée (None: cible inconnue, tout le cache est vidé)
+        """
+        if self.result_cache is None:
+            return
+        if table_name is None:
+            self.result_cache.clear()
+        else:
+            self.result_cache.invalidate_table(table_name)
+        if self.in_transaction():
+            if getattr(self._local, "written_tables", None) is None:
+                self._local.written_tables = set()
+            self._local.written_tables.add(table_name)
+    
+    def result_cache_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache de résultats.
+        
+        :return: Dictionnaire (hits, misses, evictions, invalidations, entries, bytes, hit_rate), vide si désactivé
+        """
+        return self.result_cache.stats() if self.result_cache is not None else {}
+    
+    def clear_result_cache(self) -> None:
+        """Vide le cache de résultats."""
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def _execute_query_once(self, query: str, params: Optional[tuple], fetch: bool,
+                            read_only: bool = False, primary: bool = False) -> Optional[List[Dict]]:
+        """Exécute une requête une seule fois (voir `execute_query`); les lectures vont aux réplicas sauf si `primary`."""
+        with self.get_connection(read_only=read_only and not primary) as conn:
+            statement = query
+            timings: Dict[str, float] = {}
+            rows = 0
+            failed = False
+            try:
+                with conn.cursor(cursor_factory=DictCursor) as cursor:
+                    started = time.perf_counter()
+                    if params and self.statement_cache_size > 0:
+                        query = self._execute_prepared(conn, cursor, query, params)
+                    else:
+                        cursor.execute(query, params)
+                    timings["execute"] = time.perf_counter() - started
+                    if fetch:
+                        started = time.perf_counter()
+                        records = cursor.fetchall()
+                        timings["fetch"] = time.perf_counter() - started
+                        started = time.perf_counter()
+                        result = [dict(row) for row in records]
+                        timings["convert"] = time.perf_counter() - started
+                        rows = len(result)
+                        if read_only:
+                            return result
+                    else:
+                        rows = cursor.rowcount
+                        result = None
+                # Écritures avec RETURNING comprises: en mode pool, la connexion rendue serait annulée
+                started = time.perf_counter()
+                self._commit(conn)
+                timings["commit"] = time.perf_counter() - started
+                if self._is_ddl(query):
+                    self.schema_cache.invalidate()
+                if self.result_cache is not None:
+                    written = self._written_tables(self._statement_text(statement))
+                    for table_name in [None] if written is None else written:
+                        self._invalidate_results(table_name)
+                return result
+            except Exception as e:
+                failed = True
+                self._rollback(conn)
+                self._log(logging.ERROR, f"Erreur lors de l'exécution de la requête: {e}", event="query", error=str(e))
+                raise
+            finally:
+                if self.collect_metrics:
+                    self._record_query(conn, statement, timings, rows, failed)
+    
+    def _record_query(self, conn: ManagedConnection, query: Union[str, sql.Composable], timings: Dict[str, float],
+                      rows: int, error: bool) -> None:
+        """Enregistre les mesures d'une exécution et notifie les callbacks."""
+        text = query.as_string(conn) if isinstance(query, sql.Composable) else query
+        event = {"query": QueryMetrics.normalize(text), "timings": timings, "rows": rows, "error": error}
+        self.metrics.record(event["query"], timings, rows, error)
+        for hook in list(self._query_hooks):
+            try:
+                hook(event)
+            except Exception as e:
+                self._log(logging.WARNING, f"Erreur dans un callback de requête: {e}", event="hook", error=str(e))
+    
+    def add_query_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Enregistre une fonction appelée après chaque requête de `execute_query`.
+        
+        Elle reçoit un dictionnaire: query (texte normalisé), timings (secondes par
+        phase: execute, fetch, convert, commit), rows et error.
+        
+        :param hook: Fonction à appeler
+        """
+        self._query_hooks.append(hook)
+    
+    def remove_query_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Retire une fonction enregistrée par `add_query_hook`.
+        
+        :param hook: Fonction à retirer
+        """
+        self._query_hooks.remove(hook)
+    
+    def metrics_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistiques des requêtes, groupées par texte normalisé.
+        
+        :return: Dictionnaire requête normalisée: statistiques (calls, errors, rows, temps, histogramme)
+        """
+        return self.metrics.snapshot()
+    
+    def export_metrics(self, format: str = "json") -> str:
+        """
+        Exporte les statistiques des requêtes.
+        
+        :param format: "json" ou "prometheus"
+        :return: Statistiques sérialisées
+        """
+        if format == "json":
+            return self.metrics.to_json()
+        if format == "prometheus":
+            return self.metrics.to_prometheus()
+        raise ValueError(f"Format d'export inconnu: {format}")
+    
+    def _log(self, level: int, message: str, **fields: Any) -> None:
+        """
+        Journalise un message; les champs structurés sont exposés dans l'attribut
+        `pgm` de l'enregistrement de log.
+        """
+        if self.log_enabled:
+            logger.log(level, message, extra={"pgm": fields})
+    
+    def _execute_prepared(self, conn: ManagedConnection, cursor, query: Union[str, sql.Composable],
+                          params: Any) -> Union[str, sql.Composable]:
+        """
+        Exécute la requête via sa version préparée (voir `_prepare`).
+        
+        Si un autre client a modifié le schéma, le plan préparé peut être périmé
+        ("cached plan must not change result type", SQLSTATE 0A000): la requête
+        préparée est alors désallouée et, hors transaction, la requête est rejouée
+        une fois sans préparation. Dans une transaction (interrompue par l'erreur),
+        l'erreur est propagée et la désallocation attend la prochaine préparation.
+        
+        :return: Requête réellement exécutée
+        """
+        prepared = self._prepare(conn, cursor, query, params)
+        if prepared is query:
+            cursor.execute(query, params)
+            return query
+        try:
+            cursor.execute(prepared, params)
+            return prepared
+        except psycopg2.Error as e:
+            if e.pgcode != "0A000":
+                raise
+            name = prepared.split(None, 2)[1]
+            conn.statement_cache.discard(name)
+            if self.in_transaction():
+                conn.statement_cache.stale.append(name)
+                raise
+            self._log(logging.WARNING, f"Requête préparée périmée ({name}), exécution sans préparation",
+                      event="prepared_stale", statement=name)
+            conn.rollback()
+            cursor.execute(f"DEALLOCATE {name}")
+            cursor.execute(query, params)
+            return query
+    
+    def _prepare(self, conn: ManagedConnection, cursor, query: Union[str, sql.Composable], params: Any) -> Union[str, sql.Composable]:
+        """
+        Prépare la requête côté serveur (une fois par connexion) et retourne
+        l'instruction `EXECUTE` équivalente, ou la requête d'origine si elle ne
+        peut pas être préparée.
+        
+        :param conn: Connexion utilisée
+        :param cursor: Curseur de la connexion
+        :param query: Requête paramétrée (marqueurs %s)
+        :param params: Paramètres de la requête
+        :return: Requête à exécuter avec les mêmes paramètres
+        """
+        if conn.autocommit or not isinstance(params, (tuple, list)) \
+                or any(isinstance(param, tuple) for param in params):
+            return query
+        
+        text = query.as_string(conn) if isinstance(query, sql.Composable) else query
+        # Clé normalisée seulement: les blancs des littéraux doivent rester intacts dans PREPARE
+        key = " ".join(text.split()).rstrip(";").rstrip()
+        
+        if conn.statement_cache is None:
+            conn.statement_cache = PreparedStatementCache(self.statement_cache_size)
+            conn.statement_cache.schema_version = self.schema_cache.version
+        cache = conn.statement_cache
+        
+        if cache.schema_version != self.schema_cache.version:
+            # Le schéma a changé: les plans préparés (ex. SELECT *) peuvent être périmés
+            cursor.execute("DEALLOCATE ALL")
+            cache.clear()
+            cache.schema_version = self.schema_cache.version
+        while cache.stale:
+            cursor.execute(f"DEALLOCATE {cache.stale[-1]}")
+            cache.stale.pop()
+        
+        if key in cache:
+            name = cache.get(key)
+            if name is None or not cache.accepts(name, params):
+                return query
+            self._count_statement("hits")
+            return f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+        
+        positional = self._to_positional(text.strip().rstrip(";").rstrip())
+        name = None
+        if positional is not None and positional[1] == len(params):
+            # Savepoint: un échec de préparation ne doit pas invalider la transaction en cours
+            name = cache.new_name()
+            try:
+                cursor.execute(f"SAVEPOINT pgm_prepare; PREPARE {name} AS {positional[0]}; RELEASE SAVEPOINT pgm_prepare; "
+                               f"SELECT parameter_types::text[] FROM pg_prepared_statements WHERE name = '{name}'")
+                cache.param_types[name] = tuple(cursor.fetchone()[0])
+            except psycopg2.Error as e:
+                if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                    # Connexion perdue: pas de savepoint à restaurer, l'erreur d'origine doit remonter
+                    raise
+                cursor.execute("ROLLBACK TO SAVEPOINT pgm_prepare; RELEASE SAVEPOINT pgm_prepare")
+                name = None
+        
+        evicted = cache.add(key, name)
+        if evicted is not None:
+            cursor.execute(f"DEALLOCATE {evicted}")
+            self._count_statement("evictions")
+        if name is None:
+            return query
+        self._count_statement("misses")
+        if not cache.accepts(name, params):
+            return query
+        return f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+    
+    @staticmethod
+    def _to_positional(query: str) -> Optional[Tuple[str, int]]:
+        """
+        Convertit les marqueurs `%s` de psycopg2 en paramètres `$n` de PostgreSQL.
+        
+        :param query: Texte de la requête
+        :return: (requête convertie, nombre de paramètres), ou None si la requête
+                 n'est pas préparable (paramètres nommés, `$`, instruction non supportée)
+        """
+        words = query.split(None, 1)
+        if not words or words[0].upper() not in ("SELECT", "INSERT", "UPDATE", "DELETE", "VALUES", "WITH") or "$" in query:
+            return None
+        
+        parts = query.split("%")
+        converted = [parts[0]]
+        n_params = 0
+        i = 1
+        while i < len(parts):
+            part = parts[i]
+            if part == "" and i + 1 < len(parts):
+                # "%%" -> "%"
+                converted.append("%" + parts[i + 1])
+                i += 2
+                continue
+            if not part.startswith("s"):
+                return None
+            n_params += 1
+            converted.append(f"${n_params}{part[1:]}")
+            i += 1
+        return "".join(converted), n_params
+    
+    def _count_statement(self, counter: str) -> None:
+        """Incrémente un compteur du cache de requêtes préparées."""
+        with self._stats_lock:
+            self._statement_stats[counter] += 1
+    
+    def prepared_statement_stats(self) -> Dict[str, float]:
+        """
+        Statistiques du cache de requêtes préparées (toutes connexions confondues).
+        
+        :return: Dictionnaire hits, misses, evictions et hit_rate
+        """
+        with self._stats_lock:
+            stats = dict(self._statement_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    @staticmethod
+    def _is_ddl(query: Union[str, sql.Composable]) -> bool:
+        """Indique si une requête texte modifie le schéma (CREATE, ALTER, DROP...)."""
+        if not isinstance(query, str):
+            return False
+        words = query.lstrip().split(None, 1)
+        return bool(words) and words[0].upper() in ("CREATE", "ALTER", "DROP", "COMMENT")
+    
+    def iter_query(self, query: str, params: Optional[tuple] = None, itersize: int = 2000,
+                   batch_size: Optional[int] = None) -> Iterator[Union[Dict, List[Dict]]]:
+        """
+        Exécute une requête via un curseur serveur (nommé) et produit les résultats à la demande.
+        
+        Seules `itersize` lignes sont transférées à la fois depuis le serveur, ce qui
+        permet de parcourir des résultats plus grands que la mémoire disponible.
+        La transaction qui porte le curseur est validée à la fin du parcours: sans
+        pool, il ne faut donc pas exécuter d'autres requêtes pendant l'itération
+        (en mode pool, le générateur garde sa propre connexion jusqu'à la fin).
+        
+        :param query: Requête SQL à exécuter (SELECT)
+        :param params: Paramètres pour la requête (optionnel)
+        :param itersize: Nombre de lignes récupérées par aller-retour
+        :param batch_size: Si fourni, produit des listes de `batch_size` lignes au lieu de lignes isolées
+        :return: Générateur de lignes (ou de lots de lignes) sous forme de dictionnaires
+        """
+        in_transaction = self.in_transaction()
+        with self.get_connection(pin=False, read_only=self._is_read_query(query)) as conn:
+            cursor = conn.cursor(name=f"pgm_stream_{next(self._cursor_ids)}", cursor_factory=DictCursor)
+            cursor.itersize = itersize
+            try:
+                cursor.execute(query, params)
+                if batch_size:
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        yield [dict(row) for row in rows]
+                else:
+                    for row in cursor:
+                        yield dict(row)
+            except Exception as e:
+                cursor.close()
+                if not in_transaction:
+                    conn.rollback()
+                self._log(logging.ERROR, f"Erreur lors de l'exécution de la requête: {e}", event="query", error=str(e))
+                raise
+            finally:
+                if not cursor.closed:
+                    cursor.close()
+                    if not in_transaction:
+                        conn.commit()
+    
+    def fetch_columns(self, query: Union[str, sql.Composable], params: Optional[tuple] = None,
+                      batch_size: int = 50000, use_copy: bool = True) -> Dict[str, Any]:
+        """
+        Exécute une requête et retourne le résultat par colonnes (tableaux NumPy),
+        sans jamais créer de dictionnaire par ligne.
+        
+        Si toutes les colonnes sont de type booléen, entier, flottant, date ou
+        horodatage, le résultat est lu via `COPY ... TO STDOUT (FORMAT binary)` et
+        décodé par blocs; sinon il est lu par lots de `batch_size` lignes depuis un
+        curseur serveur. Nécessite numpy.
+        
+        :param query: Requête SQL à exécuter (SELECT)
+        :param params: Paramètres pour la requête (optionnel)
+        :param batch_size: Nombre de lignes lues par lot (lecture par curseur)
+        :param use_copy: Si False, n'utilise jamais COPY binaire
+        :return: Dictionnaire nom de colonne: tableau NumPy
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("Le mode colonnes nécessite numpy (pip install numpy)") from e
+        
+        with self.get_connection() as conn:
+            try:
+                if isinstance(query, sql.Composable):
+                    query = query.as_string(conn)
+                query = query.strip().rstrip(";")
+                
+                with conn.cursor() as cursor:
+                    # Description des colonnes sans lire de ligne
+                    cursor.execute(f"SELECT * FROM ({query}) AS pgm_columns LIMIT 0", params)
+                    description = [(column.name, column.type_code) for column in cursor.description]
+                    
+                    if use_copy and BinaryCopyColumns.supports([oid for _, oid in description]):
+                        reader = BinaryCopyColumns(np, description)
+                        statement = cursor.mogrify(query, params)
+                        cursor.copy_expert(b"COPY (" + statement + b") TO STDOUT (FORMAT binary)", reader)
+                        return reader.result()
+                
+                names = [name for name, _ in description]
+                values: List[List[Any]] = [[] for _ in names]
+                cursor = conn.cursor(name=f"pgm_columns_{next(self._cursor_ids)}")
+                try:
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        for column, batch in zip(values, zip(*rows)):
+                            column.extend(batch)
+                finally:
+                    cursor.close()
+                return {name: np.array(column) for name, column in zip(names, values)}
+            except Exception as e:
+                self._rollback(conn)
+                self._log(logging.ERROR, f"Erreur lors de la lecture par colonnes: {e}", event="fetch_columns", error=str(e))
+                raise
+    
+    def select_columns(self, table_name: str, columns: List[str] = ["*"], condition: Optional[str] = None,
+                       condition_params: Optional[tuple] = None, **options: Any) -> Dict[str, Any]:
+        """
+        Récupère des données d'une table sous forme de colonnes NumPy (voir `fetch_columns`).
+        
+        :param table_name: Nom de la table
+        :param columns: Liste des colonnes à récupérer (par défaut toutes)
+        :param condition: Condition WHERE (optionnelle)
+        :param condition_params: Paramètres pour la condition (optionnel)
+        :param options: Options transmises à `fetch_columns` (batch_size, use_copy)
+        :return: Dictionnaire nom de colonne: tableau NumPy
+        """
+        query = f"SELECT {', '.join(columns)} FROM {table_name}"
+        if condition:
+            query += f" WHERE {condition}"
+        return self.fetch_columns(query, condition_params, **options)
+    
+    @staticmethod
+    def _open_copy_file(path: str, mode: str, compression: Optional[str]) -> Any:
+        """
+        Ouvre un fichier d'export/import en binaire, éventuellement compressé.
+        
+        :param path: Chemin du fichier
+        :param mode: "r" ou "w"
+        :param compression: None (déduit de l'extension .gz/.zst), "none", "gzip" ou "zstd"
+        :return: Fichier ouvert
+        """
+        if compression is None:
+            compression = {".gz": "gzip", ".zst": "zstd"}.get(os.path.splitext(path)[1].lower(), "none")
+        if compression == "none":
+            return open(path, mode + "b")
+        if compression == "gzip":
+            return gzip.open(path, mode + "b")
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError("La compression zstd nécessite le paquet zstandard (pip install zstandard)") from e
+            raw = open(path, mode + "b")
+            if mode == "w":
+                return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        raise ValueError(f"Compression inconnue: {compression}")
+    
+    @staticmethod
+    def _copy_options(format: str, header: bool) -> str:
+        """Options de COPY pour le format demandé ("csv" ou "binary")."""
+        if format == "csv":
+            return f"(FORMAT csv, HEADER {'true' if header else 'false'})"
+        if format == "binary":
+            return "(FORMAT binary)"
+        raise ValueError(f"Format d'export inconnu: {format}")
+    
+    def export_query(self, query: Union[str, sql.Composable], path: str, params: Optional[tuple] = None,
+                     format: str = "csv", compression: Optional[str] = None, header: bool = True,
+                     progress: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """
+        Exporte le résultat d'une requête dans un fichier via `COPY ... TO STDOUT`,
+        en flux et à mémoire constante.
+        
+        :param query: Requête SQL à exporter (SELECT)
+        :param path: Fichier de destination
+        :param params: Paramètres pour la requête (optionnel)
+        :param format: "csv" ou "binary" (format COPY binaire de PostgreSQL)
+        :param compression: None (déduit de l'extension .gz/.zst), "none", "gzip" ou "zstd"
+        :param header: Ajoute une ligne d'en-tête (CSV uniquement)
+        :param progress: Callback appelé avec (octets écrits, None)
+        :return: Nombre de lignes exportées
+        """
+        options = self._copy_options(format, header)
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    if isinstance(query, sql.Composable):
+                        query = query.as_string(conn)
+                    statement = cursor.mogrify(query.strip().rstrip(";"), params)
+                    with self._open_copy_file(path, "w", compression) as file:
+                        target = CopyProgressFile(file, progress)
+                        cursor.copy_expert(b"COPY (" + statement + b") TO STDOUT " + options.encode(), target)
+                        target.finish()
+                    rows = cursor.rowcount
+            except Exception as e:
+                self._rollback(conn)
+                self._log(logging.ERROR, f"Erreur lors de l'export: {e}", event="export", path=path, error=str(e))
+                raise
+        
+        self._log(logging.INFO, f"{rows} ligne(s) exportée(s) vers '{path}'.", event="export", path=path, rows=rows)
+        return rows
+    
+    def export_table(self, table_name: str, path: str, columns: Optional[List[str]] = None, **options: Any) -> int:
+        """
+        Exporte une table entière dans un fichier (voir `export_query`).
+        
+        :param table_name: Nom de la table
+        :param path: Fichier de destination
+        :param columns: Colonnes à exporter (par défaut toutes)
+        :param options: format, compression, header, progress
+        :return: Nombre de lignes exportées
+        """
+        query = sql.SQL("SELECT {} FROM {}").format(
+            sql.SQL(', ').join(map(sql.Identifier, columns)) if columns else sql.SQL("*"),
+            sql.Identifier(table_name)
+        )
+        return self.export_query(query, path, **options)
+    
+    def import_table(self, table_name: str, path: str, columns: Optional[List[str]] = None, format: str = "csv",
+                     compression: Optional[str] = None, header: bool = True,
+                     progress: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """
+        Importe un fichier dans une table via `COPY ... FROM STDIN`, en flux et à
+        mémoire constante, dans une seule transaction.
+        
+        :param table_name: Nom de la table
+        :param path: Fichier source
+        :param columns: Colonnes du fichier, dans l'ordre (par défaut toutes celles de la table)
+        :param format: "csv" ou "binary" (format COPY binaire de PostgreSQL)
+        :param compression: None (déduit de l'extension .gz/.zst), "none", "gzip" ou "zstd"
+        :param header: Le fichier commence par une ligne d'en-tête (CSV uniquement)
+        :param progress: Callback appelé avec (octets lus, taille du fichier si non compressé)
+        :return: Nombre de lignes importées
+        """
+        target = sql.Identifier(table_name)
+        if columns:
+            target = sql.SQL("{} ({})").format(target, sql.SQL(', ').join(map(sql.Identifier, columns)))
+        query = sql.SQL("COPY {} FROM STDIN " + self._copy_options(format, header)).format(target)
+        
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor, self._open_copy_file(path, "r", compression) as file:
+                    compressed = not isinstance(file, io.BufferedReader)
+                    source = CopyProgressFile(file, progress, None if compressed else os.path.getsize(path))
+                    cursor.copy_expert(query, source)
+                    source.finish()
+                    rows = cursor.rowcount
+                self._commit(conn)
+            except Exception as e:
+                self._rollback(conn)
+                self._log(logging.ERROR, f"Erreur lors de l'import: {e}", event="import", path=path, error=str(e))
+                raise
+        
+        self._invalidate_results(table_name)
+        self._log(logging.INFO, f"{rows} ligne(s) importée(s) dans '{table_name}'.", event="import",
+                  table=table_name, rows=rows)
+        return rows
+    
+    def parallel_scan(self, table_name: str, columns: Optional[List[str]] = None, workers: int = 4,
+                      chunks: Optional[int] = None, key_column: Optional[str] = None,
+                      output_dir: Optional[str] = None, format: str = "csv", compression: Optional[str] = None,
+                      header: bool = True, batch_size: int = 10000) -> Iterator[Union[List[Dict], str]]:
+        """
+        Parcourt une table en parallèle sur plusieurs connexions qui partagent le
+        même instantané (`pg_export_snapshot`), si bien que le résultat est
+        cohérent comme une lecture unique.
+        
+        La table est découpée en `chunks` plages de clé (`key_column`, entière) ou,
+        à défaut, en plages de blocs (ctid). Chaque thread de travail ouvre sa propre
+        connexion, importe l'instantané puis lit des plages jusqu'à épuisement.
+        Les lots et les fichiers sont produits dans l'ordre où ils sont prêts.
+        
+        :param table_name: Nom de la table
+        :param columns: Colonnes à lire (par défaut toutes)
+        :param workers: Nombre de connexions lues en parallèle
+        :param chunks: Nombre de plages (par défaut 4 par connexion)
+        :param key_column: Colonne entière de découpage (par défaut, découpage par ctid)
+        :param output_dir: Si fourni, chaque plage est exportée via COPY dans un fichier de ce répertoire
+        :param format: Format des fichiers: "csv" ou "binary"
+        :param compression: Compression des fichiers: None, "gzip" ou "zstd"
+        :param header: Ajoute une ligne d'en-tête à chaque fichier CSV
+        :param batch_size: Nombre de lignes par lot produit (sans `output_dir`)
+        :return: Générateur de lots de lignes (dictionnaires), ou de chemins de fichiers avec `output_dir`
+        """
+        options = self._copy_options(format, header)
+        extension = (".bin" if format == "binary" else ".csv") + {"gzip": ".gz", "zstd": ".zst"}.get(compression, "")
+        select = sql.SQL("SELECT {} FROM {}").format(
+            sql.SQL(', ').join(map(sql.Identifier, columns)) if columns else sql.SQL("*"),
+            sql.Identifier(table_name)
+        )
+        
+        # La connexion coordinatrice garde l'instantané exporté valide pendant tout le parcours
+        coordinator = self._open_connection()
+        stop = threading.Event()
+        threads: List[threading.Thread] = []
+        try:
+            coordinator.set_session(isolation_level="REPEATABLE READ", readonly=True)
+            with coordinator.cursor() as cursor:
+                cursor.execute("SELECT pg_export_snapshot()")
+                snapshot = cursor.fetchone()[0]
+                ranges: queue.Queue = queue.Queue()
+                for index, (condition, params) in enumerate(
+                        self._scan_ranges(cursor, table_name, key_column, chunks or workers * 4)):
+                    ranges.put((index, sql.SQL("{} WHERE {}").format(select, condition), params))
+            results: queue.Queue = queue.Queue(maxsize=workers * 2)
+            
+            def emit(item: Tuple[str, Any]) -> bool:
+                # Attente interruptible: le consommateur peut abandonner le parcours
+                while not stop.is_set():
+                    try:
+                        results.put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        pass
+                return False
+            
+            def worker() -> None:
+                try:
+                    conn = self._open_connection()
+                    try:
+                        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+                        with conn.cursor() as cursor:
+                            cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+                        while not stop.is_set():
+                            try:
+                                index, query, params = ranges.get_nowait()
+                            except queue.Empty:
+                                break
+                            if output_dir is not None:
+                                path = os.path.join(output_dir, f"{table_name}.{index:04d}{extension}")
+                                with conn.cursor() as cursor, self._open_copy_file(path, "w", compression) as file:
+                                    statement = cursor.mogrify(query, params)
+                                    cursor.copy_expert(b"COPY (" + statement + b") TO STDOUT " + options.encode(), file)
+                                emit(("item", path))
+                                continue
+                            cursor = conn.cursor(name=f"pgm_scan_{index}", cursor_factory=DictCursor)
+                            try:
+                                cursor.execute(query, params)
+                                while not stop.is_set():
+                                    rows = cursor.fetchmany(batch_size)
+                                    if not rows or not emit(("item", [dict(row) for row in rows])):
+                                        break
+                            finally:
+                                cursor.close()
+                    finally:
+                        conn.close()
+                except Exception as e:
+                    emit(("error", e))
+                finally:
+                    emit(("done", None))
+            
+            threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+            for thread in threads:
+                thread.start()
+            
+            running = len(threads)
+            while running:
+                kind, value = results.get()
+                if kind == "done":
+                    running -= 1
+                elif kind == "error":
+                    raise value
+                else:
+                    yield value
+        except Exception as e:
+            self._log(logging.ERROR, f"Erreur lors du parcours parallèle: {e}", event="parallel_scan",
+                      table=table_name, error=str(e))
+            raise
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            coordinator.close()
+    
+    @staticmethod
+    def _scan_ranges(cursor, table_name: str, key_column: Optional[str], chunks: int) -> List[Tuple[sql.Composable, tuple]]:
+        """
+        Découpe une table en plages disjointes pour `parallel_scan`.
+        
+        :param cursor: Curseur de la transaction qui porte l'instantané
+        :param table_name: Nom de la table
+        :param key_column: Colonne entière de découpage (None = plages de blocs ctid)
+        :param chunks: Nombre de plages souhaité
+        :return: Liste de (condition WHERE, paramètres)
+        """
+        if key_column:
+            key = sql.Identifier(key_column)
+            cursor.execute(sql.SQL("SELECT min({0}), max({0}) FROM {1}").format(key, sql.Identifier(table_name)))
+            low, high = cursor.fetchone()
+            if low is None:
+                return []
+            if not isinstance(low, int):
+                raise ValueError(f"La colonne de découpage '{key_column}' doit être entière")
+            step = -(-(high - low + 1) // chunks)
+            condition = sql.SQL("{0} >= %s AND {0} < %s").format(key)
+            return [(condition, (start, start + step)) for start in range(low, high + 1, step)]
+        
+        # Plages de blocs: la dernière est ouverte pour couvrir les blocs ajoutés depuis la mesure
+        cursor.execute(
+            "SELECT pg_relation_size(%s::regclass) / current_setting('block_size')::bigint",
+            (sql.Identifier(table_name).as_string(cursor),)
+        )
+        blocks = cursor.fetchone()[0]
+        step = max(1, -(-blocks // chunks))
+        bounds = list(range(0, blocks, step))[1:]
+        if not bounds:
+            return [(sql.SQL("TRUE"), ())]
+        ranges = [(sql.SQL("ctid < %s::tid"), (f"({bounds[0]},0)",))]
+        ranges += [(sql.SQL("ctid >= %s::tid AND ctid < %s::tid"), (f"({start},0)", f"({end},0)"))
+                   for start, end in zip(bounds, bounds[1:])]
+        ranges.append((sql.SQL("ctid >= %s::tid"), (f"({bounds[-1]},0)",)))
+        return ranges
+    
+    def explain(self, query: Union[str, sql.Composable], params: Optional[tuple] = None,
+                analyze: bool = True, buffers: bool = True) -> Dict[str, Any]:
+        """
+        Retourne le plan d'exécution d'une requête au format JSON.
+        
+        Avec `analyze`, la requête est réellement exécutée, mais ses effets sont
+        toujours annulés: dans une transaction du gestionnaire, elle est encadrée
+        par un point de sauvegarde restauré ensuite.
+        
+        :param query: Requête SQL à analyser
+        :param params: Paramètres pour la requête (optionnel)
+        :param analyze: Si True, exécute la requête et mesure les temps réels (EXPLAIN ANALYZE)
+        :param buffers: Si True, relève les tampons lus (avec `analyze`)
+        :return: Plan (dictionnaire avec les clés "Plan", "Planning Time", "Execution Time")
+        """
+        options = ["FORMAT JSON"]
+        if analyze:
+            options = ["ANALYZE"] + (["BUFFERS"] if buffers else []) + options
+        
+        savepoint = False
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    if isinstance(query, sql.Composable):
+                        query = query.as_string(conn)
+                    if analyze and self.in_transaction():
+                        cursor.execute("SAVEPOINT pgm_explain")
+                        savepoint = True
+                    cursor.execute(f"EXPLAIN ({', '.join(options)}) {query.strip().rstrip(';')}", params)
+                    plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return plan[0]
+            finally:
+                # EXPLAIN ANALYZE exécute la requête: ses éventuelles écritures sont annulées
+                if savepoint and not conn.closed:
+                    with conn.cursor() as cursor:
+                        cursor.execute("ROLLBACK TO SAVEPOINT pgm_explain; RELEASE SAVEPOINT pgm_explain")
+                self._rollback(conn)
+    
+    def batch(self, page_size: int = 100) -> WriteBatch:
+        """
+        Crée une unité de travail pour envoyer de nombreuses écritures ensemble.
+        
+        Exemple::
+        
+            with manager.batch() as batch:
+                batch.update("clients", {"nom": "A"}, "id = %s", (1,))
+                batch.delete("clients", "id = %s", (2,))
+            print(batch.counts)
+        
+        :param page_size: Nombre d'opérations envoyées par aller-retour
+        :return: Lot à remplir puis exécuter (`execute()` ou sortie du bloc `with`)
+        """
+        return WriteBatch(self, page_size)
     
-    def execute_query(self, query: str, params: Optional[tuple] = None, fetch: bool = False) -> Optional[List[Dict]]:
+    def open_cursor(self, query: Union[str, sql.Composable], params: Optional[tuple] = None) -> QueryCursor:
         """
-        Exécute une requête SQL et retourne éventuellement les résultats.
+        Ouvre un curseur serveur paginé (voir `QueryCursor`), par exemple pour
+        alimenter une grille qui charge les lignes au fil du défilement.
         
-        :param query: Requête SQL à exécuter
+        :param query: Requête SQL à exécuter (SELECT)
         :param params: Paramètres pour la requête (optionnel)
-        :param fetch: Si True, retourne les résultats (pour SELECT)
-        :return: Résultats de la requête ou None
+        :return: Curseur à fermer après usage
         """
-        try:
-            self.cursor.execute(query, params)
-            if fetch:
-                return [dict(row) for row in self.cursor.fetchall()]
-            self.connection.commit()
-            return None
-        except Exception as e:
-            self.connection.rollback()
-            print(f"Erreur lors de l'exécution de la requête: {e}")
-            raise
+        return QueryCursor(self, query, params)
     
-    def create_table(self, table_name: str, columns: Dict[str, str], if_not_exists: bool = True) -> None:
+    PARTITION_METHODS = ("range", "list", "hash")
+    
+    def create_table(self, table_name: str, columns: Dict[str, str], if_not_exists: bool = True,
+                     partition_by: Optional[str] = None, partition_key: Optional[Union[str, List[str]]] = None) -> None:
         """
         Crée une nouvelle table dans la base de données.
         
         :param table_name: Nom de la table
         :param columns: Dictionnaire des colonnes (nom: type)
         :param if_not_exists: Si True, ajoute la clause IF NOT EXISTS
+        :param partition_by: Méthode de partitionnement ("range", "list" ou "hash"); la table
+                             créée est alors une table mère sans données propres (voir `create_partition`)
+        :param partition_key: Colonne(s) ou expression de la clé de partitionnement
         """
         if_not_exists_clause = "IF NOT EXISTS" if if_not_exists else ""
         columns_def = ", ".join([f"{col_name} {col_type}" for col_name, col_type in columns.items()])
         
-        query = f"CREATE TABLE {if_not_exists_clause} {table_name} ({columns_def});"
+        query = f"CREATE TABLE {if_not_exists_clause} {table_name} ({columns_def})"
+        if partition_by:
+            if partition_by.lower() not in self.PARTITION_METHODS:
+                raise ValueError(f"Méthode de partitionnement inconnue: {partition_by}")
+            if not partition_key:
+                raise ValueError("partition_key est obligatoire avec partition_by")
+            key = partition_key if isinstance(partition_key, str) else ", ".join(partition_key)
+            query += f" PARTITION BY {partition_by.upper()} ({key})"
+        query += ";"
+        self.execute_query(query)
+        self.schema_cache.invalidate()
+        self._log(logging.INFO, f"Table '{table_name}' créée avec succès.", event="create_table", table=table_name)
+    
+    @staticmethod
+    def _partition_bound(values: Optional[Sequence[Any]] = None, start: Any = None, end: Any = None,
+                         modulus: Optional[int] = None, remainder: Optional[int] = None,
+                         default: bool = False) -> sql.Composable:
+        """
+        Clause de bornes d'une partition (FOR VALUES ... ou DEFAULT).
+        
+        :param values: Valeurs d'une partition de liste
+        :param start: Borne inférieure incluse d'une partition d'intervalle
+        :param end: Borne supérieure exclue d'une partition d'intervalle
+        :param modulus: Modulo d'une partition de hachage
+        :param remainder: Reste d'une partition de hachage
+        :param default: Si True, partition par défaut
+        :return: Clause SQL
+        """
+        if default:
+            return sql.SQL("DEFAULT")
+        if values is not None:
+            return sql.SQL("FOR VALUES IN ({})").format(sql.SQL(', ').join(map(sql.Literal, values)))
+        if start is not None and end is not None:
+            return sql.SQL("FOR VALUES FROM ({}) TO ({})").format(sql.Literal(start), sql.Literal(end))
+        if modulus is not None and remainder is not None:
+            return sql.SQL("FOR VALUES WITH (MODULUS {}, REMAINDER {})").format(sql.Literal(modulus),
+                                                                               sql.Literal(remainder))
+        raise ValueError("Bornes de partition manquantes (values, start/end, modulus/remainder ou default)")
+    
+    def create_partition(self, table_name: str, partition_name: str, if_not_exists: bool = True,
+                         **bounds: Any) -> None:
+        """
+        Crée une partition d'une table partitionnée.
+        
+        Exemple::
+        
+            manager.create_partition("events", "events_2024_01", start="2024-01-01", end="2024-02-01")
+            manager.create_partition("clients", "clients_fr", values=["FR", "BE"])
+            manager.create_partition("sessions", "sessions_0", modulus=4, remainder=0)
+        
+        :param table_name: Nom de la table mère
+        :param partition_name: Nom de la partition
+        :param if_not_exists: Si True, ajoute la clause IF NOT EXISTS
+        :param bounds: Bornes: values, start/end, modulus/remainder ou default=True
+        """
+        query = sql.SQL("CREATE TABLE {}{} PARTITION OF {} {}").format(
+            sql.SQL("IF NOT EXISTS " if if_not_exists else ""),
+            sql.Identifier(partition_name),
+            sql.Identifier(table_name),
+            self._partition_bound(**bounds)
+        )
+        self.execute_query(query)
+        self.schema_cache.invalidate()
+        self._log(logging.INFO, f"Partition '{partition_name}' de '{table_name}' créée.", event="create_partition",
+                  table=table_name, partition=partition_name)
+    
+    def attach_partition(self, table_name: str, partition_name: str, **bounds: Any) -> None:
+        """
+        Rattache une table existante comme partition d'une table partitionnée.
+        
+        :param table_name: Nom de la table mère
+        :param partition_name: Nom de la table à rattacher
+        :param bounds: Bornes: values, start/end, modulus/remainder ou default=True
+        """
+        query = sql.SQL("ALTER TABLE {} ATTACH PARTITION {} {}").format(
+            sql.Identifier(table_name), sql.Identifier(partition_name), self._partition_bound(**bounds)
+        )
         self.execute_query(query)
-        print(f"Table '{table_name}' créée avec succès.")
+        self.schema_cache.invalidate()
+        self._invalidate_results(table_name)
+        self._log(logging.INFO, f"Partition '{partition_name}' rattachée à '{table_name}'.", event="attach_partition",
+                  table=table_name, partition=partition_name)
+    
+    def detach_partition(self, table_name: str, partition_name: str, concurrently: bool = False) -> None:
+        """
+        Détache une partition, qui devient une table indépendante.
+        
+        :param table_name: Nom de la table mère
+        :param partition_name: Nom de la partition
+        :param concurrently: Si True, détache sans verrou exclusif sur la table mère
+                             (PostgreSQL 14+, hors transaction)
+        """
+        query = sql.SQL("ALTER TABLE {} DETACH PARTITION {}{}").format(
+            sql.Identifier(table_name), sql.Identifier(partition_name),
+            sql.SQL(" CONCURRENTLY" if concurrently else "")
+        )
+        if concurrently:
+            self._execute_autocommit(query)
+        else:
+            self.execute_query(query)
+        self.schema_cache.invalidate()
+        self._invalidate_results(table_name)
+        self._log(logging.INFO, f"Partition '{partition_name}' détachée de '{table_name}'.", event="detach_partition",
+                  table=table_name, partition=partition_name)
+    
+    def list_partitions(self, table_name: str) -> List[Dict]:
+        """
+        Liste les partitions d'une table avec leurs bornes et leur taille.
+        
+        :param table_name: Nom de la table mère
+        :return: Liste de dictionnaires (partition_name, bound, total_bytes, estimated_rows)
+        """
+        query = """
+        SELECT c.relname AS partition_name,
+               pg_get_expr(c.relpartbound, c.oid) AS bound,
+               pg_total_relation_size(c.oid) AS total_bytes,
+               GREATEST(c.reltuples, 0)::bigint AS estimated_rows
+        FROM pg_catalog.pg_inherits i
+        JOIN pg_catalog.pg_class c ON c.oid = i.inhrelid
+        JOIN pg_catalog.pg_class p ON p.oid = i.inhparent
+        JOIN pg_catalog.pg_namespace n ON n.oid = p.relnamespace
+        WHERE n.nspname = %s AND p.relname = %s
+        ORDER BY c.relname;
+        """
+        return self._query_primary(query, (self.schema_cache.schema, table_name))
+    
+    @staticmethod
+    def _next_window(start: date, interval: str) -> date:
+        """Début de la fenêtre de temps suivante ("day", "week", "month" ou "year")."""
+        if interval == "day":
+            return start + timedelta(days=1)
+        if interval == "week":
+            return start + timedelta(weeks=1)
+        if interval == "month":
+            return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        if interval == "year":
+            return date(start.year + 1, 1, 1)
+        raise ValueError(f"Intervalle de partition inconnu: {interval}")
+    
+    def create_time_partitions(self, table_name: str, interval: str = "month", ahead: int = 3,
+                               start: Optional[date] = None) -> List[str]:
+        """
+        Crée à l'avance les partitions d'intervalle par fenêtre de temps d'une table
+        partitionnée par RANGE sur une date ou un horodatage.
+        
+        Les partitions déjà présentes sont conservées; à appeler périodiquement
+        (par exemple chaque jour) pour garder `ahead` fenêtres d'avance.
+        
+        :param table_name: Nom de la table mère
+        :param interval: Taille des fenêtres: "day", "week", "month" ou "year"
+        :param ahead: Nombre de fenêtres créées après la fenêtre courante
+        :param start: Date dans la première fenêtre à créer (par défaut aujourd'hui)
+        :return: Noms des partitions créées
+        """
+        day = start or date.today()
+        if interval == "week":
+            window = day - timedelta(days=day.weekday())
+        elif interval == "month":
+            window = day.replace(day=1)
+        elif interval == "year":
+            window = day.replace(month=1, day=1)
+        else:
+            window = day
+        
+        suffix = {"day": "%Y%m%d", "week": "%Y%m%d", "month": "%Y%m", "year": "%Y"}[interval]
+        existing = {partition['partition_name'] for partition in self.list_partitions(table_name)}
+        created = []
+        for _ in range(ahead + 1):
+            end = self._next_window(window, interval)
+            name = f"{table_name}_p{window.strftime(suffix)}"
+            if name not in existing:
+                self.create_partition(table_name, name, start=window.isoformat(), end=end.isoformat())
+                created.append(name)
+            window = end
+        return created
+    
+    def drop_old_partitions(self, table_name: str, older_than: Union[date, datetime, str],
+                            detach_concurrently: bool = False) -> List[str]:
+        """
+        Supprime les partitions d'intervalle dont la borne supérieure est antérieure
+        ou égale à `older_than` (rétention), en les détachant d'abord.
+        
+        Bien moins coûteux qu'un `delete_data` massif: aucune ligne n'est parcourue.
+        La borne est interprétée comme un horodatage (partitionnement par date).
+        
+        :param table_name: Nom de la table mère
+        :param older_than: Date limite
+        :param detach_concurrently: Si True, détache sans verrou exclusif (PostgreSQL 14+)
+        :return: Noms des partitions supprimées
+        """
+        query = """
+        SELECT c.relname AS partition_name
+        FROM pg_catalog.pg_inherits i
+        JOIN pg_catalog.pg_class c ON c.oid = i.inhrelid
+        JOIN pg_catalog.pg_class p ON p.oid = i.inhparent
+        JOIN pg_catalog.pg_namespace n ON n.oid = p.relnamespace
+        WHERE n.nspname = %s AND p.relname = %s
+        AND (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \\(''([^'']+)''\\)'))[1]::timestamptz
+            <= %s::timestamptz
+        ORDER BY c.relname;
+        """
+        older_than = older_than.isoformat() if isinstance(older_than, (date, datetime)) else older_than
+        rows = self._query_primary(query, (self.schema_cache.schema, table_name, older_than))
+        
+        dropped = []
+        for row in rows:
+            name = row['partition_name']
+            self.detach_partition(table_name, name, concurrently=detach_concurrently)
+            self.execute_query(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+            dropped.append(name)
+        if dropped:
+            self.schema_cache.invalidate()
+            self._log(logging.INFO, f"{len(dropped)} partition(s) supprimée(s) de '{table_name}'.",
+                      event="drop_old_partitions", table=table_name, partitions=dropped)
+        return dropped
     
     def drop_table(self, table_name: str, if_exists: bool = True) -> None:
         """
@@ -101,7 +2802,157 @@ class PostgreSQLManager:
         if_exists_clause = "IF EXISTS" if if_exists else ""
         query = f"DROP TABLE {if_exists_clause} {table_name};"
         self.execute_query(query)
-        print(f"Table '{table_name}' supprimée avec succès.")
+        self.schema_cache.invalidate()
+        self._log(logging.INFO, f"Table '{table_name}' supprimée avec succès.", event="drop_table", table=table_name)
+    
+    INDEX_METHODS = ("btree", "hash", "gin", "gist", "brin")
+    
+    def _execute_autocommit(self, query: Union[str, sql.Composable]) -> None:
+        """
+        Exécute une instruction hors transaction (nécessaire pour CONCURRENTLY).
+        
+        :param query: Instruction à exécuter
+        """
+        if self.in_transaction():
+            raise psycopg2.ProgrammingError("Instruction impossible dans une transaction (CONCURRENTLY)")
+        with self.get_connection() as conn:
+            conn.rollback()
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query)
+            finally:
+                conn.autocommit = False
+    
+    def create_index(self, table_name: str, columns: List[str], index_name: Optional[str] = None,
+                     method: str = "btree", unique: bool = False, where: Optional[str] = None,
+                     include: Optional[List[str]] = None, concurrently: bool = False,
+                     if_not_exists: bool = True) -> None:
+        """
+        Crée un index sur une table.
+        
+        :param table_name: Nom de la table
+        :param columns: Colonnes indexées, dans l'ordre
+        :param index_name: Nom de l'index (par défaut, choisi par PostgreSQL)
+        :param method: Méthode d'accès: "btree", "hash", "gin", "gist" ou "brin"
+        :param unique: Si True, crée un index unique
+        :param where: Condition d'un index partiel (optionnelle)
+        :param include: Colonnes incluses non indexées (INCLUDE, btree uniquement)
+        :param concurrently: Si True, crée l'index sans bloquer les écritures (hors transaction)
+        :param if_not_exists: Si True, ajoute la clause IF NOT EXISTS (nécessite un nom)
+        """
+        if method not in self.INDEX_METHODS:
+            raise ValueError(f"Méthode d'index inconnue: {method}")
+        
+        parts = [sql.SQL("CREATE {}INDEX {}").format(
+            sql.SQL("UNIQUE " if unique else ""),
+            sql.SQL("CONCURRENTLY " if concurrently else "")
+        )]
+        if index_name:
+            parts.append(sql.SQL("{}{} ").format(sql.SQL("IF NOT EXISTS " if if_not_exists else ""),
+                                                 sql.Identifier(index_name)))
+        parts.append(sql.SQL("ON {} USING {} ({})").format(
+            sql.Identifier(table_name), sql.SQL(method), sql.SQL(', ').join(map(sql.Identifier, columns))
+        ))
+        if include:
+            parts.append(sql.SQL(" INCLUDE ({})").format(sql.SQL(', ').join(map(sql.Identifier, include))))
+        if where:
+            parts.append(sql.SQL(" WHERE {}").format(sql.SQL(where)))
+        query = sql.Composed(parts)
+        
+        if concurrently:
+            self._execute_autocommit(query)
+        else:
+            self.execute_query(query)
+        self._log(logging.INFO, f"Index créé sur '{table_name}' ({', '.join(columns)}).", event="create_index",
+                  table=table_name, index=index_name)
+    
+    def drop_index(self, index_name: str, concurrently: bool = False, if_exists: bool = True) -> None:
+        """
+        Supprime un index.
+        
+        :param index_name: Nom de l'index
+        :param concurrently: Si True, supprime l'index sans bloquer la table (hors transaction)
+        :param if_exists: Si True, ajoute la clause IF EXISTS
+        """
+        query = sql.SQL("DROP INDEX {}{}{}").format(
+            sql.SQL("CONCURRENTLY " if concurrently else ""),
+            sql.SQL("IF EXISTS " if if_exists else ""),
+            sql.Identifier(index_name)
+        )
+        if concurrently:
+            self._execute_autocommit(query)
+        else:
+            self.execute_query(query)
+        self._log(logging.INFO, f"Index '{index_name}' supprimé.", event="drop_index", index=index_name)
+    
+    def list_indexes(self, table_name: Optional[str] = None) -> List[Dict]:
+        """
+        Liste les index du schéma (ou d'une table) avec leur taille et leur utilisation.
+        
+        :param table_name: Nom de la table (par défaut, toutes les tables)
+        :return: Liste de dictionnaires (index_name, table_name, method, is_unique, is_primary,
+                 is_valid, definition, size_bytes, idx_scan, idx_tup_read)
+        """
+        query = """
+        SELECT ic.relname AS index_name, tc.relname AS table_name, am.amname AS method,
+               i.indisunique AS is_unique, i.indisprimary AS is_primary, i.indisvalid AS is_valid,
+               pg_get_indexdef(i.indexrelid) AS definition,
+               pg_relation_size(i.indexrelid) AS size_bytes,
+               COALESCE(s.idx_scan, 0) AS idx_scan, COALESCE(s.idx_tup_read, 0) AS idx_tup_read
+        FROM pg_catalog.pg_index i
+        JOIN pg_catalog.pg_class ic ON ic.oid = i.indexrelid
+        JOIN pg_catalog.pg_class tc ON tc.oid = i.indrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = tc.relnamespace
+        JOIN pg_catalog.pg_am am ON am.oid = ic.relam
+        LEFT JOIN pg_catalog.pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+        WHERE n.nspname = %s
+        """
+        params: Tuple[Any, ...] = (self.schema_cache.schema,)
+        if table_name:
+            query += " AND tc.relname = %s"
+            params += (table_name,)
+        return self._query_primary(query + " ORDER BY tc.relname, ic.relname;", params)
+    
+    def index_advice(self, min_table_rows: int = 10000, min_index_bytes: int = 1 << 20) -> List[Dict]:
+        """
+        Conseils d'indexation tirés des statistiques d'utilisation
+        (`pg_stat_user_tables` / `pg_stat_user_indexes`, cumulées depuis leur dernière remise à zéro).
+        
+        Sont signalés: les index jamais utilisés (hors clés primaires et index uniques),
+        les index invalides (création CONCURRENTLY interrompue) et les tables d'au moins
+        `min_table_rows` lignes lues surtout par parcours séquentiel.
+        
+        :param min_table_rows: Taille minimale d'une table pour signaler ses parcours séquentiels
+        :param min_index_bytes: Taille minimale d'un index inutilisé pour être signalé
+        :return: Liste de dictionnaires (kind, table_name, index_name, message)
+        """
+        advice: List[Dict] = []
+        for index in self.list_indexes():
+            if not index['is_valid']:
+                advice.append({
+                    "kind": "invalid_index", "table_name": index['table_name'], "index_name": index['index_name'],
+                    "message": f"Index invalide {index['index_name']} sur {index['table_name']}: "
+                               f"à supprimer puis recréer"
+                })
+            elif (index['idx_scan'] == 0 and not index['is_unique'] and not index['is_primary']
+                  and index['size_bytes'] >= min_index_bytes):
+                advice.append({
+                    "kind": "unused_index", "table_name": index['table_name'], "index_name": index['index_name'],
+                    "message": f"Index {index['index_name']} sur {index['table_name']} jamais utilisé "
+                               f"({index['size_bytes'] / 1048576:.1f} Mo): candidat à la suppression"
+                })
+        
+        for table in self.get_table_stats():
+            if (table['n_live_tup'] >= min_table_rows and table['seq_scan'] > table['idx_scan']
+                    and table['seq_tup_read'] >= table['n_live_tup'] * 10):
+                advice.append({
+                    "kind": "seq_scans", "table_name": table['table_name'], "index_name": None,
+                    "message": f"Table {table['table_name']} ({table['n_live_tup']} lignes) lue par "
+                               f"{table['seq_scan']} parcours séquentiel(s) contre {table['idx_scan']} par index: "
+                               f"indexer les colonnes des filtres fréquents (voir le plan d'exécution)"
+                })
+        return advice
     
     def insert_data(self, table_name: str, data: Dict[str, Any]) -> None:
         """
@@ -110,17 +2961,277 @@ class PostgreSQLManager:
         :param table_name: Nom de la table
         :param data: Dictionnaire des données à insérer (colonne: valeur)
         """
-        columns = data.keys()
+        columns = tuple(data.keys())
         values = [data[col] for col in columns]
         
-        query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
-            sql.Identifier(table_name),
-            sql.SQL(', ').join(map(sql.Identifier, columns)),
-            sql.SQL(', ').join(sql.Placeholder() * len(values))
-        )
+        with self.get_connection() as conn:
+            # La composition de la requête est mémorisée par (table, colonnes)
+            query = self._insert_queries.get((table_name, columns))
+            if query is None:
+                query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+                    sql.Identifier(table_name),
+                    sql.SQL(', ').join(map(sql.Identifier, columns)),
+                    sql.SQL(', ').join(sql.Placeholder() * len(values))
+                ).as_string(conn)
+                self._insert_queries[(table_name, columns)] = query
+            
+            self.execute_query(query, tuple(values))
+        self._log(logging.INFO, f"Données insérées dans '{table_name}' avec succès.", event="insert", table=table_name)
+    
+    def insert_many(self, table_name: str, rows: Iterable[Union[Dict[str, Any], Sequence[Any]]],
+                    columns: Optional[List[str]] = None, mode: str = "copy", page_size: int = 1000) -> int:
+        """
+        Insère un grand nombre de lignes par lots.
+        
+        Les lignes sont consommées au fil de l'eau (un générateur convient) et
+        envoyées par lots de `page_size`, soit via `COPY ... FROM STDIN`, soit via
+        des `INSERT` multi-lignes (`execute_values`). Une validation est faite par lot.
+        
+        :param table_name: Nom de la table
+        :param rows: Itérable de dictionnaires (colonne: valeur) ou de tuples
+        :param columns: Colonnes ciblées (optionnel, déduites du premier dictionnaire)
+        :param mode: "copy" ou "values"
+        :param page_size: Nombre de lignes par lot
+        :return: Nombre de lignes insérées
+        """
+        if mode not in ("copy", "values"):
+            raise ValueError(f"Mode d'insertion inconnu: {mode}")
+        if page_size < 1:
+            raise ValueError("page_size doit être strictement positif")
+        
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        rows = chain([first], rows)
+        
+        if columns is None and isinstance(first, dict):
+            columns = list(first.keys())
+        
+        target = sql.Identifier(table_name)
+        if columns:
+            target = sql.SQL("{} ({})").format(target, sql.SQL(', ').join(map(sql.Identifier, columns)))
+        
+        if mode == "copy":
+            query = sql.SQL("COPY {} FROM STDIN").format(target)
+        else:
+            query = sql.SQL("INSERT INTO {} VALUES %s").format(target)
+        
+        total = 0
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    while True:
+                        batch = [
+                            tuple(row[col] for col in columns) if isinstance(row, dict) else tuple(row)
+                            for row in islice(rows, page_size)
+                        ]
+                        if not batch:
+                            break
+                        
+                        if mode == "copy":
+                            cursor.copy_expert(query, self._copy_buffer(batch))
+                        else:
+                            execute_values(cursor, query, batch, page_size=page_size)
+                        self._commit(conn)
+                        total += len(batch)
+            except Exception as e:
+                self._rollback(conn)
+                self._log(logging.ERROR, f"Erreur lors de l'insertion par lots: {e}", event="insert_many",
+                          table=table_name, error=str(e))
+                raise
+            finally:
+                # Les lots déjà validés ont modifié la table, même en cas d'erreur
+                self._invalidate_results(table_name)
+        
+        self._log(logging.INFO, f"{total} ligne(s) insérée(s) dans '{table_name}' avec succès.",
+                  event="insert_many", table=table_name, rows=total)
+        return total
+    
+    def upsert_many(self, table_name: str, rows: Iterable[Union[Dict[str, Any], Sequence[Any]]],
+                    conflict_columns: List[str], update_columns: Optional[List[str]] = None,
+                    columns: Optional[List[str]] = None, page_size: int = 1000,
+                    staging_threshold: Optional[int] = 10000) -> Dict[str, int]:
+        """
+        Insère ou met à jour un grand nombre de lignes avec `INSERT ... ON CONFLICT`.
+        
+        Jusqu'à `staging_threshold` lignes, elles sont envoyées par lots de `page_size`
+        en `INSERT` multi-lignes (une validation par lot). Au-delà, toutes les lignes
+        sont chargées via `COPY` dans une table temporaire puis fusionnées en une
+        seule instruction, dans une seule transaction. Si une clé apparaît plusieurs
+        fois, la dernière ligne l'emporte.
+        
+        :param table_name: Nom de la table
+        :param rows: Itérable de dictionnaires (colonne: valeur) ou de tuples
+        :param conflict_columns: Colonnes de la contrainte d'unicité (clé de fusion)
+        :param update_columns: Colonnes mises à jour en cas de conflit (par défaut toutes
+                               les autres; liste vide = DO NOTHING)
+        :param columns: Colonnes ciblées (optionnel, déduites du premier dictionnaire)
+        :param page_size: Nombre de lignes par lot
+        :param staging_threshold: Nombre de lignes au-delà duquel la table temporaire est utilisée
+                                  (None = jamais)
+        :return: Dictionnaire {"inserted": n, "updated": n}
+        """
+        if page_size < 1:
+            raise ValueError("page_size doit être strictement positif")
+        
+        rows = iter(rows)
+        first = next(rows, None)
+        counts = {"inserted": 0, "updated": 0}
+        if first is None:
+            return counts
+        rows = chain([first], rows)
+        
+        if columns is None:
+            if not isinstance(first, dict):
+                raise ValueError("columns est obligatoire pour des lignes sous forme de tuples")
+            columns = list(first.keys())
+        if update_columns is None:
+            update_columns = [col for col in columns if col not in conflict_columns]
+        key_positions = [columns.index(col) for col in conflict_columns]
+        
+        def to_tuple(row: Union[Dict[str, Any], Sequence[Any]]) -> tuple:
+            return tuple(row[col] for col in columns) if isinstance(row, dict) else tuple(row)
+        
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        if update_columns:
+            action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(', ').join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col)) for col in update_columns
+            ))
+        else:
+            action = sql.SQL("DO NOTHING")
+        
+        def merge(source: sql.Composable) -> sql.Composable:
+            # xmax = 0 distingue les lignes insérées des lignes mises à jour
+            return sql.SQL(
+                "WITH pgm_merged AS (INSERT INTO {} ({}) {} ON CONFLICT ({}) {} RETURNING (xmax = 0) AS inserted) "
+                "SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM pgm_merged"
+            ).format(sql.Identifier(table_name), column_list, source,
+                     sql.SQL(', ').join(map(sql.Identifier, conflict_columns)), action)
+        
+        buffered = list(islice(rows, staging_threshold + 1)) if staging_threshold is not None else []
+        staging = staging_threshold is not None and len(buffered) > staging_threshold
+        
+        with self.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    if staging:
+                        stage = sql.Identifier(f"pgm_upsert_{next(self._cursor_ids)}")
+                        cursor.execute(sql.SQL(
+                            "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA"
+                        ).format(stage, column_list, sql.Identifier(table_name)))
+                        cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN pgm_row bigserial").format(stage))
+                        copy = sql.SQL("COPY {} ({}) FROM STDIN").format(stage, column_list)
+                        pending = map(to_tuple, chain(buffered, rows))
+                        while True:
+                            batch = list(islice(pending, page_size))
+                            if not batch:
+                                break
+                            cursor.copy_expert(copy, self._copy_buffer(batch))
+                        keys = sql.SQL(', ').join(map(sql.Identifier, conflict_columns))
+                        cursor.execute(merge(sql.SQL(
+                            "SELECT {} FROM (SELECT DISTINCT ON ({}) * FROM {} ORDER BY {}, pgm_row DESC) AS pgm_latest"
+                        ).format(column_list, keys, stage, keys)))
+                        inserted, updated = cursor.fetchone()
+                        counts["inserted"] += inserted
+                        counts["updated"] += updated
+                        self._commit(conn)
+                    else:
+                        pending = map(to_tuple, chain(buffered, rows))
+                        query = merge(sql.SQL("VALUES %s"))
+                        while True:
+                            batch = list(islice(pending, page_size))
+                            if not batch:
+                                break
+                            # Une même clé ne peut être fusionnée deux fois dans une instruction
+                            latest = {tuple(row[i] for i in key_positions): row for row in batch}
+                            execute_values(cursor, query, list(latest.values()), page_size=len(latest))
+                            inserted, updated = cursor.fetchone()
+                            counts["inserted"] += inserted
+                            counts["updated"] += updated
+                            self._commit(conn)
+            except Exception as e:
+                self._rollback(conn)
+                self._log(logging.ERROR, f"Erreur lors de la fusion par lots: {e}", event="upsert_many",
+                          table=table_name, error=str(e))
+                raise
+            finally:
+                # Les lots déjà validés ont modifié la table, même en cas d'erreur
+                self._invalidate_results(table_name)
+        
+        self._log(logging.INFO, f"{counts['inserted']} ligne(s) insérée(s), {counts['updated']} mise(s) à jour "
+                  f"dans '{table_name}'.", event="upsert_many", table=table_name, **counts)
+        return counts
+    
+    @classmethod
+    def _copy_value(cls, value: Any) -> str:
+        """
+        Convertit une valeur Python au format texte de COPY, comme psycopg2 l'adapte
+        en mode "values": les listes deviennent des tableaux PostgreSQL, les
+        dictionnaires et les valeurs enveloppées dans `Json` du JSON.
+        
+        :param value: Valeur à convertir
+        :return: Représentation texte échappée
+        """
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "\\\\x" + bytes(value).hex()
+        if isinstance(value, Json):
+            value = value.dumps(value.adapted)
+        elif isinstance(value, dict):
+            value = json.dumps(value)
+        elif isinstance(value, list):
+            value = cls._array_literal(value)
+        return (str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r"))
+    
+    @classmethod
+    def _array_literal(cls, values: list) -> str:
+        """
+        Convertit une liste (éventuellement imbriquée) en littéral de tableau PostgreSQL.
+        
+        :param values: Éléments du tableau
+        :return: Littéral de la forme {"a","b",NULL}
+        """
+        elements = []
+        for value in values:
+            if value is None:
+                elements.append("NULL")
+                continue
+            if isinstance(value, list):
+                elements.append(cls._array_literal(value))
+                continue
+            if isinstance(value, bool):
+                value = "t" if value else "f"
+            elif isinstance(value, (bytes, bytearray, memoryview)):
+                value = "\\x" + bytes(value).hex()
+            elif isinstance(value, Json):
+                value = value.dumps(value.adapted)
+            elif isinstance(value, dict):
+                value = json.dumps(value)
+            elements.append('"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"')
+        return "{" + ",".join(elements) + "}"
+    
+    @classmethod
+    def _copy_buffer(cls, batch: List[tuple]) -> io.StringIO:
+        """
+        Construit le tampon COPY (format texte) d'un lot de lignes.
         
-        self.execute_query(query, tuple(values))
-        print(f"Données insérées dans '{table_name}' avec succès.")
+        :param batch: Lignes à sérialiser
+        :return: Tampon prêt pour `copy_expert`
+        """
+        buffer = io.StringIO()
+        for row in batch:
+            buffer.write("\t".join(cls._copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        return buffer
     
     def update_data(self, table_name: str, data: Dict[str, Any], condition: str, condition_params: Optional[tuple] = None) -> None:
         """
@@ -139,7 +3250,7 @@ class PostgreSQLManager:
         
         query = f"UPDATE {table_name} SET {set_clause} WHERE {condition};"
         self.execute_query(query, values)
-        print(f"Données mises à jour dans '{table_name}' avec succès.")
+        self._log(logging.INFO, f"Données mises à jour dans '{table_name}' avec succès.", event="update", table=table_name)
     
     def delete_data(self, table_name: str, condition: str, condition_params: Optional[tuple] = None) -> None:
         """
@@ -151,9 +3262,163 @@ class PostgreSQLManager:
         """
         query = f"DELETE FROM {table_name} WHERE {condition};"
         self.execute_query(query, condition_params)
-        print(f"Données supprimées de '{table_name}' avec succès.")
+        self._log(logging.INFO, f"Données supprimées de '{table_name}' avec succès.", event="delete", table=table_name)
+    
+    def delete_in_batches(self, table_name: str, condition: str, condition_params: Optional[tuple] = None,
+                          **options: Any) -> int:
+        """
+        Supprime des lignes par lots successifs validés un à un, pour les purges
+        volumineuses sans verrou ni transaction de longue durée.
+        
+        Les lots suivent l'ordre de la clé (`key_column` unique ou clé primaire à une colonne);
+        sans clé utilisable, ils sont sélectionnés par ctid.
+        
+        :param table_name: Nom de la table
+        :param condition: Condition WHERE des lignes à supprimer
+        :param condition_params: Paramètres pour la condition (optionnel)
+        :param options: batch_size, key_column, after, sleep, max_rows_per_second, progress (voir `_process_in_batches`)
+        :return: Nombre de lignes supprimées
+        """
+        return self._process_in_batches(table_name, None, condition, condition_params, **options)
+    
+    def update_in_batches(self, table_name: str, data: Dict[str, Any], condition: str,
+                          condition_params: Optional[tuple] = None, **options: Any) -> int:
+        """
+        Met à jour des lignes par lots successifs validés un à un, dans l'ordre de la clé
+        (`key_column` ou clé primaire à une colonne, obligatoire: une ligne mise à jour
+        change de ctid et pourrait être traitée deux fois).
+        
+        :param table_name: Nom de la table
+        :param data: Dictionnaire des données à mettre à jour (colonne: nouvelle valeur)
+        :param condition: Condition WHERE des lignes à mettre à jour
+        :param condition_params: Paramètres pour la condition (optionnel)
+        :param options: batch_size, key_column, after, sleep, max_rows_per_second, progress (voir `_process_in_batches`)
+        :return: Nombre de lignes mises à jour
+        """
+        return self._process_in_batches(table_name, data, condition, condition_params, **options)
+    
+    def _process_in_batches(self, table_name: str, data: Optional[Dict[str, Any]], condition: str,
+                            condition_params: Optional[tuple] = None, batch_size: int = 10000,
+                            key_column: Optional[str] = None, after: Any = None, sleep: float = 0.0,
+                            max_rows_per_second: Optional[float] = None,
+                            progress: Optional[Callable[[int, Any], None]] = None) -> int:
+        """
+        Supprime (`data` None) ou met à jour des lignes par lots de `batch_size`.
+        
+        :param table_name: Nom de la table
+        :param data: Colonnes à mettre à jour, ou None pour supprimer
+        :param condition: Condition WHERE des lignes traitées
+        :param condition_params: Paramètres pour la condition (optionnel)
+        :param batch_size: Nombre de lignes par lot (une transaction par lot)
+        :param key_column: Colonne unique (index unique à une colonne) ordonnant les lots
+                           (par défaut la clé primaire à une colonne)
+        :param after: Reprise après interruption: dernière clé traitée, telle que passée à `progress`
+        :param sleep: Pause entre deux lots en secondes
+        :param max_rows_per_second: Débit cible; des pauses sont ajoutées pour ne pas le dépasser
+        :param progress: Callback appelé après chaque lot avec (lignes traitées, dernière clé traitée)
+        :return: Nombre de lignes traitées
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size doit être strictement positif")
+        if self.in_transaction():
+            # Le principe est de valider entre les lots
+            raise psycopg2.ProgrammingError("Traitement par lots impossible dans une transaction")
+        
+        if key_column is None:
+            primary_key = self.get_primary_key(table_name)
+            key_column = primary_key[0] if len(primary_key) == 1 else None
+        elif not self._is_unique_column(table_name, key_column):
+            # Une clé non unique traiterait aussi les lignes hors condition qui partagent sa valeur
+            raise ValueError(f"La colonne '{key_column}' n'est pas couverte par un index unique de '{table_name}'")
+        if key_column is None and data is not None:
+            raise ValueError("La mise à jour par lots nécessite une clé à une colonne (key_column)")
+        
+        table = sql.Identifier(table_name)
+        filter_clause = sql.SQL(condition)
+        if data is not None:
+            action = sql.SQL("UPDATE {} SET {}").format(table, sql.SQL(', ').join(
+                sql.SQL("{} = %s").format(sql.Identifier(col)) for col in data
+            ))
+        else:
+            action = sql.SQL("DELETE FROM {}").format(table)
+        
+        if key_column is not None:
+            key = sql.Identifier(key_column)
+            
+            def build(resume: bool) -> sql.Composable:
+                return sql.SQL(
+                    "WITH pgm_batch AS (SELECT {key} FROM {table} WHERE ({filter}){after} ORDER BY {key} LIMIT %s), "
+                    "pgm_done AS ({action} {join} pgm_batch WHERE {table}.{key} = pgm_batch.{key} RETURNING 1) "
+                    "SELECT (SELECT count(*) FROM pgm_done), (SELECT count(*) FROM pgm_batch), "
+                    "(SELECT max({key}) FROM pgm_batch)"
+                ).format(key=key, table=table, filter=filter_clause, action=action,
+                         after=sql.SQL(" AND {} > %s").format(key) if resume else sql.SQL(""),
+                         join=sql.SQL("FROM" if data is not None else "USING"))
+            queries = {False: build(False), True: build(True)}
+        else:
+            # Sans clé: les lignes supprimées disparaissent, le lot suivant repart du début
+            query = sql.SQL(
+                "WITH pgm_batch AS (SELECT ctid FROM {table} WHERE ({filter}) LIMIT %s), "
+                "pgm_done AS ({action} WHERE ctid = ANY(ARRAY(SELECT ctid FROM pgm_batch)) RETURNING 1) "
+                "SELECT (SELECT count(*) FROM pgm_done), (SELECT count(*) FROM pgm_batch), NULL"
+            ).format(table=table, filter=filter_clause, action=action)
+        
+        total = 0
+        started = time.monotonic()
+        while True:
+            params: Tuple[Any, ...] = tuple(condition_params or ())
+            if key_column is not None:
+                statement = queries[after is not None]
+                if after is not None:
+                    params += (after,)
+            else:
+                statement = query
+            params += (batch_size,)
+            if data is not None:
+                params += tuple(data.values())
+            
+            with self.get_connection() as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(statement, params)
+                        done, selected, last_key = cursor.fetchone()
+                    self._commit(conn)
+                except Exception as e:
+                    self._rollback(conn)
+                    self._log(logging.ERROR, f"Erreur lors du traitement par lots: {e}", event="batched_write",
+                              table=table_name, processed=total, after=after, error=str(e))
+                    raise
+            
+            if selected == 0:
+                break
+            if done == 0 and key_column is None:
+                # Sans clé, le lot suivant resélectionnerait les mêmes lignes (trigger, politique RLS...)
+                self._log(logging.WARNING, f"Aucune des {selected} ligne(s) sélectionnée(s) n'a été supprimée "
+                          f"dans '{table_name}', arrêt du traitement par lots.", event="batched_write",
+                          table=table_name, processed=total)
+                break
+            total += done
+            if key_column is not None:
+                after = last_key
+            self._invalidate_results(table_name)
+            if progress:
+                progress(total, after)
+            if selected < batch_size:
+                break
+            
+            pause = sleep
+            if max_rows_per_second:
+                pause = max(pause, total / max_rows_per_second - (time.monotonic() - started))
+            if pause > 0:
+                time.sleep(pause)
+        
+        self._log(logging.INFO, f"{total} ligne(s) {'mise(s) à jour' if data is not None else 'supprimée(s)'} "
+                  f"par lots dans '{table_name}'.", event="batched_write", table=table_name, rows=total)
+        return total
     
-    def select_data(self, table_name: str, columns: List[str] = ["*"], condition: Optional[str] = None, condition_params: Optional[tuple] = None) -> List[Dict]:
+    def select_data(self, table_name: str, columns: List[str] = ["*"], condition: Optional[str] = None, condition_params: Optional[tuple] = None,
+                    stream: bool = False, itersize: int = 2000, cache: bool = True,
+                    cache_ttl: Optional[float] = None) -> Union[List[Dict], Iterator[Dict]]:
         """
         Récupère des données d'une table.
         
@@ -161,7 +3426,11 @@ class PostgreSQLManager:
         :param columns: Liste des colonnes à récupérer (par défaut toutes)
         :param condition: Condition WHERE (optionnelle)
         :param condition_params: Paramètres pour la condition (optionnel)
-        :return: Liste des lignes sous forme de dictionnaires
+        :param stream: Si True, retourne un générateur alimenté par un curseur serveur (voir `iter_query`)
+        :param itersize: Nombre de lignes récupérées par aller-retour en mode stream
+        :param cache: Si False, ne lit ni n'alimente le cache de résultats (`result_cache_size`)
+        :param cache_ttl: Durée de vie du résultat en cache en secondes (par défaut `result_cache_ttl`)
+        :return: Liste des lignes sous forme de dictionnaires (ou générateur en mode stream)
         """
         cols = ", ".join(columns)
         query = f"SELECT {cols} FROM {table_name}"
@@ -171,19 +3440,385 @@ class PostgreSQLManager:
         
         query += ";"
         
+        if stream:
+            return self.iter_query(query, condition_params, itersize=itersize)
+        
+        # Une transaction peut voir ses propres écritures non validées: pas de cache
+        if cache and self.result_cache is not None and not self.in_transaction():
+            key = (query, condition_params)
+            try:
+                hash(key)
+            except TypeError:
+                return self.execute_query(query, condition_params, fetch=True)
+            rows = self.result_cache.get(key)
+            if rows is None:
+                rows = self.execute_query(query, condition_params, fetch=True)
+                self.result_cache.put(key, rows, [table_name], cache_ttl)
+            return rows
         return self.execute_query(query, condition_params, fetch=True)
     
+    def select_page(self, table_name: str, columns: List[str] = ["*"], order_by: Union[str, List[str]] = "id",
+                    after: Optional[Any] = None, limit: int = 100, condition: Optional[str] = None,
+                    condition_params: Optional[tuple] = None, descending: bool = False) -> List[Dict]:
+        """
+        Récupère une page de lignes par pagination par clé (keyset / seek).
+        
+        La page suivante commence après la clé `after` de la dernière ligne lue
+        (`WHERE (clé) > (after) ORDER BY clé LIMIT n`): avec un index sur la clé,
+        la page 10 000 est aussi rapide que la première, contrairement à OFFSET.
+        
+        :param table_name: Nom de la table
+        :param columns: Liste des colonnes à récupérer (par défaut toutes); les colonnes de la clé sont ajoutées si besoin
+        :param order_by: Colonne ou liste de colonnes de la clé, unique et de préférence indexée
+        :param after: Clé de la dernière ligne de la page précédente (None = première page),
+                      valeur simple ou tuple pour une clé composite (voir `page_key`)
+        :param limit: Nombre maximal de lignes de la page
+        :param condition: Condition WHERE supplémentaire (optionnelle)
+        :param condition_params: Paramètres pour la condition (optionnel)
+        :param descending: Si True, parcourt la clé en ordre décroissant
+        :return: Liste des lignes sous forme de dictionnaires
+        """
+        keys = [order_by] if isinstance(order_by, str) else list(order_by)
+        if columns != ["*"]:
+            columns = list(columns) + [key for key in keys if key not in columns]
+        key_list = sql.SQL(', ').join(map(sql.Identifier, keys))
+        
+        filters: List[sql.Composable] = []
+        params: List[Any] = []
+        if condition:
+            filters.append(sql.SQL("({})").format(sql.SQL(condition)))
+            params.extend(condition_params or ())
+        if after is not None:
+            after = tuple(after) if isinstance(after, (list, tuple)) else (after,)
+            if len(after) != len(keys):
+                raise ValueError("after doit contenir une valeur par colonne de order_by")
+            # Comparaison de lignes: utilise directement un index sur (clé...)
+            filters.append(sql.SQL("({}) {} ({})").format(
+                key_list, sql.SQL("<" if descending else ">"), sql.SQL(', ').join(sql.Placeholder() * len(keys))
+            ))
+            params.extend(after)
+        
+        direction = sql.SQL(" DESC" if descending else "")
+        query = sql.SQL("SELECT {} FROM {}{} ORDER BY {} LIMIT {}").format(
+            sql.SQL("*") if columns == ["*"] else sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.Identifier(table_name),
+            sql.SQL(" WHERE ") + sql.SQL(" AND ").join(filters) if filters else sql.SQL(""),
+            sql.SQL(', ').join(sql.SQL("{}{}").format(sql.Identifier(key), direction) for key in keys),
+            sql.Literal(limit)
+        )
+        return self.execute_query(query, tuple(params), fetch=True)
+    
+    @staticmethod
+    def page_key(row: Dict, order_by: Union[str, List[str]]) -> Any:
+        """
+        Clé d'une ligne, à passer comme `after` pour lire la page suivante.
+        
+        :param row: Dernière ligne de la page
+        :param order_by: Colonne(s) de la clé
+        :return: Valeur de la clé (tuple pour une clé composite)
+        """
+        if isinstance(order_by, str):
+            return row[order_by]
+        return tuple(row[key] for key in order_by)
+    
+    def iter_pages(self, table_name: str, columns: List[str] = ["*"], order_by: Union[str, List[str]] = "id",
+                   page_size: int = 1000, **options: Any) -> Iterator[List[Dict]]:
+        """
+        Parcourt toute une table page par page (voir `select_page`), sans garder de
+        connexion ni de transaction ouverte entre deux pages.
+        
+        :param table_name: Nom de la table
+        :param columns: Liste des colonnes à récupérer (par défaut toutes)
+        :param order_by: Colonne(s) de la clé de pagination
+        :param page_size: Nombre de lignes par page
+        :param options: Options transmises à `select_page` (condition, condition_params, descending, after)
+        :return: Générateur de pages (listes de dictionnaires)
+        """
+        after = options.pop("after", None)
+        while True:
+            page = self.select_page(table_name, columns, order_by, after=after, limit=page_size, **options)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after = self.page_key(page[-1], order_by)
+    
+    def get_primary_key(self, table_name: str) -> List[str]:
+        """
+        Récupère les colonnes de la clé primaire d'une table, dans l'ordre de l'index.
+        
+        :param table_name: Nom de la table
+        :return: Liste des colonnes (vide si la table n'a pas de clé primaire)
+        """
+        query = """
+        SELECT a.attname AS column_name
+        FROM pg_catalog.pg_index i
+        JOIN pg_catalog.pg_class c ON c.oid = i.indrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum = ANY(i.indkey)
+        WHERE n.nspname = %s AND c.relname = %s AND i.indisprimary
+        ORDER BY array_position(i.indkey::int2[], a.attnum);
+        """
+        rows = self.execute_query(query, (self.schema_cache.schema, table_name), fetch=True)
+        return [row['column_name'] for row in rows]
+    
+    def _is_unique_column(self, table_name: str, column: str) -> bool:
+        """Indique si une colonne est à elle seule couverte par un index unique (clé primaire comprise)."""
+        query = """
+        SELECT 1
+        FROM pg_catalog.pg_index i
+        JOIN pg_catalog.pg_class c ON c.oid = i.indrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum = i.indkey[0]
+        WHERE n.nspname = %s AND c.relname = %s AND a.attname = %s
+          AND i.indisunique AND i.indnatts = 1 AND i.indpred IS NULL;
+        """
+        return bool(self.execute_query(query, (self.schema_cache.schema, table_name, column), fetch=True))
+    
+    def in_transaction(self) -> bool:
+        """Indique si le thread courant est dans une transaction ouverte par le gestionnaire."""
+        return getattr(self._local, "transaction_depth", 0) > 0
+    
+    def _commit(self, conn: ManagedConnection) -> None:
+        """Valide l'instruction courante, sauf à l'intérieur d'une transaction (validée à sa fin)."""
+        if not self.in_transaction():
+            conn.commit()
+    
+    def _rollback(self, conn: ManagedConnection) -> None:
+        """Annule l'instruction courante, sauf à l'intérieur d'une transaction (annulée par son propriétaire)."""
+        if not self.in_transaction() and not conn.closed:
+            conn.rollback()
+    
     def begin_transaction(self) -> None:
-        """Commence une transaction."""
-        self.execute_query("BEGIN;")
+        """
+        Commence une transaction: jusqu'à sa validation, les méthodes du gestionnaire
+        appelées depuis ce thread ne valident plus chaque instruction.
+        
+        Un appel imbriqué crée un point de sauvegarde (SAVEPOINT). En mode pool,
+        la connexion reste associée au thread jusqu'à la fin de la transaction.
+        """
+        depth = getattr(self._local, "transaction_depth", 0)
+        if depth == 0:
+            if self.pool is not None and getattr(self._local, "connection", None) is None:
+                self._local.connection = self._local.transaction_connection = self.pool.getconn()
+        else:
+            self._execute_transaction_command(f"SAVEPOINT pgm_sp_{depth}")
+        self._local.transaction_depth = depth + 1
     
     def commit_transaction(self) -> None:
-        """Valide la transaction en cours."""
-        self.execute_query("COMMIT;")
+        """Valide la transaction en cours (ou libère le point de sauvegarde le plus récent)."""
+        depth = getattr(self._local, "transaction_depth", 0)
+        if depth == 0:
+            return
+        self._local.transaction_depth = depth - 1
+        if depth > 1:
+            self._execute_transaction_command(f"RELEASE SAVEPOINT pgm_sp_{depth - 1}")
+            return
+        try:
+            with self.get_connection() as conn:
+                conn.commit()
+            for table_name in getattr(self._local, "written_tables", None) or ():
+                self._invalidate_results(table_name)
+        finally:
+            self._local.written_tables = None
+            self._release_transaction_connection()
     
     def rollback_transaction(self) -> None:
-        """Annule la transaction en cours."""
-        self.execute_query("ROLLBACK;")
+        """Annule la transaction en cours (ou revient au point de sauvegarde le plus récent)."""
+        depth = getattr(self._local, "transaction_depth", 0)
+        if depth == 0:
+            return
+        self._local.transaction_depth = depth - 1
+        if depth > 1:
+            self._execute_transaction_command(
+                f"ROLLBACK TO SAVEPOINT pgm_sp_{depth - 1}; RELEASE SAVEPOINT pgm_sp_{depth - 1}"
+            )
+            return
+        try:
+            with self.get_connection() as conn:
+                conn.rollback()
+        finally:
+            self._local.written_tables = None
+            self._release_transaction_connection()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[ManagedConnection]:
+        """
+        Exécute un bloc `with` dans une transaction validée une seule fois à la sortie
+        (ou annulée si une exception est levée). Les blocs imbriqués utilisent des
+        points de sauvegarde.
+        
+        Exemple::
+        
+            with manager.transaction():
+                manager.update_data("comptes", {"solde": 0}, "id = %s", (1,))
+                with manager.transaction():
+                    manager.delete_data("journal", "compte_id = %s", (1,))
+        
+        :return: Connexion portant la transaction
+        """
+        self.begin_transaction()
+        try:
+            with self.get_connection() as conn:
+                yield conn
+        except BaseException:
+            self.rollback_transaction()
+            raise
+        else:
+            self.commit_transaction()
+    
+    def _execute_transaction_command(self, command: str) -> None:
+        """Envoie une commande de contrôle de transaction (SAVEPOINT...) sur la connexion du thread."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(command)
+    
+    def _release_transaction_connection(self) -> None:
+        """Rend au pool la connexion associée au thread par `begin_transaction`."""
+        conn = getattr(self._local, "transaction_connection", None)
+        if conn is not None:
+            self._local.connection = self._local.transaction_connection = None
+            self.pool.putconn(conn)
+    
+    def _query_primary(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+        """Exécute une lecture sur le serveur principal, jamais sur un réplica (vues de supervision)."""
+        return self.execute_query(query, params, fetch=True, primary=True)
+    
+    def get_activity(self, include_idle: bool = False) -> List[Dict]:
+        """
+        Récupère l'activité des sessions du serveur (`pg_stat_activity`), hors session courante.
+        
+        :param include_idle: Si True, inclut les sessions inactives
+        :return: Liste de dictionnaires (pid, usename, datname, application_name, client_addr,
+                 state, wait_event_type, wait_event, duration, xact_duration, query)
+        """
+        query = """
+        SELECT pid, usename, datname, application_name, client_addr::text AS client_addr, state,
+               wait_event_type, wait_event,
+               EXTRACT(EPOCH FROM now() - query_start)::float8 AS duration,
+               EXTRACT(EPOCH FROM now() - xact_start)::float8 AS xact_duration,
+               query
+        FROM pg_catalog.pg_stat_activity
+        WHERE pid <> pg_backend_pid()
+        AND backend_type = 'client backend'
+        """
+        if not include_idle:
+            query += " AND state <> 'idle'"
+        return self._query_primary(query + " ORDER BY query_start NULLS LAST;")
+    
+    def get_lock_waits(self) -> List[Dict]:
+        """
+        Récupère les sessions en attente d'un verrou et leurs chaînes de blocage.
+        
+        :return: Liste de dictionnaires (pid, blocked_by, locktype, mode, relation, wait_duration,
+                 query, chain), `chain` allant de la session à l'origine du blocage jusqu'à la session en attente
+        """
+        rows = self._query_primary("""
+        SELECT a.pid, pg_blocking_pids(a.pid) AS blocked_by, l.locktype, l.mode,
+               l.relation::regclass::text AS relation,
+               EXTRACT(EPOCH FROM now() - a.state_change)::float8 AS wait_duration,
+               a.query
+        FROM pg_catalog.pg_stat_activity a
+        JOIN pg_catalog.pg_locks l ON l.pid = a.pid AND NOT l.granted
+        WHERE cardinality(pg_blocking_pids(a.pid)) > 0
+        ORDER BY wait_duration DESC;
+        """)
+        
+        blockers = {row['pid']: row['blocked_by'] for row in rows}
+        for row in rows:
+            # Remonte le premier bloqueur jusqu'à une session qui n'attend pas (ou un cycle)
+            chain = [row['pid']]
+            pid = row['pid']
+            while blockers.get(pid) and blockers[pid][0] not in chain:
+                pid = blockers[pid][0]
+                chain.append(pid)
+            row['chain'] = chain[::-1]
+        return rows
+    
+    def get_top_statements(self, limit: int = 20) -> List[Dict]:
+        """
+        Récupère les requêtes les plus coûteuses de `pg_stat_statements`.
+        
+        :param limit: Nombre de requêtes retournées
+        :return: Liste de dictionnaires (query, calls, total_ms, mean_ms, rows, shared_blks_hit,
+                 shared_blks_read), vide si l'extension n'est pas installée
+        """
+        if not self._query_primary("SELECT 1 FROM pg_catalog.pg_extension WHERE extname = 'pg_stat_statements';"):
+            return []
+        with self.get_connection() as conn:
+            # Les colonnes de temps ont été renommées en PostgreSQL 13
+            prefix = "total_exec_time" if conn.server_version >= 130000 else "total_time"
+            mean = "mean_exec_time" if conn.server_version >= 130000 else "mean_time"
+            return self.execute_query(f"""
+            SELECT query, calls, {prefix}::float8 AS total_ms, {mean}::float8 AS mean_ms, rows,
+                   shared_blks_hit, shared_blks_read
+            FROM pg_stat_statements
+            ORDER BY {prefix} DESC
+            LIMIT %s;
+            """, (limit,), fetch=True, primary=True)
+    
+    def get_table_stats(self) -> List[Dict]:
+        """
+        Récupère les statistiques d'accès et d'encombrement des tables (`pg_stat_user_tables`).
+        
+        :return: Liste de dictionnaires (table_name, seq_scan, seq_tup_read, idx_scan, n_live_tup,
+                 n_dead_tup, dead_ratio, total_bytes, last_autovacuum, last_autoanalyze)
+        """
+        return self._query_primary("""
+        SELECT relname AS table_name, seq_scan, seq_tup_read, COALESCE(idx_scan, 0) AS idx_scan,
+               n_live_tup, n_dead_tup,
+               CASE WHEN n_live_tup + n_dead_tup > 0
+                    THEN n_dead_tup::float8 / (n_live_tup + n_dead_tup) ELSE 0 END AS dead_ratio,
+               pg_total_relation_size(relid) AS total_bytes,
+               last_autovacuum, last_autoanalyze
+        FROM pg_catalog.pg_stat_user_tables
+        ORDER BY seq_tup_read DESC;
+        """)
+    
+    def cancel_backend(self, pid: int) -> bool:
+        """
+        Annule la requête en cours d'une session (`pg_cancel_backend`).
+        
+        :param pid: Identifiant du processus serveur
+        :return: True si le signal a été envoyé
+        """
+        result = self._query_primary("SELECT pg_cancel_backend(%s) AS done;", (pid,))[0]['done']
+        self._log(logging.WARNING, f"Annulation de la requête de la session {pid}.", event="cancel_backend", pid=pid)
+        return result
+    
+    def terminate_backend(self, pid: int) -> bool:
+        """
+        Termine une session (`pg_terminate_backend`).
+        
+        :param pid: Identifiant du processus serveur
+        :return: True si le signal a été envoyé
+        """
+        result = self._query_primary("SELECT pg_terminate_backend(%s) AS done;", (pid,))[0]['done']
+        self._log(logging.WARNING, f"Arrêt de la session {pid}.", event="terminate_backend", pid=pid)
+        return result
+    
+    def get_schema(self, refresh: bool = False) -> Dict[str, List[Dict]]:
+        """
+        Retourne les tables du schéma public et leurs colonnes depuis le cache.
+        
+        :param refresh: Si True, recharge le cache avant de répondre
+        :return: Dictionnaire table: liste des colonnes (column_name, data_type, is_nullable)
+        """
+        if refresh:
+            self.schema_cache.invalidate()
+        return self.schema_cache.get(lambda query, params: self.execute_query(query, params, fetch=True))
+    
+    def refresh_schema_cache(self) -> None:
+        """Recharge immédiatement le cache du schéma."""
+        self.get_schema(refresh=True)
+    
+    def get_tables(self) -> List[str]:
+        """
+        Récupère la liste des tables du schéma public.
+        
+        :return: Liste des noms de tables
+        """
+        return list(self.get_schema())
     
     def table_exists(self, table_name: str) -> bool:
         """
@@ -192,15 +3827,7 @@ class PostgreSQLManager:
         :param table_name: Nom de la table à vérifier
         :return: True si la table existe, False sinon
         """
-        query = """
-        SELECT EXISTS (
-            SELECT FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name = %s
-        );
-        """
-        result = self.execute_query(query, (table_name,), fetch=True)
-        return result[0]['exists'] if result else False
+        return table_name in self.get_schema()
     
     def get_table_columns(self, table_name: str) -> List[str]:
         """
@@ -209,18 +3836,21 @@ class PostgreSQLManager:
         :param table_name: Nom de la table
         :return: Liste des noms de colonnes
         """
-        query = """
-        SELECT column_name 
-        FROM information_schema.columns 
-        WHERE table_schema = 'public' 
-        AND table_name = %s;
+        return [column['column_name'] for column in self.get_table_structure(table_name)]
+    
+    def get_table_structure(self, table_name: str) -> List[Dict]:
         """
-        result = self.execute_query(query, (table_name,), fetch=True)
-        return [row['column_name'] for row in result] if result else []
-
+        Récupère la description des colonnes d'une table.
+        
+        :param table_name: Nom de la table
+        :return: Liste de dictionnaires (column_name, data_type, is_nullable)
+        """
+        return self.get_schema().get(table_name, [])
 
 # Exemple d'utilisation
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    
     # Configuration de la connexion (à adapter)
     db_config = {
         "dbname": "ma_base_de_donnees",